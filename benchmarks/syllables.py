@@ -0,0 +1,108 @@
+"""Compares the speed of the syllable counters on random words and their accuracy on
+the vocabulary of the example programs.
+
+Usage: python benchmarks/syllables.py [--words N] [--repeat N] [--lang LANG] [--word-list FILE]
+"""
+
+import os
+import sys
+import glob
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from goethe.Syllables import BACKENDS, PyphenCounter, measure_accuracy  # noqa: E402
+from goethe.LanguageTools import WORD_FILTER  # noqa: E402
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples')
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyzäöüß'
+VOWELS = 'aeiouäöü'
+
+
+def random_words(count: int, rng: random.Random) -> list:
+    """Generates distinct random words of 3 to 14 letters. Every second letter is a vowel
+    with a probability of one half, so that the words have syllables to hyphenate.
+
+    Args:
+        count (int): Number of words.
+        rng (random.Random): Random number generator.
+
+    Returns:
+        list: Words.
+    """
+
+    words = set()
+    while len(words) < count:
+        length = rng.randint(3, 14)
+        words.add(''.join(rng.choice(VOWELS if index % 2 and rng.random() < 0.5 else LETTERS)
+                          for index in range(length)))
+
+    return list(words)
+
+
+def read_words(paths: list) -> list:
+    """Reads the distinct words of text files, split like the interpreter splits verses.
+
+    Args:
+        paths (list): Paths of the text files.
+
+    Returns:
+        list: Words in lower case.
+    """
+
+    words = set()
+    for path in paths:
+        with open(path) as file:
+            for line in file:
+                words.update(WORD_FILTER.sub('', line).casefold().split())
+
+    return sorted(words)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compares the speed of the syllable counters.")
+    parser.add_argument("--words", action="store", type=int, default=30000, help="Words per run (default: 30000)")
+    parser.add_argument("--repeat", action="store", type=int, default=3, help="Number of runs (default: 3)")
+    parser.add_argument("--lang", action="store", default="de_DE", help="Language code (default: de_DE)")
+    parser.add_argument("--seed", action="store", type=int, default=0, help="Seed of the word generator")
+    parser.add_argument("--word-list", action="store", metavar="FILE",
+                        help="Measure the accuracy on the words of FILE (default: the example programs)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    # Pyphen caches hyphenated words, so every run gets new words.
+    runs = [random_words(args.words, rng) for _ in range(args.repeat)]
+
+    # Random strings only measure the speed. Their counts say little about the accuracy,
+    # because the hyphenation patterns are made for real words.
+    paths = [args.word_list] if args.word_list else sorted(glob.glob(os.path.join(EXAMPLES, '*.goethe')))
+    vocabulary = read_words(paths)
+
+    print(f'Speed: {args.words} random words, best of {args.repeat} runs. '
+          f'Accuracy: {len(vocabulary)} real words compared with pyphen.')
+    reference = PyphenCounter(lang=args.lang)
+
+    # Pyphen runs first, so that its cache is still empty.
+    for name in sorted(BACKENDS, key=lambda name: name != 'pyphen'):
+        backend = BACKENDS[name]
+        start = time.perf_counter()
+        counter = backend(lang=args.lang)
+        setup = time.perf_counter() - start
+
+        times = []
+        for words in runs:
+            start = time.perf_counter()
+            counter.count_syllables(words)
+            times.append(time.perf_counter() - start)
+
+        accuracy = measure_accuracy(vocabulary, counter, reference)
+
+        print(f'{name:10} {min(times):7.3f} s   setup {setup:6.3f} s   '
+              f'accuracy {accuracy["accuracy"]:6.1%}   mean absolute error {accuracy["mean_absolute_error"]:.3f}')
+
+
+if __name__ == '__main__':
+    main()
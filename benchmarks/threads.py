@@ -0,0 +1,99 @@
+"""Compares the throughput of goethe.run() with thread and process pools of 1, 2, 4 and 8 workers.
+
+Usage: python benchmarks/threads.py [--program FILE] [--runs N] [--tiered]
+"""
+
+import os
+import sys
+import time
+import argparse
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import goethe  # noqa: E402
+from goethe.Program import Program  # noqa: E402
+
+# Nested counting loops of about 60000 steps, written as tokens: 30 INCVAL, LOOP INCPTR,
+# 30 INCVAL, LOOP INCPTR, 20 INCVAL, LOOP DECVAL POOL and the decrements of the outer loops.
+LOOPS = bytes([3] * 30 + [1, 5] + [3] * 30 + [1, 5] + [3] * 20 + [1, 4, 2] + [6, 4, 2, 6, 4, 2] + [5, 5, 7])
+
+WORKERS = (1, 2, 4, 8)
+
+
+def job(program: Program, tiered: bool, index: int) -> goethe.Result:
+    """Runs the program once. Defined at module level, so that process pools can pickle it.
+
+    Args:
+        program (Program): Tokenized program.
+        tiered (bool): Compiles frequently executed loops.
+        index (int): Number of the run, used as seed.
+
+    Returns:
+        goethe.Result: Output and executed steps.
+    """
+
+    return goethe.run(program, seed=index, tiered=tiered)
+
+
+def measure(executor, workers: int, runs: int, function, repeat=3) -> float:
+    """Measures the best throughput of a pool in several rounds.
+
+    Args:
+        executor: ThreadPoolExecutor or ProcessPoolExecutor.
+        workers (int): Number of workers.
+        runs (int): Number of runs.
+        function (Callable[[int], goethe.Result]): Executes a single run.
+        repeat (int, optional): Number of rounds. Defaults to 3.
+
+    Returns:
+        float: Runs per second.
+    """
+
+    with executor(workers) as pool:
+        # Starts the workers before the measurement.
+        list(pool.map(function, range(workers)))
+
+        best = 0.0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = list(pool.map(function, range(runs)))
+            best = max(best, runs / (time.perf_counter() - start))
+
+    errors = [result.error for result in results if result.error is not None]
+    if errors:
+        raise RuntimeError(f'Run failed: {errors[0]}')
+
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compares goethe.run() in thread and process pools.")
+    parser.add_argument("--program", action="store", metavar="FILE",
+                        help="Goethe code to run (default: nested counting loops)")
+    parser.add_argument("--syllables", action="store", default="pyphen", help="Syllable counter (default: pyphen)")
+    parser.add_argument("--runs", action="store", type=int, default=48, help="Runs per measurement (default: 48)")
+    parser.add_argument("--tiered", action="store_true", help="Compile frequently executed loops")
+    args = parser.parse_args(argv)
+
+    if args.program:
+        with open(args.program) as file:
+            program = Program.from_text(file.read(), syllables=args.syllables)
+    else:
+        program = Program(LOOPS)
+
+    function = partial(job, program, args.tiered)
+    steps = function(0).steps
+    print(f'{steps} steps per run, {args.runs} runs, {os.cpu_count()} CPUs')
+
+    base = None
+    for name, executor in (('threads', ThreadPoolExecutor), ('processes', ProcessPoolExecutor)):
+        for workers in WORKERS:
+            rate = measure(executor, workers, args.runs, function)
+            base = base or rate
+            print(f'{name:10} {workers} workers  {rate:8.1f} runs/s  {rate / base:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
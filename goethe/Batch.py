@@ -0,0 +1,259 @@
+import random
+from typing import NamedTuple, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from goethe.Token import Token
+from goethe.Program import Program
+from goethe.TapeBounds import TapeBounds
+from goethe.Interpreter import Interpreter, LimitExceededException
+
+
+class BatchResult(NamedTuple):
+    """Result of a single lane of a batch run.
+
+    Attributes:
+        output (str): Program output.
+        steps (int): Number of executed instructions.
+        error (Exception): Error that stopped the lane. None, if the program finished.
+    """
+
+    output: str
+    steps: int
+    error: Optional[Exception] = None
+
+
+class BatchInterpreter:
+    """Executes one program over many inputs at once with NumPy.
+
+    Every input is a lane with its own memory row and memory pointer. The program is
+    executed once, and every instruction is applied to all active lanes together. At a
+    LOOP, only the lanes with a non-zero memory value enter the loop; the others wait
+    until the last lane has left it. Programs with unmatched brackets are executed lane
+    by lane with the regular interpreter.
+
+    The results are the same as running an Interpreter with console mode disabled for
+    every input, except that memory values are limited to 64 bit integers.
+
+    If TapeBounds proves that the memory pointer never wraps around, every lane only
+    gets the memory cells the program can reach.
+    """
+
+    def __init__(self, program: Program, memory_size=Interpreter.MEMORY_SIZE):
+        """
+        Args:
+            program (Program): Tokenized program.
+            memory_size (int, optional): Number of memory cells per lane. Defaults to 256.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+
+        if np is None:
+            raise ImportError('The batch interpreter requires NumPy: pip install goethe[batch]')
+
+        self.program = program
+        self.memory_size = memory_size
+        self.bounds = TapeBounds(program, memory_size)
+        self.balanced = self.bounds.matched
+
+    def run(self, inputs: Sequence[str], max_steps=None, seed=None) -> list:
+        """Executes the program once for every input.
+
+        Args:
+            inputs (Sequence[str]): User input of every lane.
+            max_steps (int, optional): Step limit per lane. Defaults to None.
+            seed (int, optional): Seed of the random number generator of every lane. Defaults to None.
+
+        Returns:
+            list: BatchResult of every lane.
+        """
+
+        if not self.balanced:
+            interpreter = Interpreter(console_mode=False, seed=seed, program=self.program)
+            return [self.__run_lane(interpreter, text, max_steps) for text in inputs]
+
+        return self.__run_lockstep(inputs, max_steps, seed)
+
+    def __run_lockstep(self, inputs: Sequence[str], max_steps, seed) -> list:
+        """Executes all lanes in lockstep.
+
+        Args:
+            inputs (Sequence[str]): User input of every lane.
+            max_steps (int): Step limit per lane.
+            seed (int): Seed of the random number generators.
+
+        Returns:
+            list: BatchResult of every lane.
+        """
+
+        count = len(inputs)
+        size = self.memory_size
+        cells = self.bounds.cells
+        tokens = self.program.tokens
+        jump_table = self.program.jump_table
+        prefix = self.program.prefix
+
+        tape = np.zeros((count, cells or size), dtype=np.int64)
+        pointers = np.zeros(count, dtype=np.int64)
+        steps = np.zeros(count, dtype=np.int64)
+        alive = np.ones(count, dtype=bool)
+        errors = [None] * count
+
+        # Input characters as code points, padded to the longest input.
+        input_lengths = np.array([len(text) for text in inputs], dtype=np.int64)
+        input_codes = np.zeros((count, int(input_lengths.max(initial=0)) + 1), dtype=np.int64)
+        for lane, text in enumerate(inputs):
+            input_codes[lane, :len(text)] = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+        input_positions = np.zeros(count, dtype=np.int64)
+
+        output_codes = np.zeros((count, 64), dtype=np.int64)
+        output_lengths = np.zeros(count, dtype=np.int64)
+
+        randoms = None
+        pointer = 0
+        lanes = np.arange(count)
+        stack = []
+
+        if prefix is not None:
+            # All lanes share the precomputed start of the program.
+            tape[:] = prefix.memory[:tape.shape[1]]
+            pointers[:] = prefix.memory_pointer
+            pointer = prefix.pointer
+            stack = [lanes] * self.__loop_depth(pointer)
+
+            codes = [ord(char) for char in prefix.output]
+            output_codes = np.zeros((count, max(64, 2 * len(codes))), dtype=np.int64)
+            output_codes[:, :len(codes)] = codes
+            output_lengths[:] = len(codes)
+
+        while pointer < len(tokens):
+            if max_steps is not None and lanes.size:
+                exceeded = lanes[steps[lanes] >= max_steps]
+                if exceeded.size:
+                    for lane in exceeded:
+                        errors[lane] = LimitExceededException(f'Program exceeded the limit of {max_steps} steps.')
+                    alive[exceeded] = False
+                    lanes = lanes[alive[lanes]]
+
+            token = tokens[pointer]
+            steps[lanes] += 1
+
+            if token == Token.INCVAL:
+                tape[lanes, pointers[lanes]] += 1
+            elif token == Token.DECVAL:
+                tape[lanes, pointers[lanes]] -= 1
+            elif token == Token.INCPTR:
+                pointers[lanes] = pointers[lanes] + 1 if cells else (pointers[lanes] + 1) % size
+            elif token == Token.DECPTR:
+                pointers[lanes] = pointers[lanes] - 1 if cells else (pointers[lanes] - 1) % size
+            elif token == Token.LOOP:
+                entering = lanes[tape[lanes, pointers[lanes]] != 0]
+                if entering.size:
+                    stack.append(lanes)
+                    lanes = entering
+                else:
+                    pointer = jump_table[pointer]
+            elif token == Token.POOL:
+                repeating = lanes[tape[lanes, pointers[lanes]] != 0]
+                if repeating.size:
+                    lanes = repeating
+                    pointer = jump_table[pointer]
+                else:
+                    # The last lane has left the loop, the waiting lanes continue.
+                    lanes = stack.pop()
+                    lanes = lanes[alive[lanes]]
+            elif token == Token.OUT:
+                codes = tape[lanes, pointers[lanes]]
+                invalid = (codes < 0) | (codes >= 0x110000)
+                if invalid.any():
+                    for lane in lanes[invalid]:
+                        errors[lane] = ValueError('chr() arg not in range(0x110000)')
+                    steps[lanes[invalid]] -= 1
+                    alive[lanes[invalid]] = False
+                    lanes, codes = lanes[~invalid], codes[~invalid]
+
+                positions = output_lengths[lanes]
+                if positions.size and positions.max() >= output_codes.shape[1]:
+                    output_codes = np.concatenate((output_codes, np.zeros_like(output_codes)), axis=1)
+                output_codes[lanes, positions] = codes
+                output_lengths[lanes] += 1
+            elif token == Token.IN:
+                reading = lanes[input_positions[lanes] < input_lengths[lanes]]
+                tape[reading, pointers[reading]] = input_codes[reading, input_positions[reading]]
+                input_positions[reading] += 1
+            elif token == Token.RND:
+                if randoms is None:
+                    randoms = [self.__random_bytes(seed) for _ in range(count)]
+                for lane in lanes:
+                    tape[lane, pointers[lane]] = next(randoms[lane])
+
+            pointer += 1
+
+        return [BatchResult(output_codes[lane, :output_lengths[lane]].astype('<u4').tobytes().decode('utf-32-le'),
+                            int(steps[lane]), errors[lane])
+                for lane in range(count)]
+
+    def __loop_depth(self, pointer: int) -> int:
+        """Returns the number of loops that enclose the given token.
+
+        Args:
+            pointer (int): Token index.
+
+        Returns:
+            int: Number of enclosing loops.
+        """
+
+        depth = 0
+        for token in self.program.tokens[:pointer]:
+            if token == Token.LOOP:
+                depth += 1
+            elif token == Token.POOL:
+                depth -= 1
+
+        return depth
+
+    @staticmethod
+    def __random_bytes(seed):
+        """Yields the random bytes that an interpreter with the given seed generates.
+
+        Args:
+            seed (int): Seed of the random number generator.
+
+        Yields:
+            int: Next random byte.
+        """
+
+        generator = random.Random(seed)
+        while True:
+            yield from generator.getrandbits(
+                8 * Interpreter.RANDOM_BUFFER_SIZE).to_bytes(Interpreter.RANDOM_BUFFER_SIZE, 'little')
+
+    def __run_lane(self, interpreter: Interpreter, text: str, max_steps) -> BatchResult:
+        """Executes a single lane with the regular interpreter.
+
+        Args:
+            interpreter (Interpreter): Interpreter with the loaded program.
+            text (str): User input.
+            max_steps (int): Step limit.
+
+        Returns:
+            BatchResult: Result of the lane.
+        """
+
+        output = []
+        interpreter.event_listeners.clear()
+        interpreter.add_event_listener('<out>', output.append)
+        interpreter.metrics.clear()
+        interpreter.reset()
+        interpreter.set_user_input(text)
+
+        try:
+            interpreter.run(max_steps=max_steps)
+        except (LimitExceededException, ValueError) as exception:
+            return BatchResult(''.join(output), interpreter.metrics.counters.get('steps', 0), exception)
+
+        return BatchResult(''.join(output), interpreter.metrics.counters.get('steps', 0))
@@ -0,0 +1,214 @@
+import os
+import json
+import hashlib
+import tempfile
+from typing import NamedTuple, Optional
+
+from goethe.Token import Token
+from goethe.Program import Program
+
+
+# Default directory of the result cache.
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                                 'goethe', 'results')
+
+
+class CachedResult(NamedTuple):
+    """Result of a finished program run.
+
+    Attributes:
+        output (str): Program output.
+        steps (int): Number of executed instructions.
+    """
+
+    output: str
+    steps: int
+
+
+class ResultCache:
+    """Stores the results of deterministic program runs on disk.
+
+    A program without RND, or with a fixed seed, always produces the same output for
+    the same input. Results are stored under the hash of the tokenized program, the
+    seed and the input, one file per result. The modification time of a file is its
+    last use, and the least recently used results are removed when the cache grows
+    beyond its size limit.
+
+    The cache can be shared by several processes. Results are written atomically, the
+    size limit is only enforced approximately.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path=DEFAULT_CACHE_DIR, max_size=64 * 1024 * 1024):
+        """
+        Args:
+            path (str, optional): Cache directory. Defaults to DEFAULT_CACHE_DIR.
+            max_size (int, optional): Size limit in bytes. Defaults to 64 MiB.
+        """
+
+        self.path = path
+        self.max_size = max_size
+        self.__size = None
+
+    @staticmethod
+    def cacheable(program: Program, seed=None) -> bool:
+        """Checks whether runs of the program are deterministic.
+
+        Args:
+            program (Program): Tokenized program.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+
+        Returns:
+            bool: True, if the program has no RND or the seed is fixed.
+        """
+
+        return seed is not None or Token.RND not in program.tokens
+
+    @classmethod
+    def key(cls, program: Program, user_input: str, seed=None, console_mode=False) -> str:
+        """Returns the cache key of a run.
+
+        Args:
+            program (Program): Tokenized program.
+            user_input (str): Input that is read by IN instructions.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+            console_mode (bool, optional): Whether the input is read in console mode, where IN
+                skips line breaks. Defaults to False.
+
+        Returns:
+            str: SHA-256 hex digest.
+        """
+
+        # Optimized programs skip the steps of their prefix, so the prefix is part of the key.
+        prefix = program.prefix.pointer if program.prefix is not None else -1
+        if Token.RND not in program.tokens:
+            seed = None
+
+        # The console mode reads the same input differently, so its results are kept apart.
+        mode = 'console' if console_mode else 'text'
+        digest = hashlib.sha256(f'{cls.VERSION}\0{program.hash}\0{prefix}\0{seed}\0{mode}\0'.encode('utf-8'))
+        digest.update(user_input.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        """Returns a stored result and marks it as recently used.
+
+        Args:
+            key (str): Cache key, see key().
+
+        Returns:
+            CachedResult: The result. None, if the result is not stored.
+        """
+
+        path = self.__entry(key)
+
+        try:
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        return CachedResult(data['output'], data['steps'])
+
+    def put(self, key: str, result: CachedResult) -> None:
+        """Stores a result and removes the least recently used results if the cache is full.
+
+        Args:
+            key (str): Cache key, see key().
+            result (CachedResult): Result of the run.
+        """
+
+        path = self.__entry(key)
+        data = json.dumps({'output': result.output, 'steps': result.steps}).encode('utf-8', 'surrogatepass')
+
+        if len(data) > self.max_size:
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+            return
+
+        if self.__size is None:
+            self.__size = sum(size for _, size, _ in self.__entries())
+        else:
+            self.__size += len(data)
+
+        if self.__size > self.max_size:
+            self.evict()
+
+    def evict(self, size=None) -> None:
+        """Removes the least recently used results until the cache is below the given size.
+
+        Args:
+            size (int, optional): Target size in bytes. Defaults to 90% of the size limit.
+        """
+
+        if size is None:
+            size = self.max_size * 9 // 10
+
+        entries = sorted(self.__entries(), key=lambda entry: entry[2])
+        total = sum(entry_size for _, entry_size, _ in entries)
+
+        for path, entry_size, _ in entries:
+            if total <= size:
+                break
+
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= entry_size
+
+        self.__size = total
+
+    def clear(self) -> None:
+        """Removes all results.
+        """
+
+        self.evict(0)
+
+    def __entry(self, key: str) -> str:
+        """Returns the path of the file of a result.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            str: File path.
+        """
+
+        return os.path.join(self.path, key[:2], key + '.json')
+
+    def __entries(self) -> list:
+        """Lists all stored results.
+
+        Returns:
+            list: Path, size and last use of every result file.
+        """
+
+        entries = []
+        if not os.path.isdir(self.path):
+            return entries
+
+        for directory in os.scandir(self.path):
+            if not directory.is_dir():
+                continue
+
+            for entry in os.scandir(directory.path):
+                if entry.name.endswith('.json'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+
+        return entries
@@ -0,0 +1,205 @@
+import os
+import sys
+import json
+import socket
+import struct
+import argparse
+import tempfile
+
+
+# Default path of the socket of `goethe serve`.
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f'goethe-{os.getuid() if hasattr(os, "getuid") else 0}.sock')
+
+
+class ClientException(Exception):
+    pass
+
+
+class Client:
+    """Thin client for a running `goethe serve` daemon.
+
+    The client only depends on the standard library, so it starts without loading
+    the interpreter or the hyphenation dictionaries.
+
+    Messages are frames of a one byte type, a four byte payload length and the payload.
+    A request is answered with any number of output frames followed by a done or an
+    error frame.
+    """
+
+    FRAME = struct.Struct('<cI')
+
+    # Frame types
+    RUN = b'R'
+    METRICS = b'M'
+    OUTPUT = b'O'
+    ERROR = b'E'
+    DONE = b'D'
+
+    def __init__(self, path=DEFAULT_SOCKET):
+        """
+        Args:
+            path (str, optional): Path of the daemon socket. Defaults to DEFAULT_SOCKET.
+        """
+
+        self.path = path
+
+    def run(self, source: str, user_input='', seed=None, max_steps=None, timeout=None, write=None) -> str:
+        """Executes a program on the daemon.
+
+        Args:
+            source (str): Goethe code.
+            user_input (str, optional): Input that is read by IN instructions. Defaults to ''.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+            max_steps (int, optional): Step limit. Defaults to the limit of the daemon.
+            timeout (float, optional): Time limit in seconds. Defaults to the limit of the daemon.
+            write (Callable[[str], None], optional): Receives the output while it is streamed.
+                The output is then not collected. Defaults to None.
+
+        Raises:
+            ClientException: If the program failed on the daemon.
+
+        Returns:
+            str: Program output. Empty, if write is given.
+        """
+
+        request = json.dumps({
+            'source': source,
+            'input': user_input,
+            'seed': seed,
+            'max_steps': max_steps,
+            'timeout': timeout,
+        }).encode('utf-8')
+
+        output = []
+        with self.__connect() as connection:
+            self.send_frame(connection, self.RUN, request)
+
+            while True:
+                kind, payload = self.receive_frame(connection)
+                if kind == self.OUTPUT:
+                    (write or output.append)(payload.decode('utf-8'))
+                elif kind == self.ERROR:
+                    raise ClientException(payload.decode('utf-8'))
+                elif kind == self.DONE:
+                    return ''.join(output)
+
+    def metrics(self) -> str:
+        """Returns the metrics of the daemon worker that answers the request.
+
+        Returns:
+            str: Metrics in the Prometheus text format.
+        """
+
+        with self.__connect() as connection:
+            self.send_frame(connection, self.METRICS, b'')
+            _, payload = self.receive_frame(connection)
+            return payload.decode('utf-8')
+
+    @classmethod
+    def send_frame(cls, connection: socket.socket, kind: bytes, payload: bytes) -> None:
+        """Sends a single frame.
+
+        Args:
+            connection (socket.socket): Connected socket.
+            kind (bytes): Frame type.
+            payload (bytes): Frame payload.
+        """
+
+        connection.sendall(cls.FRAME.pack(kind, len(payload)) + payload)
+
+    @classmethod
+    def receive_frame(cls, connection: socket.socket) -> tuple:
+        """Receives a single frame.
+
+        Args:
+            connection (socket.socket): Connected socket.
+
+        Raises:
+            ClientException: If the connection was closed in the middle of a frame.
+
+        Returns:
+            tuple: Frame type and payload.
+        """
+
+        kind, length = cls.FRAME.unpack(cls.__receive(connection, cls.FRAME.size))
+        return kind, cls.__receive(connection, length)
+
+    @staticmethod
+    def __receive(connection: socket.socket, length: int) -> bytes:
+        """Receives exactly the given number of bytes.
+
+        Args:
+            connection (socket.socket): Connected socket.
+            length (int): Number of bytes.
+
+        Returns:
+            bytes: Received data.
+        """
+
+        data = bytearray()
+        while len(data) < length:
+            chunk = connection.recv(length - len(data))
+            if not chunk:
+                raise ClientException('Connection closed unexpectedly.')
+            data += chunk
+
+        return bytes(data)
+
+    def __connect(self) -> socket.socket:
+        """Opens a connection to the daemon.
+
+        Raises:
+            ClientException: If no daemon is listening on the socket.
+
+        Returns:
+            socket.socket: Connected socket.
+        """
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(self.path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            connection.close()
+            raise ClientException(f'No goethe daemon is listening on {self.path}.')
+
+        return connection
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="goethe client",
+                                     description="Runs a Goethe program on a running goethe serve daemon.")
+    parser.add_argument("-i", "--input", action="store", help="Input file (.goethe)")
+    parser.add_argument("--socket", action="store", default=DEFAULT_SOCKET,
+                        help=f"Socket of the daemon (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--seed", action="store", type=int, help="Seed for reproducible random numbers")
+    parser.add_argument("--max-steps", action="store", type=int, help="Maximum number of executed instructions")
+    parser.add_argument("--timeout", action="store", type=float, help="Maximum execution time in seconds")
+    parser.add_argument("--metrics", action="store_true", help="Print the metrics of the daemon")
+    args = parser.parse_args(argv)
+
+    client = Client(args.socket)
+
+    try:
+        if args.metrics:
+            print(client.metrics(), end='')
+            return
+
+        if not args.input:
+            parser.error('the following arguments are required: -i/--input')
+
+        with open(args.input) as file:
+            source = file.read()
+
+        # Like in console mode, line breaks in the input are not read by the program.
+        user_input = '' if sys.stdin.isatty() else sys.stdin.read().replace('\n', '')
+
+        client.run(source, user_input, args.seed, args.max_steps, args.timeout,
+                   write=lambda output: print(output, end='', flush=True))
+        print()
+    except ClientException as exception:
+        sys.stderr.write(f'error: {exception}\n')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+import sys
+import json
+import argparse
+from typing import Iterable
+
+from goethe.Token import Token
+from goethe.Program import Program
+from goethe.Syllables import BACKENDS, create_counter
+from goethe.LanguageTools import LanguageTools, WORD_FILTER
+
+
+class ComposerException(Exception):
+    pass
+
+
+class Lexicon:
+    """Index of a word list by syllable count and initial letter.
+
+    The index is built once and can be stored on disk. It is only valid for the
+    language and syllable counter it was built with.
+    """
+
+    VERSION = 1
+
+    def __init__(self, index: dict, lang='de_DE', syllables='pyphen'):
+        """
+        Args:
+            index (dict): Words by syllable count and initial letter.
+            lang (str, optional): Language code. Defaults to 'de_DE'.
+            syllables (str, optional): Syllable counter backend. Defaults to 'pyphen'.
+        """
+
+        self.index = index
+        self.lang = lang
+        self.syllables = syllables
+
+    @classmethod
+    def build(cls, words: Iterable[str], lang='de_DE', syllables='pyphen') -> 'Lexicon':
+        """Counts the syllables of all words and builds the index.
+
+        Args:
+            words (Iterable[str]): Word list or text. Characters that cannot be part of a word
+                are removed, and words with digits are skipped.
+            lang (str, optional): Language code. Defaults to 'de_DE'.
+            syllables (str, optional): Syllable counter backend. Defaults to 'pyphen'.
+
+        Returns:
+            Lexicon: The lexicon.
+        """
+
+        unique = {}
+        for line in words:
+            for word in WORD_FILTER.sub('', line).split():
+                if word.isalpha():
+                    unique.setdefault(word.casefold(), word)
+
+        forms = sorted(unique.values())
+        counts = create_counter(syllables, lang).count_syllables([word.casefold() for word in forms])
+
+        index = {}
+        for word, count in zip(forms, counts):
+            if count > 0:
+                index.setdefault(count, {}).setdefault(word.casefold()[0], []).append(word)
+
+        return cls(index, lang, syllables)
+
+    @classmethod
+    def load(cls, path: str) -> 'Lexicon':
+        """Loads a lexicon that was stored with save().
+
+        Args:
+            path (str): Path of the lexicon file.
+
+        Raises:
+            ComposerException: If the file is not a supported lexicon.
+
+        Returns:
+            Lexicon: The lexicon.
+        """
+
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+
+        if data.get('version') != cls.VERSION:
+            raise ComposerException(f'{path} is not a supported lexicon.')
+
+        index = {int(count): initials for count, initials in data['index'].items()}
+        return cls(index, data['lang'], data['syllables'])
+
+    def save(self, path: str) -> None:
+        """Stores the lexicon as JSON file.
+
+        Args:
+            path (str): Path of the lexicon file.
+        """
+
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'version': self.VERSION,
+                'lang': self.lang,
+                'syllables': self.syllables,
+                'index': self.index,
+            }, file, ensure_ascii=False)
+
+    def words(self, syllables: int) -> list:
+        """Returns all words with the given number of syllables, alternating between
+        initial letters.
+
+        Args:
+            syllables (int): Number of syllables.
+
+        Returns:
+            list: Words.
+        """
+
+        groups = list(self.index.get(syllables, {}).values())
+        words = []
+        for position in range(max(map(len, groups), default=0)):
+            words.extend(group[position] for group in groups if position < len(group))
+
+        return words
+
+
+class Composer:
+    """Generates poems that are tokenized into a given program.
+
+    Every verse consists of at most three words, which is too short for an alliteration.
+    Consecutive verses never share their first or last word, so no anaphora or epistrophe
+    is created. Every verse is checked with the language tools before it is used, and the
+    whole poem is tokenized again at the end.
+    """
+
+    # Brainfuck-like characters for the tokens. Digits are read as token values.
+    SYMBOLS = {
+        '[': Token.LOOP,
+        ']': Token.POOL,
+        '+': Token.INCVAL,
+        '-': Token.DECVAL,
+        '>': Token.INCPTR,
+        '<': Token.DECPTR,
+        '.': Token.OUT,
+        ',': Token.IN,
+        '?': Token.RND,
+    }
+
+    # Maximum number of words per verse.
+    MAX_WORDS = 3
+
+    def __init__(self, lexicon: Lexicon):
+        """
+        Args:
+            lexicon (Lexicon): Indexed word list.
+        """
+
+        self.lexicon = lexicon
+        self.__lt = LanguageTools('', lexicon.lang, create_counter(lexicon.syllables, lexicon.lang))
+        self.__words = {count: self.lexicon.words(count) for count in lexicon.index}
+        self.__cursors = dict.fromkeys(self.__words, 0)
+
+    @classmethod
+    def parse_tokens(cls, text: str) -> bytes:
+        """Reads a program written as token values or Brainfuck-like symbols.
+        All other characters are ignored.
+
+        Args:
+            text (str): Program text, e.g. '++[->+<].' or '3312653247'.
+
+        Returns:
+            bytes: Program bytecode.
+        """
+
+        tokens = bytearray()
+        for char in text:
+            if char.isdigit():
+                tokens.append(int(char))
+            elif char in cls.SYMBOLS:
+                tokens.append(cls.SYMBOLS[char])
+
+        return bytes(tokens)
+
+    def compose(self, tokens: Iterable[int]) -> str:
+        """Generates a poem that is tokenized into the given program.
+
+        Args:
+            tokens (Iterable[int]): Program tokens.
+
+        Raises:
+            ComposerException: If the lexicon has no suitable words for a token.
+
+        Returns:
+            str: The poem, one verse per line.
+        """
+
+        tokens = bytes(tokens)
+        verses = []
+        previous = (None, None)
+
+        for token in tokens:
+            words = self.__compose_verse(token, previous)
+            if words is None:
+                raise ComposerException(f'The lexicon has no words for a verse of token {Token(token).name}.')
+
+            verses.append(' '.join(words))
+            previous = (words[0].casefold(), words[-1].casefold())
+
+        poem = '\n'.join(verses)
+
+        program = Program.from_text(poem, self.lexicon.lang, self.lexicon.syllables)
+        if program.tokens != tokens:
+            raise ComposerException('The composed poem is not tokenized into the given program.')
+
+        return poem
+
+    def __compose_verse(self, token: int, previous: tuple):
+        """Finds words for a verse whose value modulo 10 is the given token.
+
+        Args:
+            token (int): Token value.
+            previous (tuple): First and last word of the previous verse.
+
+        Returns:
+            list: Words of the verse. None, if no suitable words were found.
+        """
+
+        for syllables in (token or 10, (token or 10) + 10):
+            for split in self.__splits(syllables):
+                words = self.__pick(split, previous)
+                if words is None:
+                    continue
+
+                record = self.__lt.analyze_line([word.casefold() for word in words])
+                if self.__lt.verse_syllables(record) % 10 == token:
+                    return words
+
+        return None
+
+    def __splits(self, syllables: int) -> list:
+        """Returns the syllable counts of the words of possible verses, shortest verses first.
+
+        Args:
+            syllables (int): Syllables of the verse.
+
+        Returns:
+            list: Tuples of syllables per word.
+        """
+
+        splits = []
+        for count in range(1, self.MAX_WORDS + 1):
+            splits.extend(split for split in self.__partitions(syllables, count)
+                          if all(part in self.__words for part in split))
+
+        return splits
+
+    @classmethod
+    def __partitions(cls, total: int, count: int) -> list:
+        """Returns all ways to write a number as sum of positive numbers.
+
+        Args:
+            total (int): Number to split.
+            count (int): Number of summands.
+
+        Returns:
+            list: Tuples of summands.
+        """
+
+        if count == 1:
+            return [(total,)]
+
+        return [(first,) + rest for first in range(1, total - count + 2)
+                for rest in cls.__partitions(total - first, count - 1)]
+
+    def __pick(self, split: tuple, previous: tuple):
+        """Picks words with the given syllable counts that do not link the verse to the
+        previous one and do not share their initial letter.
+
+        Args:
+            split (tuple): Syllables per word.
+            previous (tuple): First and last word of the previous verse.
+
+        Returns:
+            list: Words. None, if no suitable words were found.
+        """
+
+        words = []
+        for position, syllables in enumerate(split):
+            candidates = self.__words[syllables]
+
+            # Every word is only tried a few times, so that a verse is found in constant time.
+            for attempt in range(min(len(candidates), 8)):
+                cursor = self.__cursors[syllables]
+                word = candidates[cursor]
+                self.__cursors[syllables] = (cursor + 1) % len(candidates)
+
+                folded = word.casefold()
+                if position == 0 and folded == previous[0]:
+                    continue
+                if position == len(split) - 1 and folded == previous[1]:
+                    continue
+                if any(folded[0] == other.casefold()[0] for other in words):
+                    continue
+
+                words.append(word)
+                break
+            else:
+                return None
+
+        return words
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="goethe compose",
+                                     description="Generates a Goethe poem for a token program.")
+    parser.add_argument("program", nargs='?', default='-',
+                        help="File with the program as token values or Brainfuck-like symbols (default: stdin)")
+    parser.add_argument("--lexicon", action="store", required=True, help="Lexicon file")
+    parser.add_argument("--words", action="store", metavar="FILE",
+                        help="Builds the lexicon from the words in FILE and stores it")
+    parser.add_argument("--syllables", action="store", choices=sorted(BACKENDS), default="pyphen",
+                        help="Syllable counter used to build the lexicon (default: pyphen)")
+    args = parser.parse_args(argv)
+
+    if args.words:
+        with open(args.words, encoding='utf-8') as file:
+            lexicon = Lexicon.build(file, syllables=args.syllables)
+        lexicon.save(args.lexicon)
+
+        if args.program == '-' and sys.stdin.isatty():
+            return
+    else:
+        lexicon = Lexicon.load(args.lexicon)
+
+    if args.program == '-':
+        text = sys.stdin.read()
+    else:
+        with open(args.program, encoding='utf-8') as file:
+            text = file.read()
+
+    try:
+        print(Composer(lexicon).compose(Composer.parse_tokens(text)))
+    except ComposerException as exception:
+        sys.stderr.write(f'error: {exception}\n')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
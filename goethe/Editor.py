@@ -1,9 +1,15 @@
 
 import os
 import webbrowser
+from collections import deque
 import tkinter as tk
+from tkinter.messagebox import askyesno
+from tkinter.simpledialog import askstring
 from tkinter.filedialog import askopenfilename, asksaveasfilename
 
+from goethe.Token import Token
+from goethe.Program import Program
+from goethe.Snapshot import Snapshot
 from goethe.Interpreter import Interpreter
 
 
@@ -30,10 +36,15 @@ class Editor:
     """Editor for the goethe programming language. Helps with debugging and visualizing the program.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, syllables='pyphen') -> None:
+        """
+        Args:
+            syllables (str, optional): Syllable counter backend, see Syllables.BACKENDS. Defaults to 'pyphen'.
+        """
+
         self.title = 'Goethe Editor'
 
-        self.interpreter = Interpreter(console_mode=False)
+        self.interpreter = Interpreter(console_mode=False, syllables=syllables)
         self.interpreter.add_event_listener('<out>', self.__console_append)
         self.interpreter.add_event_listener('<end>', self.__reached_end)
 
@@ -41,6 +52,9 @@ class Editor:
         # caused performance problems with large programs.
         # self.interpreter.add_event_listener('<step>', self.__update_widgets)
 
+        # Snapshots taken before every step and every run, used to step backwards
+        self.history = deque(maxlen=1000)
+
         # Path and name of the currently opened file
         self.filepath = False
         self.filename = False
@@ -79,6 +93,7 @@ class Editor:
         self.editor.pack(side='left', fill='both', expand=True)
         scrollbar.config(command=self.editor.yview)
         self.editor.bind('<<TextModified>>', self.__text_modified)
+        self.editor.tag_config('breakpoint', background='tomato')
 
         """
         Init memory widget.
@@ -178,6 +193,19 @@ class Editor:
         menu_two.add_command(label="Step",
                              command=self.__step_forward,
                              accelerator="Ctrl+G")
+        menu_two.add_command(label="Step Back",
+                             command=self.__step_backward,
+                             accelerator="Ctrl+B")
+        menu_two.add_separator()
+        menu_two.add_command(label="Toggle Breakpoint",
+                             command=self.__toggle_breakpoint,
+                             accelerator="Ctrl+K")
+        menu_two.add_command(label="Watch Memory Cell...",
+                             command=self.__add_watchpoint,
+                             accelerator="Ctrl+Shift+K")
+        menu_two.add_command(label="Clear Breakpoints",
+                             command=self.__clear_breakpoints)
+        menu_two.add_separator()
         menu_two.add_command(label="Reset",
                              command=self.__reset,
                              accelerator="Ctrl+R")
@@ -198,6 +226,9 @@ class Editor:
         self.root.bind_all('<Control-S>', self.__save_file_as)
         self.root.bind_all('<Control-G>', self.__run_program)
         self.root.bind_all('<Control-g>', self.__step_forward)
+        self.root.bind_all('<Control-b>', self.__step_backward)
+        self.root.bind_all('<Control-k>', self.__toggle_breakpoint)
+        self.root.bind_all('<Control-K>', self.__add_watchpoint)
         self.root.bind_all('<Control-r>', self.__reset)
         self.root.bind_all('<Control-w>', lambda e: self.root.quit())
 
@@ -221,14 +252,81 @@ class Editor:
     def __text_modified(self, event=None) -> None:
         """Passes the current text to the interpreter and updates widgets.
 
+        The program status is kept if the edit only changes code that has not been
+        executed yet. Otherwise, the last state before the changed code was reached can
+        be restored from the step history.
+
         Args:
             event (bool, optional): Tkinter event. Defaults to False.
         """
 
-        self.interpreter.set_code(self.__get_text())
+        # Verse breakpoints follow their lines when lines are inserted or removed above them.
+        lines = self.__breakpoint_lines()
+        if lines != self.interpreter.verse_breakpoints:
+            self.interpreter.set_verse_breakpoints(lines)
+
+        program = Program.from_text(self.__get_text(), syllables=self.interpreter.syllables,
+                                    metrics=self.interpreter.metrics)
+
+        if not self.interpreter.reload_program(program):
+            self.__reload_from_history(program)
+
         self.__update_widgets()
         self.__set_title()
 
+    def __reload_from_history(self, program: Program) -> None:
+        """Loads an edited program that changes already executed code. Offers to restore
+        the most recent snapshot that was taken before the changed code was reached, and
+        resets the program otherwise.
+
+        Args:
+            program (Program): Edited program.
+        """
+
+        change = self.interpreter.first_change(program)
+
+        # Snapshots are taken before every step, so the last valid one is the closest.
+        index = len(self.history) - 1
+        while index >= 0:
+            pointer = Snapshot.from_bytes(self.history[index]).pointer
+            if not self.interpreter.may_have_executed(change, pointer):
+                break
+            index -= 1
+
+        restore = index >= 0 and askyesno(
+            'Code Changed',
+            f'The edit changes code that has already been executed.\n\n'
+            f'Restore the state before step {index + 1} of {len(self.history)}, '
+            f'where the changed code had not been reached yet? Otherwise the program is reset.')
+
+        self.interpreter.load_program(program)
+
+        if restore:
+            self.interpreter.restore(self.history[index], verify=False)
+            while len(self.history) > index:
+                self.history.pop()
+        else:
+            self.history.clear()
+
+    def __breakpoint_lines(self) -> set:
+        """Returns the lines that are marked with a breakpoint. The marks are text tags,
+        which move with the text when it is edited.
+
+        Returns:
+            set: Line numbers.
+        """
+
+        ranges = self.editor.tag_ranges('breakpoint')
+        lines = set()
+
+        for start, end in zip(ranges[::2], ranges[1::2]):
+            first = int(str(start).split('.')[0])
+            last, column = map(int, str(end).split('.'))
+            # A mark includes the line break, so it ends at the start of the next line.
+            lines.update(range(first, last + (column > 0)))
+
+        return lines
+
     def __get_text(self) -> str:
         """Returns the content of the text editor.
 
@@ -247,6 +345,8 @@ class Editor:
 
         program_pointer = self.interpreter.pointer
         program_instruction = self.interpreter._get_current_instruction()
+        if program_instruction is not None:
+            program_instruction = Token(program_instruction).name
         memory_pointer = self.interpreter.memory.get_pointer_value()
         memory_value = self.interpreter.memory.get_value()
 
@@ -257,9 +357,9 @@ class Editor:
         for i, command in enumerate(self.interpreter.program):
             if i == program_pointer:
                 self.program_widget.insert(
-                    'end', command.name + '\n', 'active')
+                    'end', Token(command).name + '\n', 'active')
             else:
-                self.program_widget.insert('end', command.name + '\n')
+                self.program_widget.insert('end', Token(command).name + '\n')
 
         # Scroll active command into view
         self.program_widget.see(float(program_pointer + 5))
@@ -285,12 +385,61 @@ class Editor:
         self.memory_widget['state'] = 'disabled'
 
     def __run_program(self, event=None) -> None:
-        """Runs the program.
+        """Runs the program. The whole run is recorded as one step in the history, so
+        stepping backwards afterwards restores the state before the run.
+
+        Args:
+            event (bool, optional): Tkinter event. Defaults to False.
+        """
+
+        self.history.append(self.interpreter.snapshot())
+        if self.interpreter.run():
+            # The program stopped at a breakpoint or watchpoint.
+            self.__update_widgets()
+
+    def __toggle_breakpoint(self, event=None) -> None:
+        """Sets or removes a breakpoint on the verse at the cursor position.
+
+        Args:
+            event (bool, optional): Tkinter event. Defaults to False.
+        """
+
+        line = int(self.editor.index('insert').split('.')[0])
+
+        # The mark includes the line break, so that empty lines can be marked as well.
+        if line in self.interpreter.verse_breakpoints:
+            self.interpreter.remove_verse_breakpoint(line)
+            self.editor.tag_remove('breakpoint', f'{line}.0', f'{line}.0 lineend +1c')
+        else:
+            self.interpreter.add_verse_breakpoint(line)
+            self.editor.tag_add('breakpoint', f'{line}.0', f'{line}.0 lineend +1c')
+
+    def __add_watchpoint(self, event=None) -> None:
+        """Asks for a memory cell and an optional value and watches the cell.
+
+        Args:
+            event (bool, optional): Tkinter event. Defaults to False.
+        """
+
+        answer = askstring('Watch Memory Cell', 'Memory cell, optionally followed by =value:')
+        if not answer:
+            return
+
+        cell, _, value = answer.partition('=')
+        try:
+            self.interpreter.add_watchpoint(int(cell), int(value) if value.strip() else None)
+        except ValueError:
+            return
+
+    def __clear_breakpoints(self, event=None) -> None:
+        """Removes all breakpoints and watchpoints.
 
         Args:
             event (bool, optional): Tkinter event. Defaults to False.
         """
-        self.interpreter.run()
+
+        self.interpreter.clear_breakpoints()
+        self.editor.tag_remove('breakpoint', 1.0, 'end')
 
     def __step_forward(self, event=None) -> None:
         """Runs the next command of the program.
@@ -299,9 +448,25 @@ class Editor:
             event (bool, optional): Tkinter event. Defaults to False.
         """
 
+        self.history.append(self.interpreter.snapshot())
         self.interpreter.step()
         self.__update_widgets()
 
+    def __step_backward(self, event=None) -> None:
+        """Restores the program status before the last step.
+
+        Args:
+            event (bool, optional): Tkinter event. Defaults to False.
+        """
+
+        if not self.history:
+            return
+
+        # Snapshots survive edits that did not change executed code, so they can
+        # belong to an earlier version of the program.
+        self.interpreter.restore(self.history.pop(), verify=False)
+        self.__update_widgets()
+
     def __reached_end(self, event=None) -> None:
         """Updates widgets and creates new line in console widget.
 
@@ -320,6 +485,7 @@ class Editor:
         """
 
         self.interpreter.set_code(self.__get_text())
+        self.history.clear()
         self.__update_widgets()
 
     def __console_append(self, text='', style=None) -> None:
@@ -354,6 +520,7 @@ class Editor:
             self.editor.delete(1.0, 'end')
             self.editor.insert('end', file.read())
             self.interpreter.set_code(self.__get_text())
+            self.history.clear()
             self.__update_widgets()
 
     def __save_file_as(self, event=None) -> None:
@@ -389,8 +556,8 @@ class Editor:
             return self.__save_file_as()
 
         with open(self.filepath, 'w') as file:
+            # Saving does not change the program, so the program status is kept.
             file.write(self.__get_text())
-            self.interpreter.set_code(self.__get_text())
             self.__set_title(file_saved=True)
             self.__update_widgets()
 
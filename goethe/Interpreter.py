@@ -1,11 +1,22 @@
 import sys
 import time
+import bisect
 import random
+import asyncio
 import logging
-from typing import Tuple, Callable
+from typing import Callable, Awaitable, Optional
 
 from goethe.Token import Token
 from goethe.Memory import Memory
+from goethe.Metrics import Metrics
+from goethe.Program import Program
+from goethe.SharedMemory import SharedMemory
+from goethe.Trace import TraceRecorder
+from goethe.LoopDetector import LoopDetector, InfiniteLoopException
+from goethe.LoopCompiler import LoopCompiler
+from goethe.TapeBounds import TapeBounds
+from goethe.Syllables import create_counter
+from goethe.Snapshot import Snapshot, SnapshotException, encode_random_state, decode_random_state
 from goethe.Tokenizer import Tokenizer
 from goethe.LanguageTools import LanguageTools
 
@@ -14,25 +25,88 @@ class InvalidTokenException(Exception):
     pass
 
 
+class LimitExceededException(Exception):
+    pass
+
+
+class AbortException(Exception):
+    pass
+
+
 class Interpreter:
     """The interpreter holds the program status and is responsible for executing the Goethe code.
     """
 
-    def __init__(self, text='', lang='de_DE', console_mode=True):
+    # Flags of instrumented tokens, see __update_probes().
+    PROBE_BREAKPOINT = 1
+    PROBE_WATCHPOINT = 2
+    PROBE_COMPILED = 4
+
+    # Tokens that write to the current memory cell.
+    WRITING_TOKENS = (Token.INCVAL, Token.DECVAL, Token.IN, Token.RND)
+
+    # Number of random bytes that are generated at once by the RND instruction.
+    RANDOM_BUFFER_SIZE = 1024
+
+    # Number of memory cells.
+    MEMORY_SIZE = 256
+
+    # Back jumps after which a loop is compiled, if tiered execution is enabled.
+    TIERING_THRESHOLD = 64
+
+    # Steps between two checks of the time limit and two updates of the shared memory status.
+    TIME_CHECK_INTERVAL = 4096
+
+    def __init__(self, text='', lang='de_DE', console_mode=True, seed=None, syllables='pyphen', metrics=None,
+                 program=None):
         """
         Args:
             text (str, optional): Goethe code. Defaults to ''.
             lang (str, optional): Language code. Defaults to 'de_DE'.
             console_mode (bool, optional): Enables or disables console mode. Defaults to True.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+            syllables (str, optional): Syllable counter backend, see Syllables.BACKENDS. Defaults to 'pyphen'.
+            metrics (Metrics, optional): Receives timings and counters. Defaults to a new instance.
+            program (Program, optional): Tokenized program that is loaded instead of the text.
+                No syllable counter is created then. Defaults to None.
         """
         self.user_input = ''
+        self.syllables = syllables
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.trace = None
+        self.loop_detector = None
+        self.__shared = None
+
+        # Back jumps per POOL and compiled loops by the index of their first body token.
+        self.__back_jumps = None
+        self.__compiled = dict()
+        self.__tiering_threshold = self.TIERING_THRESHOLD
+
+        # Token indices and source lines to stop at, and memory cells to watch.
+        self.breakpoints = set()
+        self.verse_breakpoints = set()
+        self.watchpoints = dict()
+        self.__probes = bytearray()
+        self.__resume_pointer = None
+        self.__prefix = None
+        self.__pending_output = ''
         self.event_listeners = dict()
         self.console_mode = console_mode
 
-        self.tokenizer = Tokenizer(LanguageTools(text, lang))
-        self.program = self.tokenizer.tokenize()
-        self.memory = Memory(256)
-        self.pointer = 0
+        self.random = random.Random()
+        self.set_seed(seed)
+
+        # Instruction handlers indexed by opcode, and by token index for the loaded program.
+        self.__instructions = tuple(getattr(self, token.name) for token in sorted(Token))
+        self.__handlers = ()
+        self.bounds = None
+
+        self.memory = Memory(self.MEMORY_SIZE)
+
+        if program is not None:
+            self.load_program(program)
+        else:
+            self.set_code(text, lang)
 
     def PASS(self) -> None:
         """Does nothing.
@@ -44,35 +118,24 @@ class Interpreter:
         """Jumps to the appropriate FI command in the program if current memory value == 0.
         """
 
-        if self.memory.get_value() != 0:
-            return
-
-        # Finds the appropriate FI command by counting the
-        # nested IF and FI commands in the program.
-        nesting = 1
-        while nesting:
-            instruction = self._get_next_instruction()
-            if instruction == Token.LOOP:
-                nesting += 1
-            elif instruction == Token.POOL:
-                nesting -= 1
+        if self.memory.get_value() == 0:
+            self.pointer = self.jump_table[self.pointer]
 
     def POOL(self) -> None:
         """Jumps to the appropriate IF command in the program if current memory value != 0.
         """
 
-        if self.memory.get_value() == 0:
-            return
+        if self.memory.get_value() != 0:
+            if self.loop_detector is not None:
+                self.loop_detector.back_jump(self.pointer, self.memory)
+
+            if self.__back_jumps is not None:
+                self.__count_back_jump(self.pointer)
 
-        # Finds the appropriate IF command by counting the
-        # nested IF and FI commands in the program.
-        nesting = -1
-        while nesting:
-            instruction = self._get_previous_instruction()
-            if instruction == Token.LOOP:
-                nesting += 1
-            elif instruction == Token.POOL:
-                nesting -= 1
+            self.pointer = self.jump_table[self.pointer]
+
+        elif self.loop_detector is not None:
+            self.loop_detector.exit(self.pointer)
 
     def IN(self) -> None:
         """Reads a single char from stdin or self.user_input.
@@ -93,16 +156,20 @@ class Interpreter:
                 return
 
         self.memory.set_value(char)
+        self.metrics.increment('input_bytes', len(chr(char).encode('utf-8')))
         self.__dispatch_event('<in>')
 
     def OUT(self) -> None:
         """Writes the current memory value as ASCII to the console.
         """
 
+        char = chr(self.memory.get_value())
+
         if self.console_mode:
-            print(chr(self.memory.get_value()), end="", flush=True)
+            print(char, end="", flush=True)
 
-        self.__dispatch_event('<out>', chr(self.memory.get_value()))
+        self.metrics.increment('output_bytes', len(char.encode('utf-8')))
+        self.__dispatch_event('<out>', char)
 
     def INCPTR(self) -> None:
         """Increments memory pointer.
@@ -116,6 +183,24 @@ class Interpreter:
 
         self.memory.decrement_pointer()
 
+    def __increment_pointer_in_bounds(self) -> None:
+        """Increments memory pointer at a token where it cannot wrap around.
+        """
+
+        self.memory.increment_pointer_in_bounds()
+
+    def __decrement_pointer_in_bounds(self) -> None:
+        """Decrements memory pointer at a token where it cannot wrap around.
+        """
+
+        self.memory.decrement_pointer_in_bounds()
+
+    def __invalid_token(self) -> None:
+        """Handler of tokens without instruction.
+        """
+
+        raise InvalidTokenException
+
     def INCVAL(self) -> None:
         """Increments memory value.
         """
@@ -132,8 +217,30 @@ class Interpreter:
         """Writes random int to memory.
         """
 
-        value = random.randint(0, 255)
-        self.memory.set_value(value)
+        if self._random_index >= len(self._random_buffer):
+            # Random bytes are generated in bulk, which is much faster than one call per byte.
+            self._random_buffer = self.random.getrandbits(
+                8 * self.RANDOM_BUFFER_SIZE).to_bytes(self.RANDOM_BUFFER_SIZE, 'little')
+            self._random_index = 0
+
+        self.memory.set_value(self._random_buffer[self._random_index])
+        self._random_index += 1
+
+    def set_seed(self, seed=None) -> None:
+        """Seeds the random number generator of the interpreter.
+
+        With a seed, the random numbers start over whenever the program is reset, so
+        every run of the program produces the same output.
+
+        Args:
+            seed (int, optional): Seed value. If None, the generator is seeded from the
+                operating system and runs are not reproducible. Defaults to None.
+        """
+
+        self.seed = seed
+        self.random.seed(seed)
+        self._random_buffer = b''
+        self._random_index = 0
 
     def set_code(self, text='', lang='de_DE') -> None:
         """Runs given text through the tokenizer and sets tokens as program.
@@ -143,53 +250,450 @@ class Interpreter:
             lang (str, optional): Language code. Defaults to 'de_DE'.
         """
 
-        self.pointer = 0
-        self.memory.reset()
-        self.tokenizer = Tokenizer(LanguageTools(text, lang))
-        self.program = self.tokenizer.tokenize()
+        with self.metrics.measure('syllable_counter_load'):
+            counter = create_counter(self.syllables, lang)
 
-    def set_user_input(self, input: str):
-        """Sets the user input to the given text. Useful when console mode is disabled.
+        with self.metrics.measure('tokenization'):
+            self.tokenizer = Tokenizer(LanguageTools(text, lang, counter, self.metrics))
+            program = Program(self.tokenizer.tokenize(), self.tokenizer.verses)
+
+        self.load_program(program)
+
+    def load_program(self, program: Program) -> None:
+        """Sets an already tokenized program and resets the program status.
 
         Args:
-            input (str): User input.
+            program (Program): Tokenized program. Can be shared with other interpreters.
         """
 
-        self.user_input = input
+        self.__set_program(program)
+        self.reset()
 
-    def _get_next_instruction(self) -> Tuple[Token, None]:
-        """Returns next program instruction and increments program pointer.
+    def reload_program(self, program: Program) -> bool:
+        """Replaces the program with an edited version and keeps the program status, if
+        the edit only changes tokens that cannot have been executed yet.
+
+        Args:
+            program (Program): Edited program.
 
         Returns:
-            Token: Next program token.
+            bool: True, if the program was replaced. False, if the edit changes tokens that
+                may have been executed, see may_have_executed(). The program is then not replaced.
         """
 
-        if self.pointer >= len(self.program):
-            # No further instruction.
-            return None
+        if self.may_have_executed(self.first_change(program)):
+            return False
 
-        self.pointer += 1
-        return self.program[self.pointer]
+        self.__set_program(program)
+        return True
+
+    def first_change(self, program: Program) -> int:
+        """Returns the index of the first token in which the given program differs from the
+        loaded one.
+
+        Args:
+            program (Program): Other program.
+
+        Returns:
+            int: Token index. The length of the shorter program, if one program starts with the other.
+        """
+
+        length = min(len(self.program), len(program.tokens))
+        for index in range(length):
+            if self.program[index] != program.tokens[index]:
+                return index
+
+        return length
+
+    def may_have_executed(self, index: int, pointer=None) -> bool:
+        """Checks whether the token at the given index, or any token behind it, may have
+        been executed before the program pointer reached its position.
+
+        This is the case if the pointer is behind the token, if the token is part of a loop
+        around the pointer, or if the program has unmatched loop brackets, which jump to the
+        start or the end of the program.
+
+        Args:
+            index (int): Token index.
+            pointer (int, optional): Program pointer. Defaults to the current program pointer.
+
+        Returns:
+            bool: False, if only tokens before the index can have been executed.
+        """
+
+        if pointer is None:
+            pointer = self.pointer
+
+        if pointer > index:
+            return True
+
+        if not self.bounds.matched:
+            return True
+
+        for position in range(index, len(self.program)):
+            if self.program[position] == Token.POOL and self.jump_table[position] < pointer:
+                # The loop around the pointer has been executed up to its POOL before.
+                return True
+
+        return False
+
+    def __set_program(self, program: Program) -> None:
+        """Sets the program and everything derived from it, but keeps the program status.
+
+        Args:
+            program (Program): Tokenized program.
+        """
+
+        self.program = program.tokens
+        self.program_hash = program.hash
+        self.jump_table = program.jump_table
+        self.verses = program.verses
+        self.__prefix = program.prefix
+        self.bounds = TapeBounds(program, self.MEMORY_SIZE)
+        self.__handlers = tuple(self.__handler(index, token) for index, token in enumerate(self.program))
+        self.__compiled.clear()
+        if self.__back_jumps is not None:
+            self.__back_jumps.clear()
+        self.__update_probes()
+
+        if self.loop_detector is not None:
+            self.loop_detector = LoopDetector(self.program, self.jump_table, self.MEMORY_SIZE, self.verses)
+
+        if self.__shared is not None:
+            self.__shared.set_program_length(len(self.program))
+
+    def __handler(self, index: int, token: int) -> Callable[[], None]:
+        """Returns the instruction handler of a token of the loaded program.
+
+        Args:
+            index (int): Token index.
+            token (int): Opcode.
+
+        Returns:
+            Callable[[], None]: The handler.
+        """
+
+        if token >= len(self.__instructions):
+            return self.__invalid_token
+
+        if self.bounds.proven[index]:
+            # The pointer cannot wrap around here, so the modulo is not needed.
+            if token == Token.INCPTR:
+                return self.__increment_pointer_in_bounds
+            if token == Token.DECPTR:
+                return self.__decrement_pointer_in_bounds
+
+        return self.__instructions[token]
+
+    def reset(self) -> None:
+        """Resets program pointer and memory, but keeps the program.
+
+        If the program was optimized, execution continues behind its precomputed prefix.
+        The output of the prefix is written before the next instruction is executed.
+        """
+
+        if self.__prefix is None:
+            self.pointer = 0
+            self.memory.reset()
+            self.__pending_output = ''
+        else:
+            self.pointer = self.__prefix.pointer
+            self.memory.load(self.__prefix.memory, self.__prefix.memory_pointer)
+            self.__pending_output = self.__prefix.output
+
+        self.__resume_pointer = None
+
+        if self.seed is not None:
+            self.set_seed(self.seed)
+
+        if self.loop_detector is not None:
+            self.loop_detector.clear()
+
+    def add_breakpoint(self, index: int) -> None:
+        """Stops run() before the token at the given index is executed.
+
+        Args:
+            index (int): Token index.
+        """
+
+        self.breakpoints.add(index)
+        self.__update_probes()
+
+    def add_verse_breakpoint(self, line: int) -> None:
+        """Stops run() before the verse containing the given source line is executed.
+        Verse breakpoints are kept when the code changes.
+
+        Args:
+            line (int): Line number in the source text.
+        """
+
+        self.verse_breakpoints.add(line)
+        self.__update_probes()
+
+    def remove_verse_breakpoint(self, line: int) -> None:
+        """Removes the breakpoint on the verse containing the given source line.
+
+        Args:
+            line (int): Line number in the source text.
+        """
+
+        self.verse_breakpoints.discard(line)
+        self.__update_probes()
+
+    def set_verse_breakpoints(self, lines) -> None:
+        """Replaces all verse breakpoints, e.g. after lines were inserted or removed
+        above them.
+
+        Args:
+            lines (Iterable[int]): Line numbers in the source text.
+        """
+
+        self.verse_breakpoints = set(lines)
+        self.__update_probes()
+
+    def add_watchpoint(self, cell: int, value=None) -> None:
+        """Stops run() after the given memory cell was written.
+
+        Args:
+            cell (int): Memory cell to watch.
+            value (int, optional): Only stop if the cell has this value after the write. Defaults to None.
+        """
+
+        self.watchpoints[cell] = value
+        self.__update_probes()
+
+    def clear_breakpoints(self) -> None:
+        """Removes all breakpoints and watchpoints.
+        """
+
+        self.breakpoints.clear()
+        self.verse_breakpoints.clear()
+        self.watchpoints.clear()
+        self.__update_probes()
+
+    def verse_index(self, line: int) -> Optional[int]:
+        """Returns the index of the token whose verse contains the given source line.
 
-    def _get_previous_instruction(self) -> Tuple[Token, None]:
-        """Returns previous program instruction and decrements program pointer.
+        Args:
+            line (int): Line number in the source text.
+
+        Returns:
+            int: Token index. None, if the line is before the first verse.
+        """
+
+        index = bisect.bisect_right(self.verses, line) - 1
+        return index if index >= 0 else None
+
+    def __update_probes(self) -> None:
+        """Marks all tokens that have to be checked for breakpoints or watchpoints.
+        The execution loop of run() only checks marked tokens.
+        """
+
+        probes = bytearray(len(self.program))
+
+        indices = set(self.breakpoints)
+        indices.update(self.verse_index(line) for line in self.verse_breakpoints)
+        for index in indices:
+            if index is not None and 0 <= index < len(probes):
+                probes[index] |= self.PROBE_BREAKPOINT
+
+        if self.watchpoints:
+            for index, token in enumerate(self.program):
+                if token in self.WRITING_TOKENS:
+                    probes[index] |= self.PROBE_WATCHPOINT
+
+        for index in self.__compiled:
+            probes[index] |= self.PROBE_COMPILED
+
+        self.__probes = probes
+
+    def enable_loop_detection(self) -> LoopDetector:
+        """Aborts loops that repeat the same state without input or output with an
+        InfiniteLoopException, see LoopDetector.
+
+        Returns:
+            LoopDetector: The loop detector.
+        """
+
+        self.loop_detector = LoopDetector(self.program, self.jump_table, self.MEMORY_SIZE, self.verses)
+        return self.loop_detector
+
+    def enable_tiering(self, threshold=TIERING_THRESHOLD) -> None:
+        """Compiles loops into Python functions once they have jumped back a number of
+        times, see LoopCompiler. Only innermost loops are compiled.
+
+        run() executes compiled loops unless a trace, breakpoints, watchpoints, step
+        listeners or loop detection are active. The program then runs
+        instruction by instruction as before.
+
+        Args:
+            threshold (int, optional): Back jumps after which a loop is compiled. Defaults to TIERING_THRESHOLD.
+        """
+
+        self.__tiering_threshold = threshold
+        if self.__back_jumps is None:
+            self.__back_jumps = dict()
+
+    def __count_back_jump(self, pointer: int) -> None:
+        """Counts a back jump of the POOL at the given index and compiles its loop
+        when it becomes hot.
+
+        Args:
+            pointer (int): Index of the POOL token.
+        """
+
+        count = self.__back_jumps.get(pointer, 0) + 1
+        self.__back_jumps[pointer] = count
+
+        start = self.jump_table[pointer]
+        if count == self.__tiering_threshold and start >= 0 and self.jump_table[start] == pointer:
+            # Unmatched POOLs restart the program and are never compiled.
+            function = LoopCompiler(self.MEMORY_SIZE).compile(self.program, start, pointer,
+                                                              self.bounds.loop_in_bounds(start))
+
+            if function is not None:
+                self.__compiled[start + 1] = function
+                self.__probes[start + 1] |= self.PROBE_COMPILED
+
+    def __debugging(self) -> bool:
+        """Checks whether anything observes single instructions, so that compiled loops
+        must not be used.
+
+        Returns:
+            bool: True, if a debugging hook is attached.
+        """
+
+        return bool(self.trace is not None or self.loop_detector is not None
+                    or self.breakpoints or self.verse_breakpoints or self.watchpoints
+                    or self.event_listeners.get('<step>'))
+
+    def enable_trace(self, size=65536) -> TraceRecorder:
+        """Records the most recently executed instructions in a ring buffer.
+
+        Args:
+            size (int, optional): Number of instructions to keep. Defaults to 65536.
+
+        Returns:
+            TraceRecorder: The trace recorder.
+        """
+
+        self.trace = TraceRecorder(size)
+        return self.trace
+
+    def dump_trace(self, path: str) -> None:
+        """Writes the recorded trace together with the program to a binary file.
+        The file can be decoded with `python -m goethe.Trace`.
+
+        Args:
+            path (str): Path of the trace file.
+        """
+
+        if self.trace is not None:
+            self.trace.dump(path, self.program, self.verses, self.program_hash)
+
+    def share_memory(self, name=None) -> SharedMemory:
+        """Moves the memory into a shared memory block, so that the running program can be
+        watched from another process with `goethe monitor`.
+
+        run() publishes the program pointer, the memory pointer and the executed steps every
+        TIME_CHECK_INTERVAL steps and when it stops. When the program reaches its end, the
+        block is marked as finished and keeps the final memory, while the interpreter
+        continues with a private copy.
+
+        Args:
+            name (str, optional): Name of the shared memory block. Defaults to a random name.
+
+        Raises:
+            SharedMemoryException: If a block with the name already exists.
+
+        Returns:
+            SharedMemory: The shared memory. Has to be closed when the program has finished.
+        """
+
+        memory = SharedMemory(self.MEMORY_SIZE, name)
+        memory.load(self.memory.to_list(), self.memory.get_pointer_value())
+        memory.set_program_length(len(self.program))
+
+        self.memory = memory
+        self.__shared = memory
+        return memory
+
+    def __finish_shared_memory(self) -> None:
+        """Marks the shared memory as finished and moves the memory back into the process,
+        so that resetting the interpreter does not clear the final memory of the program.
+        """
+
+        shared = self.__shared
+        memory = Memory(self.MEMORY_SIZE)
+        memory.load(shared.to_list(), shared.get_pointer_value())
+        memory.high_water_mark = shared.high_water_mark
+
+        shared.finish()
+        self.memory = memory
+        self.__shared = None
+
+    def snapshot(self) -> bytes:
+        """Serializes the complete execution state in a compact binary format.
 
         Returns:
-            Token: Previous program token.
+            bytes: Encoded snapshot. Can be passed to restore().
         """
 
-        if self.pointer < 0:
-            # No previous instruction.
-            return None
+        return Snapshot(
+            self.program_hash,
+            self.pointer,
+            self.memory.to_list(),
+            self.memory.get_pointer_value(),
+            self.user_input,
+            encode_random_state(self.random.getstate()),
+            self._random_buffer[self._random_index:],
+            self.__pending_output).to_bytes()
 
-        self.pointer -= 1
-        return self.program[self.pointer]
+    def restore(self, data: bytes, verify=True) -> None:
+        """Restores an execution state that was created with snapshot().
+
+        Args:
+            data (bytes): Encoded snapshot.
+            verify (bool, optional): Only accept snapshots of the loaded program. Defaults to True.
 
-    def _get_current_instruction(self) -> Tuple[Token, None]:
+        Raises:
+            SnapshotException: If the snapshot is invalid or belongs to another program.
+        """
+
+        snapshot = Snapshot.from_bytes(data)
+
+        if verify and snapshot.program_hash != self.program_hash:
+            raise SnapshotException('Snapshot belongs to a different program.')
+
+        self.memory.load(snapshot.memory, snapshot.memory_pointer)
+        self.pointer = snapshot.pointer
+        self.user_input = snapshot.user_input
+        self.__pending_output = snapshot.pending_output
+
+        if self.loop_detector is not None:
+            self.loop_detector.clear()
+
+        self.__resume_pointer = None
+
+        if snapshot.random_state:
+            self.random.setstate(decode_random_state(snapshot.random_state))
+            self._random_buffer = snapshot.random_buffer
+            self._random_index = 0
+
+    def set_user_input(self, input: str):
+        """Sets the user input to the given text. Useful when console mode is disabled.
+
+        Args:
+            input (str): User input.
+        """
+
+        self.user_input = input
+
+    def _get_current_instruction(self) -> Optional[int]:
         """Returns current program instruction.
 
         Returns:
-            Token: Current program token.
+            int: Current program opcode, see Token. None, if the end of the program is reached.
         """
 
         if self.pointer < len(self.program):
@@ -197,45 +701,236 @@ class Interpreter:
 
         return None
 
-    def run(self) -> None:
-        """Executes the program from the current position to the end.
+    def run(self, max_steps=None, timeout=None) -> bool:
+        """Executes the program from the current position to the end or the next breakpoint.
+
+        Args:
+            max_steps (int, optional): Maximum number of instructions to execute. Defaults to None.
+            timeout (float, optional): Maximum execution time in seconds. Defaults to None.
+
+        Raises:
+            LimitExceededException: If the program exceeds one of the given limits. The program
+                status is kept, so execution can be continued by calling run() again.
+            InfiniteLoopException: If loop detection is enabled and a loop repeats its state.
+            AbortException: If an event listener aborts the execution.
+
+        Returns:
+            bool: True, if the execution stopped at a breakpoint or watchpoint.
+        """
+
+        steps = 0
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        shared = self.__shared
+        checked = deadline is not None or shared is not None
+        next_check = 0
+        published = 0
+        probes = self.__probes
+        tiered = self.__back_jumps is not None and not self.__debugging()
+
+        # Execution continues at a breakpoint that stopped the previous run.
+        resume_pointer = self.__resume_pointer
+        self.__resume_pointer = None
+
+        start = time.perf_counter()
+
+        try:
+            while self.pointer < len(self.program):
+                if max_steps is not None and steps >= max_steps:
+                    raise LimitExceededException(f'Program exceeded the limit of {max_steps} steps.')
+
+                if checked and steps >= next_check:
+                    # The clock and the shared memory status are only updated every few
+                    # thousand steps to keep the loop fast.
+                    if shared is not None:
+                        shared.publish(self.pointer, steps - published)
+                        published = steps
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise LimitExceededException(f'Program exceeded the time limit of {timeout} seconds.')
+                    next_check = steps + self.TIME_CHECK_INTERVAL
+
+                probe = probes[self.pointer]
+
+                if probe & self.PROBE_BREAKPOINT and (steps or self.pointer != resume_pointer):
+                    self.__resume_pointer = self.pointer
+                    self.__dispatch_event('<break>', f'breakpoint {self.pointer}')
+                    return True
+
+                if probe & self.PROBE_COMPILED and tiered:
+                    budget = max_steps - steps if max_steps is not None else sys.maxsize
+                    if checked:
+                        budget = min(budget, self.TIME_CHECK_INTERVAL)
+
+                    if self.__pending_output:
+                        self.__write_pending_output()
+
+                    # Compiled loops run whole iterations only and return 0 if the budget is too small.
+                    loop = self.__compiled[self.pointer]
+                    try:
+                        executed = loop(self, self.memory, budget)
+                    except Exception:
+                        steps += loop.steps
+                        raise
+
+                    if executed:
+                        steps += executed
+                        continue
+
+                self.step()
+                steps += 1
+
+                if probe & self.PROBE_WATCHPOINT and self.memory.get_pointer_value() in self.watchpoints:
+                    value = self.watchpoints[self.memory.get_pointer_value()]
+                    if value is None or value == self.memory.get_value():
+                        self.__dispatch_event('<break>', f'watchpoint {self.memory.get_pointer_value()}')
+                        return True
+
+            if shared is not None:
+                # The status has to be complete before the last step marks the program as finished.
+                shared.publish(self.pointer, steps - published)
+                published = steps
+
+            self.step()  # Last step, the program has reached the end.
+            return False
+        finally:
+            if self.__shared is not None:
+                self.__shared.publish(self.pointer, steps - published)
+            self.__record_execution(steps, time.perf_counter() - start)
+
+    def __record_execution(self, steps: int, seconds: float) -> None:
+        """Adds executed steps, execution time and tape usage to the metrics.
+
+        Args:
+            steps (int): Number of executed instructions.
+            seconds (float): Execution time in seconds.
+        """
+
+        self.metrics.add_time('execution', seconds)
+        self.metrics.increment('steps', steps)
+        self.metrics.maximum('tape_high_water_mark', self.memory.high_water_mark)
+
+    async def run_async(self,
+                        read: Optional[Callable[[], Awaitable[str]]] = None,
+                        write: Optional[Callable[[str], Awaitable[None]]] = None,
+                        slice_size=1000) -> None:
+        """Executes the program from the current position to the end without blocking the event loop.
+
+        The program is executed in slices of `slice_size` instructions. Between two slices,
+        buffered output is passed to `write` and control is handed back to the event loop,
+        so that many programs can run concurrently. When an IN instruction is reached and
+        no user input is left, `read` is awaited for more input.
+
+        Args:
+            read (Callable[[], Awaitable[str]], optional): Coroutine function that returns the next
+                chunk of user input or an empty string if no more input is available. Defaults to None.
+            write (Callable[[str], Awaitable[None]], optional): Coroutine function that receives the
+                program output. Defaults to None.
+            slice_size (int, optional): Number of instructions executed between two yields. Defaults to 1000.
         """
 
-        while self._get_current_instruction():
-            self.step()
+        output = []
+        console_mode = self.console_mode
+        input_exhausted = read is None
+        steps = 0
+        seconds = 0.0
 
-        self.step()  # Last step, the program has reached the end.
+        # Input and output are passed through the async source and sink instead of the console.
+        self.console_mode = False
+        self.add_event_listener('<out>', output.append)
+
+        try:
+            while self._get_current_instruction() is not None:
+                # Only the time spent executing instructions counts as execution time.
+                start = time.perf_counter()
+
+                for _ in range(slice_size):
+                    instruction = self._get_current_instruction()
+                    if instruction is None:
+                        break
+
+                    if instruction == Token.IN and not self.user_input and not input_exhausted:
+                        # The input has to be awaited before the instruction can be executed.
+                        break
+
+                    self.step()
+                    steps += 1
+
+                seconds += time.perf_counter() - start
+
+                if output and write is not None:
+                    await write(''.join(output))
+                output.clear()
+
+                if (self._get_current_instruction() == Token.IN
+                        and not self.user_input and not input_exhausted):
+                    chunk = await read()
+                    if chunk:
+                        self.user_input += chunk
+                    else:
+                        input_exhausted = True
+
+                await asyncio.sleep(0)
+
+            self.step()  # Last step, the program has reached the end.
+
+            if output and write is not None:
+                await write(''.join(output))
+        finally:
+            self.remove_event_listener('<out>', output.append)
+            self.console_mode = console_mode
+            self.__record_execution(steps, seconds)
 
     def step(self) -> None:
         """Executes the current command in the program.
         """
 
-        instruction = self._get_current_instruction()
+        # A breakpoint is only skipped by the run() that continues from it.
+        self.__resume_pointer = None
 
-        if instruction == None:
+        if self.__pending_output:
+            self.__write_pending_output()
+
+        if self.pointer >= len(self.program):
             # The end of the program has been reached.
 
             if self.console_mode:
                 # Print out the return character when the program finishes.
                 print(chr(10), end="", flush=True)
 
-            self.pointer = 0
-            self.memory.reset()
+            if self.__shared is not None:
+                self.__finish_shared_memory()
+
+            self.reset()
             self.__dispatch_event('<end>')
             return
 
-        if hasattr(self, instruction.name):
-            # Calls the function matching the token.
-            getattr(self, instruction.name)()
-        else:
-            raise InvalidTokenException
+        if self.trace is not None:
+            self.trace.record(self.pointer, self.memory.get_pointer_value(), self.memory.get_value())
+
+        # Looks up the function matching the token.
+        self.__handlers[self.pointer]()
 
         self.pointer += 1
         self.__dispatch_event('<step>')
 
+    def __write_pending_output(self) -> None:
+        """Writes the precomputed output of the program prefix.
+        """
+
+        output = self.__pending_output
+        self.__pending_output = ''
+
+        if self.console_mode:
+            print(output, end="", flush=True)
+
+        for char in output:
+            self.__dispatch_event('<out>', char)
+
     def add_event_listener(self, type: str, listener: Callable[[str], None]) -> None:
         """Registers event listener that is called when the given event type occurs.
 
+        Exceptions of listeners are logged and ignored, except for AbortException, which
+        stops the execution.
+
         Args:
             type (str): Event type signature.
             listener (Callable[[str], None]): Event listener to be called.
@@ -246,16 +941,32 @@ class Interpreter:
 
         self.event_listeners[type].append(listener)
 
+    def remove_event_listener(self, type: str, listener: Callable[[str], None]) -> None:
+        """Unregisters an event listener that was added with add_event_listener().
+
+        Args:
+            type (str): Event type signature.
+            listener (Callable[[str], None]): Event listener to be removed.
+        """
+
+        if listener in self.event_listeners.get(type, []):
+            self.event_listeners[type].remove(listener)
+
     def __dispatch_event(self, type: str, value=None) -> None:
         """Calls all event listeners for the specified event type.
 
         Args:
             type (str): Event type signature.
             value (str, optional): Data to be passed to the listener.. Defaults to None.
+
+        Raises:
+            AbortException: If a listener aborts the execution.
         """
         if type in self.event_listeners:
             for event in self.event_listeners[type]:
                 try:
                     event(value)
+                except AbortException:
+                    raise
                 except:
                     logging.error('Event listener could not be called.')
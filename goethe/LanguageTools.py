@@ -1,45 +1,191 @@
 import re
-import pyphen
+import time
+from typing import Iterable, Iterator, NamedTuple
+
+from goethe.Metrics import Metrics
+from goethe.Syllables import PyphenCounter
+
+
+# Removes all characters that cannot be part of a word.
+WORD_FILTER = re.compile(r"[^a-zA-Z0-9äöüÄÖÜß ]")
+
+# Substitutions of the cologne phonetics algorithm, see LanguageTools.__cologne_phonetics().
+COLOGNE_RULES = [(re.compile(pattern, re.IGNORECASE), replacement) for pattern, replacement in [
+    (r'ä',                   'a'),
+    (r'ö',                   'o'),
+    (r'ü',                   'u'),
+    (r'ß',                   '8'),
+    (r'[^a-z]',               ''),
+    (r'[dt](?![csz])',       '2'),
+    (r'[dt](?=[csz])',       '8'),
+    (r'[ckq]x',             '88'),
+    (r'[sz]c',              '88'),
+    (r'^c(?=[ahkloqrux])',   '4'),
+    (r'^c',                  '8'),
+    (r'(?<![sz])c',          '4'),
+    (r'x',                  '48'),
+    (r'p(?!h)',              '1'),
+    (r'p(?=h)',              '3'),
+    (r'h',                    ''),
+    (r'[aeijouy]',           '0'),
+    (r'b',                   '1'),
+    (r'[fvw]',               '3'),
+    (r'[gkq]',               '4'),
+    (r'l',                   '5'),
+    (r'[mn]',                '6'),
+    (r'r',                   '7'),
+    (r'[csz]',               '8'),
+    (r'([^\w\s])|(.)(?=\2)', ''),
+    (r'\B0', '')
+]]
+
+
+class LineRecord(NamedTuple):
+    """Features of a single text line that are needed to detect stylistic devices.
+    """
+
+    words: int
+    syllables: int
+    initials: dict
+    phonetics: tuple
+    first_word: str
+    last_word: str
+    line: int = 0
 
 
 class LanguageTools:
     """Analyzes text for stylistic devices and syllables.
     """
 
-    def __init__(self, text: str, lang='de_DE'):
+    def __init__(self, text: str, lang='de_DE', syllable_counter=None, metrics=None):
         """
         Args:
             text (str): Text to analyze.
             lang (str, optional): Language of the text. Defaults to 'de_DE'.
+            syllable_counter (optional): Object with a count_syllables(words) method, e.g. a
+                HyphenationAutomaton. Defaults to a PyphenCounter for the language.
+            metrics (Metrics, optional): Receives the timings of the analysis. Defaults to a new instance.
         """
 
-        self.hyphen = pyphen.Pyphen(lang=lang)
+        self.metrics = metrics if metrics is not None else Metrics()
+
+        if syllable_counter is None:
+            with self.metrics.measure('syllable_counter_load'):
+                syllable_counter = PyphenCounter(lang)
+
+        self.syllable_counter = syllable_counter
 
         self.text = text.casefold()
         self.lines = []
         self.phonetics = []
         self.words_in_lines = []
         self.syllables_in_lines = []
+        self.records = []
+        self.line_numbers = []
 
         self.__alliteration = []
         self.__assonance = []
         self.__anaphora = []
         self.__epistrophe = []
 
-        self.extract_lines()
-        self.extract_words_in_lines()
+        self.__syllables_cache = {}
+        self.__phonetics_cache = {}
+
+        self.analyze()
+
+    def analyze(self) -> list:
+        """Analyzes every line of the text in a single pass over its words.
+
+        Returns:
+            list: List of line records for every text line that contains words.
+        """
+
+        if not self.records:
+            with self.metrics.measure('line_extraction'):
+                for number, line in enumerate(self.text.splitlines(), 1):
+                    word_list = WORD_FILTER.sub('', line).split()
+                    if word_list:
+                        self.lines.append(line.strip())
+                        self.words_in_lines.append(word_list)
+                        self.line_numbers.append(number)
+
+            # Counts the syllables of all distinct words with a single call.
+            self.count_syllables_of_words(
+                {word for word_list in self.words_in_lines for word in word_list})
+
+            self.records = [self.analyze_line(word_list, number) for word_list, number
+                            in zip(self.words_in_lines, self.line_numbers)]
+
+        return self.records
+
+    def analyze_line(self, word_list: list, line=0) -> LineRecord:
+        """Extracts all features of a line that are needed by the stylistic device detectors.
+
+        Args:
+            word_list (list): Words of the line.
+            line (int, optional): Line number in the source text. Defaults to 0.
+
+        Returns:
+            LineRecord: Features of the line.
+        """
+
+        syllables = 0
+        initials = {}
+        phonetics = []
+
+        self.count_syllables_of_words(word_list)
+        start = time.perf_counter()
+
+        for word in word_list:
+            syllables += self.__syllables_cache[word]
+            initials[word[0]] = initials.get(word[0], 0) + 1
+
+            code = self.__phonetics_cache.get(word)
+            if code is None:
+                code = self.__phonetics_cache[word] = self.__cologne_phonetics(word)
+
+            if len(code) > 2:
+                # Short phonetic codes are not considered for assonance.
+                phonetics.append(code)
+
+        self.metrics.add_time('phonetics', time.perf_counter() - start)
+        self.metrics.increment('lines')
+
+        return LineRecord(len(word_list), syllables, initials, tuple(phonetics),
+                          word_list[0], word_list[-1], line)
+
+    def iter_records(self, lines: Iterable[str]) -> Iterator[LineRecord]:
+        """Lazily analyzes every line that contains words.
+
+        Unlike analyze(), the text is never held in memory as a whole,
+        which allows processing very large files line by line.
+
+        Args:
+            lines (Iterable[str]): Text lines, e.g. an open file.
+
+        Yields:
+            LineRecord: Features of the next line.
+        """
+
+        number = 0
+        for chunk in lines:
+            for line in chunk.casefold().splitlines():
+                number += 1
+                start = time.perf_counter()
+                word_list = WORD_FILTER.sub('', line).split()
+                self.metrics.add_time('line_extraction', time.perf_counter() - start)
+
+                if word_list:
+                    yield self.analyze_line(word_list, number)
 
     def extract_lines(self) -> list:
-        """Splits text into lines, strips whitespace and removes empty lines.
+        """Splits text into lines, strips whitespace and removes lines without words.
 
         Returns:
             list: List of text lines.
         """
 
-        if not self.lines:
-            self.lines = [line.strip() for line in self.text.splitlines()
-                          if re.sub(r"[^a-zA-Z0-9äöüÄÖÜß ]", '', line)]
-
+        self.analyze()
         return self.lines
 
     def extract_words_in_lines(self) -> list:
@@ -49,11 +195,7 @@ class LanguageTools:
             list: List of lists with words for every text line.
         """
 
-        if not self.words_in_lines:
-            for line in self.extract_lines():
-                word_list = re.sub(r"[^a-zA-Z0-9äöüÄÖÜß ]", '', line).split()
-                self.words_in_lines.append(word_list)
-
+        self.analyze()
         return self.words_in_lines
 
     def count_syllables(self, word: str) -> int:
@@ -66,7 +208,24 @@ class LanguageTools:
             int: Number of syllables. Zero, if input is not a valid word.
         """
 
-        return len(self.hyphen.positions(word.strip())) + 1 if word.strip().isalnum() else 0
+        syllables = self.__syllables_cache.get(word)
+        if syllables is None:
+            syllables = self.__syllables_cache[word] = self.syllable_counter.count_syllables([word])[0]
+
+        return syllables
+
+    def count_syllables_of_words(self, words: Iterable[str]) -> None:
+        """Counts the syllables of all words that have not been counted yet in one batch.
+
+        Args:
+            words (Iterable[str]): Words of which the syllables are to be counted.
+        """
+
+        missing = [word for word in words if word not in self.__syllables_cache]
+        if missing:
+            with self.metrics.measure('syllable_counting'):
+                counts = self.syllable_counter.count_syllables(missing)
+            self.__syllables_cache.update(zip(missing, counts))
 
     def count_syllables_in_lines(self) -> list:
         """Returns a list of syllabes for each line in the text.
@@ -76,15 +235,39 @@ class LanguageTools:
         """
 
         if not self.syllables_in_lines:
-            for line in self.extract_words_in_lines():
-                counter = 0
-                for word in line:
-                    counter += self.count_syllables(word)
-
-                self.syllables_in_lines.append(counter)
+            self.syllables_in_lines = [record.syllables for record in self.analyze()]
 
         return self.syllables_in_lines
 
+    def verse_syllables(self, record: LineRecord) -> int:
+        """Returns the syllable value of a line, taking alliteration and assonance into account.
+
+        The detectors are only run as far as necessary: a line with assonance counts as 9,
+        a line with alliteration as 7, any other line by its syllables.
+
+        Args:
+            record (LineRecord): Features of the line.
+
+        Returns:
+            int: Syllable value of the line.
+        """
+
+        start = time.perf_counter()
+        assonance = self.is_assonance(record)
+        middle = time.perf_counter()
+        self.metrics.add_time('assonance', middle - start)
+
+        if assonance:
+            return 9
+
+        alliteration = self.is_alliteration(record)
+        self.metrics.add_time('alliteration', time.perf_counter() - middle)
+
+        if alliteration:
+            return 7
+
+        return record.syllables
+
     def find_alliteration(self) -> list:
         """Returns a list of positions of alliterations in the text.
 
@@ -93,24 +276,28 @@ class LanguageTools:
         """
 
         if not self.__alliteration:
-            for index, word_list in enumerate(self.extract_words_in_lines()):
+            for index, record in enumerate(self.analyze()):
+                if self.is_alliteration(record):
+                    self.__alliteration.append(index)
 
-                if(len(word_list) <= 3):
-                    # Skip sentences with 3 words or less.
-                    continue
+        return self.__alliteration
 
-                initials = [word[0] for word in word_list]
-                # Count the number of words that begin with the same letter.
-                initials_count = dict((c, initials.count(c)) for c in initials)
+    def is_alliteration(self, record: LineRecord) -> bool:
+        """Checks whether the words of a line form an alliteration.
 
-                max_occurences = initials_count[
-                    max(initials_count, key=initials_count.get)]
+        Args:
+            record (LineRecord): Features of the line.
 
-                if max_occurences / len(initials) > 0.6:
-                    # If over 60% of the words start with the same letter, it's an aliteration.
-                    self.__alliteration.append(index)
+        Returns:
+            bool: True, if over 60% of the words start with the same letter.
+        """
 
-        return self.__alliteration
+        if(record.words <= 3):
+            # Skip sentences with 3 words or less.
+            return False
+
+        # If over 60% of the words start with the same letter, it's an aliteration.
+        return max(record.initials.values()) / record.words > 0.6
 
     def find_assonance(self) -> list:
         """Returns a list of positions of assonance in the text.
@@ -123,36 +310,46 @@ class LanguageTools:
         """
 
         if not self.__assonance:
-            for index, word_list in enumerate(self.extract_words_in_lines()):
+            for index, record in enumerate(self.analyze()):
+                if self.is_assonance(record):
+                    self.__assonance.append(index)
 
-                phonetics = []
-                for word in word_list:
-                    p = self.__cologne_phonetics(word)
-                    if len(p) > 2:
-                        phonetics.append(p)
+        return self.__assonance
 
-                distances = []
+    def is_assonance(self, record: LineRecord) -> bool:
+        """Checks whether the words of a line form an assonance.
 
-                for i, one in enumerate(phonetics):
-                    min_distance = None
+        Args:
+            record (LineRecord): Features of the line.
 
-                    for j, two in enumerate(phonetics):
-                        if j == i:
-                            continue
+        Returns:
+            bool: True, if the phonetic codes of the words are similar.
+        """
 
-                        distance = self.__levenshtein_distance(one, two)
-                        if distance != 0 and min_distance is None:
-                            min_distance = distance
-                        if distance != 0 and distance < min_distance:
-                            min_distance = distance
+        phonetics = record.phonetics
+        if len(phonetics) <= 2:
+            # At least three distances are required.
+            return False
 
-                    if min_distance is not None:
-                        distances.append(min_distance)
+        distances = []
 
-                if len(distances) > 2 and sum(distances) / len(distances) < 1.3:
-                    self.__assonance.append(index)
+        for i, one in enumerate(phonetics):
+            min_distance = None
+
+            for j, two in enumerate(phonetics):
+                if j == i:
+                    continue
+
+                distance = self.__levenshtein_distance(one, two)
+                if distance != 0 and min_distance is None:
+                    min_distance = distance
+                if distance != 0 and distance < min_distance:
+                    min_distance = distance
+
+            if min_distance is not None:
+                distances.append(min_distance)
 
-            return self.__assonance
+        return len(distances) > 2 and sum(distances) / len(distances) < 1.3
 
     def __find_assonance_old(self):
         """This is probably the worst assonance finding algorithm.
@@ -220,11 +417,11 @@ class LanguageTools:
 
         if not self.__anaphora:
             last_starting_word = None
-            for index, word_list in enumerate(self.extract_words_in_lines()):
-                if last_starting_word == word_list[0]:
+            for index, record in enumerate(self.analyze()):
+                if last_starting_word == record.first_word:
                     self.__anaphora.append((index - 1, index))
 
-                last_starting_word = word_list[0]
+                last_starting_word = record.first_word
 
         return self.__anaphora
 
@@ -248,11 +445,11 @@ class LanguageTools:
 
         if not self.__epistrophe:
             last_ending_word = None
-            for index, word_list in enumerate(self.extract_words_in_lines()):
-                if last_ending_word == word_list[-1]:
+            for index, record in enumerate(self.analyze()):
+                if last_ending_word == record.last_word:
                     self.__epistrophe.append((index - 1, index))
 
-                last_ending_word = word_list[-1]
+                last_ending_word = record.last_word
 
         return self.__epistrophe
 
@@ -293,37 +490,8 @@ class LanguageTools:
             |                              X                              |                     after C, K, Q                     |      |
         """
 
-        REGEX_RULES = [
-            (r'ä',                   'a'),
-            (r'ö',                   'o'),
-            (r'ü',                   'u'),
-            (r'ß',                   '8'),
-            (r'[^a-z]',               ''),
-            (r'[dt](?![csz])',       '2'),
-            (r'[dt](?=[csz])',       '8'),
-            (r'[ckq]x',             '88'),
-            (r'[sz]c',              '88'),
-            (r'^c(?=[ahkloqrux])',   '4'),
-            (r'^c',                  '8'),
-            (r'(?<![sz])c',          '4'),
-            (r'x',                  '48'),
-            (r'p(?!h)',              '1'),
-            (r'p(?=h)',              '3'),
-            (r'h',                    ''),
-            (r'[aeijouy]',           '0'),
-            (r'b',                   '1'),
-            (r'[fvw]',               '3'),
-            (r'[gkq]',               '4'),
-            (r'l',                   '5'),
-            (r'[mn]',                '6'),
-            (r'r',                   '7'),
-            (r'[csz]',               '8'),
-            (r'([^\w\s])|(.)(?=\2)', ''),
-            (r'\B0', '')
-        ]
-
-        for sub in REGEX_RULES:
-            word = re.sub(sub[0], sub[1], word, flags=re.IGNORECASE)
+        for pattern, replacement in COLOGNE_RULES:
+            word = pattern.sub(replacement, word)
 
         return word
 
@@ -0,0 +1,215 @@
+from typing import Callable, Optional
+
+from goethe.Token import Token
+
+
+class LoopCompiler:
+    """Translates innermost loops into Python functions.
+
+    Pointer movements are folded into constant offsets from the memory pointer at the
+    start of an iteration, and consecutive value changes of the same cell are merged.
+    Loops without I/O and net pointer movement that change their counter cell by one
+    per iteration, e.g. `[->+<]`, are executed in a single pass.
+
+    A compiled loop is entered at the first token of the loop body and runs for whole
+    iterations as long as the step budget allows. It returns the number of executed
+    steps and leaves the program pointer at the loop body, if the budget ran out, or
+    behind the POOL, if the loop has terminated. If an I/O instruction raises an
+    exception, the steps executed before it are stored in the `steps` attribute of
+    the function.
+    """
+
+    # Tokens that are executed by calling the instruction of the interpreter.
+    IO_TOKENS = (Token.OUT, Token.IN, Token.RND)
+
+    def __init__(self, memory_size=256):
+        """
+        Args:
+            memory_size (int, optional): Number of memory cells. Defaults to 256.
+        """
+
+        self.memory_size = memory_size
+
+    def compile(self, tokens: bytes, start: int, end: int, in_bounds=False) -> Optional[Callable[..., int]]:
+        """Compiles the loop between the given LOOP and POOL tokens.
+
+        Args:
+            tokens (bytes): Program bytecode.
+            start (int): Index of the LOOP token.
+            end (int): Index of the POOL token.
+            in_bounds (bool, optional): Whether the pointer is proven not to wrap around in the
+                loop, see TapeBounds. The memory boundary is then not checked. Defaults to False.
+
+        Returns:
+            Callable[[Interpreter, Memory, int], int]: Function that executes the loop for
+                an interpreter, its memory and a step budget. None, if the loop contains
+                other loops.
+        """
+
+        body = tokens[start + 1:end]
+        if Token.LOOP in body or Token.POOL in body:
+            return None
+
+        operations = []
+        offset = low = high = 0
+        for index, token in enumerate(body, start + 1):
+            if token == Token.INCPTR:
+                offset += 1
+            elif token == Token.DECPTR:
+                offset -= 1
+            elif token in (Token.INCVAL, Token.DECVAL):
+                change = 1 if token == Token.INCVAL else -1
+                if operations and operations[-1][0] == 'add' and operations[-1][1] == offset:
+                    operations[-1] = ('add', offset, operations[-1][2] + change)
+                else:
+                    operations.append(('add', offset, change))
+            low = min(low, offset)
+            high = max(high, offset)
+
+            if token in self.IO_TOKENS:
+                operations.append((Token(token).name, offset, (index, low, high)))
+
+        operations = [operation for operation in operations if operation[0] != 'add' or operation[2]]
+        cost = len(body) + 1
+        size = self.memory_size
+
+        lines = [
+            'def loop(interpreter, memory, budget):',
+            '    cells = memory._memory',
+            '    pointer = memory._pointer',
+            '    high_water_mark = memory.high_water_mark',
+        ]
+
+        counter = [operation[2] for operation in operations if operation[0] == 'add' and operation[1] == 0]
+        linear = (offset == 0 and high - low < size and len(counter) == 1 and counter[0] in (1, -1)
+                  and not any(operation[0] != 'add' for operation in operations))
+
+        if linear:
+            # The counter cell reaches zero after a known number of iterations.
+            lines += [
+                f'    iterations = {-counter[0]} * cells[pointer]',
+                f'    if iterations > 0 and iterations * {cost} <= budget:',
+            ]
+            lines += self.__operations(operations, start, cost, '        ', 'iterations * ', wrapped=not in_bounds,
+                                           in_bounds=in_bounds)
+            lines += [
+                f'        cells[pointer] = 0',
+                *self.__high_water_mark('        ', low, high, in_bounds),
+                f'        memory.high_water_mark = high_water_mark',
+                f'        interpreter.pointer = {end + 1}',
+                f'        return iterations * {cost}',
+            ]
+
+        lines += [
+            f'    count = 0',
+            f'    while count < budget // {cost}:',
+            f'        count += 1',
+        ]
+
+        if in_bounds:
+            lines += [
+                *self.__operations(operations, start, cost, '        ', wrapped=False, in_bounds=True),
+                *self.__high_water_mark('        ', low, high, in_bounds),
+            ]
+        else:
+            lines += [
+                f'        if pointer + {low} >= 0 and pointer + {high} < {size}:',
+                *self.__operations(operations, start, cost, '            ', wrapped=False),
+                f'        else:',
+                *self.__operations(operations, start, cost, '            ', wrapped=True),
+                *self.__high_water_mark('        ', low, high),
+            ]
+
+        if offset:
+            lines.append(f'        pointer = pointer + {offset}' if in_bounds else
+                         f'        pointer = (pointer + {offset}) % {size}')
+
+        lines += [
+            f'        if not cells[pointer]:',
+            f'            memory._pointer = pointer',
+            f'            memory.high_water_mark = high_water_mark',
+            f'            interpreter.pointer = {end + 1}',
+            f'            return count * {cost}',
+            f'    memory._pointer = pointer',
+            f'    memory.high_water_mark = high_water_mark',
+            f'    interpreter.pointer = {start + 1}',
+            f'    return count * {cost}',
+        ]
+
+        namespace = {}
+        exec(compile('\n'.join(lines), f'<goethe loop {start}-{end}>', 'exec'), namespace)
+
+        loop = namespace['loop']
+        loop.steps = 0
+        return loop
+
+    def __operations(self, operations: list, start: int, cost: int, indent: str, factor='', wrapped=True,
+                     in_bounds=False) -> list:
+        """Generates the code of a loop iteration.
+
+        Args:
+            operations (list): Folded operations of the loop body.
+            start (int): Index of the LOOP token.
+            cost (int): Steps per iteration.
+            indent (str): Indentation of the generated lines.
+            factor (str, optional): Expression that multiplies all value changes. Defaults to ''.
+            wrapped (bool, optional): Whether the offsets can wrap around the memory. Defaults to True.
+            in_bounds (bool, optional): Whether the pointer is proven not to wrap around. Defaults to False.
+
+        Returns:
+            list: Lines of code.
+        """
+
+        lines = []
+        for kind, offset, argument in operations:
+            if wrapped and offset:
+                cell = f'(pointer + {offset}) % {self.memory_size}'
+            else:
+                cell = f'pointer + {offset}' if offset else 'pointer'
+
+            if kind == 'add':
+                lines.append(f'{indent}cells[{cell}] += {factor}{argument}')
+            else:
+                # The interpreter state is complete before I/O, in case the instruction fails.
+                index, low, high = argument
+                lines += [
+                    *self.__high_water_mark(indent, low, high, in_bounds),
+                    f'{indent}memory.high_water_mark = high_water_mark',
+                    f'{indent}loop.steps = (count - 1) * {cost} + {index - start - 1}',
+                    f'{indent}interpreter.pointer = {index}',
+                    f'{indent}memory._pointer = {cell}',
+                    f'{indent}interpreter.{kind}()',
+                ]
+
+        return lines or [f'{indent}pass']
+
+    def __high_water_mark(self, indent: str, low: int, high: int, in_bounds=False) -> list:
+        """Generates the code that updates the highest memory position of an iteration.
+
+        Args:
+            indent (str): Indentation of the generated lines.
+            low (int): Lowest offset of the iteration.
+            high (int): Highest offset of the iteration.
+            in_bounds (bool, optional): Whether the pointer is proven not to wrap around. Defaults to False.
+
+        Returns:
+            list: Lines of code.
+        """
+
+        if low == high == 0 or in_bounds and high <= 0:
+            return []
+
+        if in_bounds:
+            return [
+                f'{indent}if pointer + {high} > high_water_mark:',
+                f'{indent}    high_water_mark = pointer + {high}',
+            ]
+
+        # Moving across the memory boundary always passes the last cell.
+        return [
+            f'{indent}top = pointer + {high}',
+            f'{indent}if top >= {self.memory_size} or pointer + {low} < 0:',
+            f'{indent}    top = {self.memory_size - 1}',
+            f'{indent}if top > high_water_mark:',
+            f'{indent}    high_water_mark = top',
+        ]
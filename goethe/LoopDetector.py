@@ -0,0 +1,165 @@
+from goethe.Token import Token
+
+
+class InfiniteLoopException(Exception):
+    pass
+
+
+class LoopDetector:
+    """Detects loops that repeat the same state forever.
+
+    Whenever a POOL jumps back, a fingerprint of the loop state is compared with the
+    fingerprints of the earlier iterations of the current loop activation. If the
+    state repeats exactly, the loop can never terminate.
+
+    The fingerprint of a loop without nested loops and without net pointer movement
+    consists of the memory pointer and the cells the loop body can reach. For all other
+    loops, it consists of the memory pointer and the whole memory, and is only taken
+    when the memory pointer is at the position it had in the first iteration. Loops
+    that contain IN, OUT or RND are never checked.
+    """
+
+    # Fingerprints per loop activation, before the comparison starts over.
+    MAX_FINGERPRINTS = 4096
+
+    # Back jumps after which loops that take whole memory fingerprints choose a new
+    # memory pointer position to take them at.
+    REANCHOR_INTERVAL = 65536
+
+    # Tokens that make a loop body depend on more than its memory cells.
+    IO_TOKENS = (Token.IN, Token.OUT, Token.RND)
+
+    def __init__(self, tokens: bytes, jump_table: tuple, memory_size=256, verses=()):
+        """
+        Args:
+            tokens (bytes): Program bytecode.
+            jump_table (tuple): Jump table of the program.
+            memory_size (int, optional): Number of memory cells. Defaults to 256.
+            verses (Sequence[int], optional): Source line number of every token. Defaults to ().
+        """
+
+        self.memory_size = memory_size
+        self.jump_table = jump_table
+        self.verses = verses
+
+        # Reachable cell window for every checked POOL. None for loops that need
+        # whole memory fingerprints. Loops with I/O have no entry.
+        self.windows = dict()
+
+        for index, token in enumerate(tokens):
+            if token == Token.POOL and jump_table[index] >= 0:
+                window = self.__analyze_body(tokens[jump_table[index] + 1:index])
+                if window is not False:
+                    self.windows[index] = window
+
+        self.__fingerprints = dict()
+        self.__anchors = dict()
+        self.__back_jumps = dict()
+
+    def back_jump(self, pointer: int, memory) -> None:
+        """Checks the loop state when the POOL at the given index jumps back.
+
+        Args:
+            pointer (int): Index of the POOL token.
+            memory (Memory): Memory of the interpreter.
+
+        Raises:
+            InfiniteLoopException: If the loop state repeats.
+        """
+
+        if pointer not in self.windows:
+            return
+
+        window = self.windows[pointer]
+        memory_pointer = memory.get_pointer_value()
+        cells = memory.to_list()
+
+        if window is None:
+            count = self.__back_jumps.get(pointer, 0) + 1
+            self.__back_jumps[pointer] = count
+
+            if pointer not in self.__anchors or not count % self.REANCHOR_INTERVAL:
+                self.__anchors[pointer] = memory_pointer
+                self.__fingerprints.pop(pointer, None)
+
+            if memory_pointer != self.__anchors[pointer]:
+                return
+
+            fingerprint = tuple(cells)
+        else:
+            low, high = window
+            start = memory_pointer + low
+            if 0 <= start and memory_pointer + high < len(cells):
+                fingerprint = tuple(cells[start:memory_pointer + high + 1])
+            else:
+                fingerprint = tuple(cells[(memory_pointer + offset) % len(cells)]
+                                    for offset in range(low, high + 1))
+
+        fingerprint = (memory_pointer, fingerprint)
+        fingerprints = self.__fingerprints.setdefault(pointer, set())
+
+        if fingerprint in fingerprints:
+            start = self.jump_table[pointer]
+            location = f'tokens {start}-{pointer}'
+            if len(self.verses) > pointer:
+                location += f', lines {self.verses[start]}-{self.verses[pointer]}'
+
+            raise InfiniteLoopException(
+                f'Infinite loop ({location}): the loop repeats the same state at memory pointer '
+                f'{memory_pointer} after {len(fingerprints)} checked iterations without input or output.')
+
+        if len(fingerprints) >= self.MAX_FINGERPRINTS:
+            fingerprints.clear()
+
+        fingerprints.add(fingerprint)
+
+    def exit(self, pointer: int) -> None:
+        """Forgets the fingerprints of a loop when it terminates.
+
+        Args:
+            pointer (int): Index of the POOL token.
+        """
+
+        self.__fingerprints.pop(pointer, None)
+        self.__anchors.pop(pointer, None)
+        self.__back_jumps.pop(pointer, None)
+
+    def clear(self) -> None:
+        """Forgets the fingerprints of all loops, e.g. when the program is reset.
+        """
+
+        self.__fingerprints.clear()
+        self.__anchors.clear()
+        self.__back_jumps.clear()
+
+    def __analyze_body(self, body: bytes):
+        """Determines which memory cells a loop body can reach.
+
+        Args:
+            body (bytes): Tokens between LOOP and POOL.
+
+        Returns:
+            tuple: Lowest and highest reachable offset from the memory pointer. None, if
+                the body contains loops or moves the memory pointer. False, if the body
+                contains I/O.
+        """
+
+        if any(token in self.IO_TOKENS for token in body):
+            return False
+
+        if Token.LOOP in body or Token.POOL in body:
+            return None
+
+        offset = low = high = 0
+        for token in body:
+            if token == Token.INCPTR:
+                offset += 1
+            elif token == Token.DECPTR:
+                offset -= 1
+            low = min(low, offset)
+            high = max(high, offset)
+
+        if offset != 0 or high - low >= self.memory_size:
+            return None
+
+        return low, high
@@ -5,6 +5,7 @@ class Memory:
         _memory (list): The list that represents the memory.
         _size (int): Size of the memory.
         _pointer (int): Points at the current memory position.
+        high_water_mark (int): Highest position the pointer has reached.
     """
 
     def __init__(self, size=1024):
@@ -17,6 +18,7 @@ class Memory:
         self._memory = [0]*size
         self._size = size
         self._pointer = 0
+        self.high_water_mark = 0
 
     def reset(self) -> None:
         """Sets pointer to 0 and sets all memory cells to 0.
@@ -25,6 +27,21 @@ class Memory:
         self._memory = [0]*self._size
         self.set_pointer_value(0)
 
+    def load(self, values, pointer=0) -> None:
+        """Replaces the memory contents with the given values and sets the pointer.
+
+        Args:
+            values (Iterable[int]): New memory contents. Must have the size of the memory.
+            pointer (int, optional): New pointer value. Defaults to 0.
+        """
+
+        memory = list(values)
+        if len(memory) != self._size:
+            raise ValueError(f'Expected {self._size} memory cells, got {len(memory)}.')
+
+        self._memory = memory
+        self.set_pointer_value(pointer)
+
     def increment_pointer(self, steps=1) -> None:
         """Increments the pointer position by a given number of steps.
 
@@ -34,6 +51,9 @@ class Memory:
 
         self._pointer = (self._pointer + steps) % self._size
 
+        if self._pointer > self.high_water_mark:
+            self.high_water_mark = self._pointer
+
     def decrement_pointer(self, steps=1) -> None:
         """Decrements the pointer position by a given number of steps.
 
@@ -43,6 +63,26 @@ class Memory:
 
         self._pointer = (self._pointer - steps) % self._size
 
+        if self._pointer > self.high_water_mark:
+            self.high_water_mark = self._pointer
+
+    def increment_pointer_in_bounds(self) -> None:
+        """Increments the pointer by one without wrapping around. Only valid if the pointer
+        is proven not to be at the last cell, see TapeBounds.
+        """
+
+        self._pointer += 1
+
+        if self._pointer > self.high_water_mark:
+            self.high_water_mark = self._pointer
+
+    def decrement_pointer_in_bounds(self) -> None:
+        """Decrements the pointer by one without wrapping around. Only valid if the pointer
+        is proven not to be at the first cell, see TapeBounds.
+        """
+
+        self._pointer -= 1
+
     def set_pointer_value(self, value: int) -> None:
         """Sets the memory pointer to the given value.
 
@@ -52,6 +92,9 @@ class Memory:
 
         self._pointer = value % self._size
 
+        if self._pointer > self.high_water_mark:
+            self.high_water_mark = self._pointer
+
     def get_pointer_value(self) -> int:
         """Returns the current memory pointer value.
 
@@ -0,0 +1,164 @@
+import json
+import time
+from contextlib import contextmanager
+
+
+class Metrics:
+    """Collects phase timings and counters of tokenization and execution.
+
+    Timings are accumulated in seconds per phase. Phases can be nested, e.g. the
+    tokenization phase contains the line extraction, syllable counting and the
+    stylistic device detectors.
+
+    Attributes:
+        timings (dict): Accumulated seconds per phase.
+        counters (dict): Counter values by name.
+    """
+
+    # Counters that hold the highest observed value instead of a sum.
+    MAXIMUM_COUNTERS = ('tape_high_water_mark',)
+
+    # Descriptions of the known counters for the Prometheus text format.
+    DESCRIPTIONS = {
+        'steps': 'Executed instructions.',
+        'output_bytes': 'Bytes written by OUT instructions.',
+        'input_bytes': 'Bytes read by IN instructions.',
+        'tape_high_water_mark': 'Highest memory cell the memory pointer has reached.',
+        'lines': 'Analyzed text lines.',
+        'tokens': 'Created program tokens.',
+    }
+
+    def __init__(self):
+        self.timings = dict()
+        self.counters = dict()
+
+    @contextmanager
+    def measure(self, phase: str):
+        """Measures the time spent in the body of a with statement.
+
+        Args:
+            phase (str): Name of the phase.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - start)
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """Adds the given time to a phase.
+
+        Args:
+            phase (str): Name of the phase.
+            seconds (float): Duration in seconds.
+        """
+
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def increment(self, name: str, value=1) -> None:
+        """Increments a counter.
+
+        Args:
+            name (str): Name of the counter.
+            value (int, optional): Value to add. Defaults to 1.
+        """
+
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def maximum(self, name: str, value: int) -> None:
+        """Raises a counter to the given value if it is higher.
+
+        Args:
+            name (str): Name of the counter.
+            value (int): Observed value.
+        """
+
+        if value > self.counters.get(name, value - 1):
+            self.counters[name] = value
+
+    def merge(self, other: 'Metrics') -> None:
+        """Adds the timings and counters of another metrics instance.
+
+        Args:
+            other (Metrics): Metrics to add.
+        """
+
+        for phase, seconds in other.timings.items():
+            self.add_time(phase, seconds)
+
+        for name, value in other.counters.items():
+            if name in self.MAXIMUM_COUNTERS:
+                self.maximum(name, value)
+            else:
+                self.increment(name, value)
+
+    def clear(self) -> None:
+        """Removes all timings and counters.
+        """
+
+        self.timings.clear()
+        self.counters.clear()
+
+    @property
+    def steps_per_second(self) -> float:
+        """Executed instructions per second of execution time.
+        """
+
+        seconds = self.timings.get('execution', 0.0)
+        return self.counters.get('steps', 0) / seconds if seconds else 0.0
+
+    def as_dict(self) -> dict:
+        """Returns all metrics as dictionary.
+
+        Returns:
+            dict: Phase timings in seconds, counters and execution speed.
+        """
+
+        return {
+            'timings': dict(self.timings),
+            'counters': dict(self.counters),
+            'steps_per_second': self.steps_per_second,
+        }
+
+    def to_json(self) -> str:
+        """Returns all metrics as JSON document.
+
+        Returns:
+            str: JSON encoded metrics.
+        """
+
+        return json.dumps(self.as_dict(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix='goethe') -> str:
+        """Returns all metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): Prefix of all metric names. Defaults to 'goethe'.
+
+        Returns:
+            str: Metrics in the Prometheus text format.
+        """
+
+        lines = [
+            f'# HELP {prefix}_phase_seconds_total Time spent per phase.',
+            f'# TYPE {prefix}_phase_seconds_total counter',
+        ]
+        for phase, seconds in sorted(self.timings.items()):
+            lines.append(f'{prefix}_phase_seconds_total{{phase="{phase}"}} {seconds:.9f}')
+
+        for name, value in sorted(self.counters.items()):
+            if name in self.MAXIMUM_COUNTERS:
+                metric, kind = f'{prefix}_{name}', 'gauge'
+            else:
+                metric, kind = f'{prefix}_{name}_total', 'counter'
+
+            lines.append(f'# HELP {metric} {self.DESCRIPTIONS.get(name, name)}')
+            lines.append(f'# TYPE {metric} {kind}')
+            lines.append(f'{metric} {value}')
+
+        lines.append(f'# HELP {prefix}_steps_per_second Executed instructions per second of execution time.')
+        lines.append(f'# TYPE {prefix}_steps_per_second gauge')
+        lines.append(f'{prefix}_steps_per_second {self.steps_per_second:.3f}')
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,85 @@
+import sys
+import time
+import argparse
+
+from goethe.SharedMemory import SharedMemory
+
+
+def render(status: dict, memory: list, steps_per_second: float, rows=8, columns=16) -> str:
+    """Formats the status and the memory tape of a running program.
+
+    Args:
+        status (dict): Execution status, see SharedMemory.status().
+        memory (list): Memory tape.
+        steps_per_second (float): Current execution speed.
+        rows (int, optional): Number of displayed tape rows. Defaults to 8.
+        columns (int, optional): Number of cells per row. Defaults to 16.
+
+    Returns:
+        str: Text to display.
+    """
+
+    length = status['program_length']
+    progress = 100 * status['pointer'] / length if length else 0.0
+    lines = [
+        f"pointer {status['pointer']}/{length} ({progress:.1f}%)  "
+        f"steps {status['steps']}  {steps_per_second:,.0f} steps/s  "
+        f"memory pointer {status['memory_pointer']}",
+        '',
+    ]
+
+    # Shows the rows around the memory pointer.
+    first_row = status['memory_pointer'] // columns - rows // 2
+    for row in range(first_row, first_row + rows):
+        start = (row * columns) % len(memory)
+        cells = []
+        for cell in range(start, min(start + columns, len(memory))):
+            value = f'{memory[cell]:>5}'
+            cells.append(f'[{value}]' if cell == status['memory_pointer'] else f' {value} ')
+        lines.append(f'{start:>5}: ' + ''.join(cells))
+
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="goethe monitor",
+                                     description="Shows the memory tape and progress of a running Goethe program.")
+    parser.add_argument("name", help="Name of the shared memory block (goethe --shared-memory NAME)")
+    parser.add_argument("--interval", action="store", type=float, default=0.5,
+                        help="Seconds between two updates (default: 0.5)")
+    parser.add_argument("--rows", action="store", type=int, default=8,
+                        help="Number of displayed tape rows (default: 8)")
+    args = parser.parse_args(argv)
+
+    try:
+        memory = SharedMemory.attach(args.name)
+    except FileNotFoundError:
+        sys.stderr.write(f'error: no running program with shared memory {args.name}\n')
+        sys.exit(1)
+
+    last_steps = memory.status()['steps']
+    last_time = time.monotonic()
+
+    try:
+        while True:
+            status = memory.status()
+            now = time.monotonic()
+            steps_per_second = (status['steps'] - last_steps) / max(now - last_time, 1e-9)
+            last_steps, last_time = status['steps'], now
+
+            # Clears the terminal before every update.
+            print('\x1b[H\x1b[2J' + render(status, memory.to_list(), steps_per_second, args.rows), flush=True)
+
+            if status['finished']:
+                print('\nProgram finished.')
+                break
+
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        memory.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,786 @@
+import os
+import sys
+import shutil
+import ctypes
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from typing import Union
+
+from goethe.Token import Token
+from goethe.Program import Program
+from goethe.Optimizer import Optimizer
+from goethe.Runtime import Result
+
+
+# Default directory of compiled programs.
+DEFAULT_NATIVE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                                  'goethe', 'native')
+
+
+class NativeException(Exception):
+    pass
+
+
+# Support code of every generated program. The program itself is the function goethe_execute().
+RUNTIME = r'''
+#include <errno.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
+
+#define MEMORY_SIZE 256
+#define RANDOM_BUFFER_SIZE 1024
+#define BUFFER_SIZE 65536
+
+enum {
+    GOETHE_OK,
+    GOETHE_INVALID_CHARACTER,
+    GOETHE_END_OF_INPUT,
+    GOETHE_INVALID_INPUT,
+    GOETHE_IO_ERROR,
+    GOETHE_NO_MEMORY,
+};
+
+struct goethe_state {
+    /* Console mode reads UTF-8 from stdin and writes UTF-8 to stdout, otherwise code points are passed. */
+    int console;
+    const uint32_t *input;
+    size_t input_length, input_position;
+    unsigned char input_buffer[BUFFER_SIZE];
+    size_t input_buffer_length, input_buffer_position;
+    unsigned char *output;
+    size_t output_length, output_capacity;
+    /* Mersenne Twister with the seeding and byte order of Python's random module. */
+    uint32_t mt[624];
+    int mt_index;
+    unsigned char random_buffer[RANDOM_BUFFER_SIZE];
+    size_t random_index;
+    int64_t tape[MEMORY_SIZE];
+    int64_t steps;
+};
+
+static void mt_init(struct goethe_state *s, uint32_t seed) {
+    s->mt[0] = seed;
+    for (int i = 1; i < 624; i++)
+        s->mt[i] = 1812433253U * (s->mt[i - 1] ^ (s->mt[i - 1] >> 30)) + (uint32_t) i;
+    s->mt_index = 624;
+}
+
+static void mt_seed(struct goethe_state *s, const uint32_t *key, size_t length) {
+    size_t i = 1, j = 0, k = length > 624 ? length : 624;
+
+    mt_init(s, 19650218U);
+    for (; k; k--) {
+        s->mt[i] = (s->mt[i] ^ ((s->mt[i - 1] ^ (s->mt[i - 1] >> 30)) * 1664525U)) + key[j] + (uint32_t) j;
+        i++;
+        j++;
+        if (i >= 624) {
+            s->mt[0] = s->mt[623];
+            i = 1;
+        }
+        if (j >= length)
+            j = 0;
+    }
+    for (k = 623; k; k--) {
+        s->mt[i] = (s->mt[i] ^ ((s->mt[i - 1] ^ (s->mt[i - 1] >> 30)) * 1566083941U)) - (uint32_t) i;
+        i++;
+        if (i >= 624) {
+            s->mt[0] = s->mt[623];
+            i = 1;
+        }
+    }
+    s->mt[0] = 0x80000000U;
+    s->random_index = RANDOM_BUFFER_SIZE;
+}
+
+static void mt_seed_system(struct goethe_state *s) {
+    uint32_t key[4] = {(uint32_t) time(NULL), (uint32_t) getpid(), (uint32_t) clock(), (uint32_t) (uintptr_t) s};
+    FILE *file = fopen("/dev/urandom", "rb");
+
+    if (file != NULL) {
+        if (fread(key, sizeof key, 1, file) != 1)
+            key[0] ^= (uint32_t) time(NULL);
+        fclose(file);
+    }
+    mt_seed(s, key, 4);
+}
+
+static uint32_t mt_next(struct goethe_state *s) {
+    uint32_t y;
+
+    if (s->mt_index >= 624) {
+        for (int i = 0; i < 624; i++) {
+            y = (s->mt[i] & 0x80000000U) | (s->mt[(i + 1) % 624] & 0x7fffffffU);
+            s->mt[i] = s->mt[(i + 397) % 624] ^ (y >> 1) ^ (y & 1 ? 0x9908b0dfU : 0);
+        }
+        s->mt_index = 0;
+    }
+    y = s->mt[s->mt_index++];
+    y ^= y >> 11;
+    y ^= (y << 7) & 0x9d2c5680U;
+    y ^= (y << 15) & 0xefc60000U;
+    return y ^ (y >> 18);
+}
+
+static inline int64_t goethe_rnd(struct goethe_state *s) {
+    /* Like getrandbits(8 * RANDOM_BUFFER_SIZE).to_bytes(RANDOM_BUFFER_SIZE, 'little'). */
+    if (s->random_index >= RANDOM_BUFFER_SIZE) {
+        for (size_t i = 0; i < RANDOM_BUFFER_SIZE; i += 4) {
+            uint32_t word = mt_next(s);
+            s->random_buffer[i] = (unsigned char) word;
+            s->random_buffer[i + 1] = (unsigned char) (word >> 8);
+            s->random_buffer[i + 2] = (unsigned char) (word >> 16);
+            s->random_buffer[i + 3] = (unsigned char) (word >> 24);
+        }
+        s->random_index = 0;
+    }
+    return s->random_buffer[s->random_index++];
+}
+
+static int goethe_flush(struct goethe_state *s) {
+    size_t written = 0;
+
+    while (written < s->output_length) {
+        ssize_t count = write(1, s->output + written, s->output_length - written);
+        if (count < 0 && errno == EINTR)
+            continue;
+        if (count <= 0)
+            return GOETHE_IO_ERROR;
+        written += (size_t) count;
+    }
+    s->output_length = 0;
+    return GOETHE_OK;
+}
+
+static int goethe_reserve(struct goethe_state *s, size_t length) {
+    unsigned char *output;
+    size_t capacity;
+
+    if (s->output_length + length <= s->output_capacity)
+        return GOETHE_OK;
+    if (s->console)
+        return goethe_flush(s);
+
+    capacity = s->output_capacity ? 2 * s->output_capacity : BUFFER_SIZE;
+    output = realloc(s->output, capacity);
+    if (output == NULL)
+        return GOETHE_NO_MEMORY;
+    s->output = output;
+    s->output_capacity = capacity;
+    return GOETHE_OK;
+}
+
+static inline int goethe_out(struct goethe_state *s, int64_t value) {
+    uint32_t code = (uint32_t) value;
+    unsigned char *output;
+    int status;
+
+    if (value < 0 || value > 0x10ffff || (value >= 0xd800 && value <= 0xdfff))
+        return GOETHE_INVALID_CHARACTER;
+    if ((status = goethe_reserve(s, 4)))
+        return status;
+
+    output = s->output + s->output_length;
+    if (!s->console) {
+        memcpy(output, &code, 4);
+        s->output_length += 4;
+    } else if (code < 0x80) {
+        output[0] = (unsigned char) code;
+        s->output_length += 1;
+    } else if (code < 0x800) {
+        output[0] = (unsigned char) (0xc0 | code >> 6);
+        output[1] = (unsigned char) (0x80 | (code & 0x3f));
+        s->output_length += 2;
+    } else if (code < 0x10000) {
+        output[0] = (unsigned char) (0xe0 | code >> 12);
+        output[1] = (unsigned char) (0x80 | (code >> 6 & 0x3f));
+        output[2] = (unsigned char) (0x80 | (code & 0x3f));
+        s->output_length += 3;
+    } else {
+        output[0] = (unsigned char) (0xf0 | code >> 18);
+        output[1] = (unsigned char) (0x80 | (code >> 12 & 0x3f));
+        output[2] = (unsigned char) (0x80 | (code >> 6 & 0x3f));
+        output[3] = (unsigned char) (0x80 | (code & 0x3f));
+        s->output_length += 4;
+    }
+    return GOETHE_OK;
+}
+
+static int goethe_read_byte(struct goethe_state *s) {
+    ssize_t count;
+
+    if (s->input_buffer_position == s->input_buffer_length) {
+        /* Pending output, e.g. a prompt, is written before waiting for input. */
+        if (goethe_flush(s))
+            return -2;
+        do
+            count = read(0, s->input_buffer, BUFFER_SIZE);
+        while (count < 0 && errno == EINTR);
+        if (count < 0)
+            return -2;
+        if (count == 0)
+            return -1;
+        s->input_buffer_length = (size_t) count;
+        s->input_buffer_position = 0;
+    }
+    return s->input_buffer[s->input_buffer_position++];
+}
+
+static inline int goethe_in(struct goethe_state *s, int64_t *cell) {
+    uint32_t code, minimum;
+    int byte, length;
+
+    if (!s->console) {
+        if (s->input_position < s->input_length)
+            *cell = s->input[s->input_position++];
+        return GOETHE_OK;
+    }
+
+    byte = goethe_read_byte(s);
+    if (byte == -2)
+        return GOETHE_IO_ERROR;
+    if (byte < 0)
+        return GOETHE_END_OF_INPUT;
+    /* Line breaks do not change the memory, like in the console mode of the interpreter. */
+    if (byte == '\n')
+        return GOETHE_OK;
+
+    if (byte < 0x80) {
+        *cell = byte;
+        return GOETHE_OK;
+    } else if ((byte & 0xe0) == 0xc0) {
+        code = byte & 0x1f, length = 1, minimum = 0x80;
+    } else if ((byte & 0xf0) == 0xe0) {
+        code = byte & 0x0f, length = 2, minimum = 0x800;
+    } else if ((byte & 0xf8) == 0xf0) {
+        code = byte & 0x07, length = 3, minimum = 0x10000;
+    } else {
+        return GOETHE_INVALID_INPUT;
+    }
+
+    while (length--) {
+        byte = goethe_read_byte(s);
+        if (byte == -2)
+            return GOETHE_IO_ERROR;
+        if (byte < 0 || (byte & 0xc0) != 0x80)
+            return GOETHE_INVALID_INPUT;
+        code = code << 6 | (uint32_t) (byte & 0x3f);
+    }
+    if (code < minimum || code > 0x10ffff || (code >= 0xd800 && code <= 0xdfff))
+        return GOETHE_INVALID_INPUT;
+
+    *cell = code;
+    return GOETHE_OK;
+}
+
+static int goethe_execute(struct goethe_state *s);
+
+static struct goethe_state *goethe_create(int console, const uint32_t *seed, size_t seed_length) {
+    struct goethe_state *s = calloc(1, sizeof *s);
+
+    if (s == NULL)
+        return NULL;
+    s->console = console;
+    if (seed != NULL)
+        mt_seed(s, seed, seed_length);
+    else
+        mt_seed_system(s);
+    if (console) {
+        s->output = malloc(BUFFER_SIZE);
+        s->output_capacity = BUFFER_SIZE;
+        if (s->output == NULL) {
+            free(s);
+            return NULL;
+        }
+    }
+    return s;
+}
+
+#ifdef GOETHE_SHARED
+
+/* Runs the program with the given input code points. Safe to call from several threads at once. */
+int goethe_run(const uint32_t *input, size_t input_length, const uint32_t *seed, size_t seed_length,
+               uint32_t **output, size_t *output_length, int64_t *steps) {
+    struct goethe_state *s = goethe_create(0, seed, seed_length);
+    int status;
+
+    *output = NULL;
+    *output_length = 0;
+    *steps = 0;
+    if (s == NULL)
+        return GOETHE_NO_MEMORY;
+
+    s->input = input;
+    s->input_length = input_length;
+    status = goethe_execute(s);
+
+    *output = (uint32_t *) s->output;
+    *output_length = s->output_length / 4;
+    *steps = s->steps;
+    free(s);
+    return status;
+}
+
+void goethe_free(void *output) {
+    free(output);
+}
+
+#else
+
+static const char *const goethe_errors[] = {
+    "",
+    "the program wrote a value that is not a valid character",
+    "end of input",
+    "the input is not valid UTF-8",
+    "input or output failed",
+    "out of memory",
+};
+
+int main(int argc, char **argv) {
+    struct goethe_state *s;
+    unsigned long long value = 0;
+    uint32_t seed[2] = {0, 0};
+    const char *text;
+    char *end;
+    int status;
+
+    if (argc == 3 && strcmp(argv[1], "--seed") == 0) {
+        /* Seeds are used like Python's random.seed(), which ignores the sign. */
+        text = argv[2][0] == '-' ? argv[2] + 1 : argv[2];
+        errno = 0;
+        value = strtoull(text, &end, 10);
+        if (errno || end == text || *end || *text == '-') {
+            fprintf(stderr, "error: invalid seed %s\n", argv[2]);
+            return 2;
+        }
+        seed[0] = (uint32_t) value;
+        seed[1] = (uint32_t) (value >> 32);
+    } else if (argc != 1) {
+        fprintf(stderr, "usage: %s [--seed SEED]\n", argv[0]);
+        return 2;
+    }
+
+    s = goethe_create(1, argc == 3 ? seed : NULL, seed[1] ? 2 : 1);
+    if (s == NULL) {
+        fprintf(stderr, "error: %s\n", goethe_errors[GOETHE_NO_MEMORY]);
+        return 1;
+    }
+
+    status = goethe_execute(s);
+    if (status == GOETHE_OK)
+        status = goethe_out(s, '\n');
+    if (goethe_flush(s) && status == GOETHE_OK)
+        status = GOETHE_IO_ERROR;
+    if (status != GOETHE_OK) {
+        fprintf(stderr, "\nerror: %s\n", goethe_errors[status]);
+        return 1;
+    }
+    return 0;
+}
+
+#endif
+'''
+
+
+class NativeCompiler:
+    """Translates programs to C and compiles them with the system C compiler.
+
+    The program is lowered to one C function with a label for every jump target.
+    Pointer movements between two loop brackets are folded into constant offsets,
+    consecutive value changes of the same cell are merged, and loops without I/O that
+    change their counter cell by one per iteration, e.g. `[->+<]`, are executed in a
+    single pass. Memory cells are 64 bit integers.
+
+    The result is either a standalone executable, which behaves like the interpreter
+    in console mode, or a shared library for NativeProgram, which behaves like
+    goethe.run(). Compiled programs are cached by program hash.
+    """
+
+    VERSION = 1
+
+    # Tokens that are executed by a call to the runtime.
+    IO_TOKENS = (Token.OUT, Token.IN, Token.RND)
+
+    def __init__(self, path=DEFAULT_NATIVE_DIR, compiler=None, flags=('-O2',)):
+        """
+        Args:
+            path (str, optional): Cache directory of compiled programs. Defaults to DEFAULT_NATIVE_DIR.
+            compiler (str, optional): C compiler command. Defaults to $CC or cc.
+            flags (tuple, optional): Additional compiler flags. Defaults to ('-O2',).
+        """
+
+        self.path = path
+        self.compiler = compiler or os.environ.get('CC') or 'cc'
+        self.flags = tuple(flags)
+        self.memory_size = 256
+
+    def generate(self, program: Program) -> str:
+        """Translates a program to C.
+
+        Args:
+            program (Program): Tokenized program, optionally optimized.
+
+        Raises:
+            NativeException: If memory values of the precomputed prefix do not fit into 64 bits.
+
+        Returns:
+            str: C source code.
+        """
+
+        tokens, jump_table, prefix = program.tokens, program.jump_table, program.prefix
+        entry = prefix.pointer if prefix is not None else 0
+
+        # Tokens that execution can continue at after a jump.
+        targets = {entry, len(tokens)}
+        for index, token in enumerate(tokens):
+            if token == Token.LOOP or token == Token.POOL:
+                targets.add(jump_table[index] + 1)
+
+        lines = [
+            'static int goethe_execute(struct goethe_state *s) {',
+            '    int64_t *tape = s->tape;',
+            f'    unsigned p = {prefix.memory_pointer if prefix is not None else 0};',
+            '    int64_t steps = 0, n;',
+            '    int status = GOETHE_OK;',
+            '',
+            '    (void) n;',
+        ]
+
+        if prefix is not None:
+            if any(not -2 ** 63 < value < 2 ** 63 for value in prefix.memory):
+                raise NativeException('The precomputed memory of the program does not fit into 64 bit cells.')
+
+            lines += [f'    tape[{cell}] = {value}LL;' for cell, value in enumerate(prefix.memory) if value]
+            lines += [f'    if ((status = goethe_out(s, {ord(char)}))) goto fail;' for char in prefix.output]
+
+        lines.append(f'    goto T{entry};')
+
+        index = 0
+        while index < len(tokens):
+            if index in targets:
+                lines.append(f'T{index}:')
+
+            token = tokens[index]
+            if token == Token.LOOP:
+                end = jump_table[index]
+                if 0 <= end < len(tokens) and tokens[end] == Token.POOL and jump_table[end] == index:
+                    lines += self.__linear_loop(tokens[index + 1:end], end)
+                lines += ['    steps += 1;', f'    if (!tape[p]) goto T{end + 1};']
+                index += 1
+            elif token == Token.POOL:
+                lines += ['    steps += 1;', f'    if (tape[p]) goto T{jump_table[index] + 1};']
+                index += 1
+            else:
+                end = index + 1
+                while end < len(tokens) and tokens[end] not in (Token.LOOP, Token.POOL) and end not in targets:
+                    end += 1
+                lines += self.__block(tokens[index:end])
+                index = end
+
+        lines += [
+            f'T{len(tokens)}:',
+            '    s->steps = steps;',
+            '    return GOETHE_OK;',
+            'fail:',
+            '    s->steps = steps;',
+            '    return status;',
+            '}',
+        ]
+
+        return RUNTIME + '\n' + '\n'.join(lines) + '\n'
+
+    def build(self, program: Program, shared=False) -> str:
+        """Compiles a program or returns the cached result of an earlier compilation.
+
+        Args:
+            program (Program): Tokenized program, optionally optimized.
+            shared (bool, optional): Builds a shared library for NativeProgram instead of an
+                executable. Defaults to False.
+
+        Raises:
+            NativeException: If the program cannot be translated or the compiler fails.
+
+        Returns:
+            str: Path of the executable or shared library in the cache directory.
+        """
+
+        path = os.path.join(self.path, self.key(program, shared) + ('.so' if shared else ''))
+        if os.path.exists(path):
+            return path
+
+        source = self.generate(program)
+        command = [self.compiler, *self.flags, '-fwrapv']
+        if shared:
+            command += ['-shared', '-fPIC', '-DGOETHE_SHARED']
+
+        os.makedirs(self.path, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self.path) as directory:
+            source_path = os.path.join(directory, 'program.c')
+            output_path = os.path.join(directory, 'program')
+            with open(source_path, 'w') as file:
+                file.write(source)
+
+            try:
+                result = subprocess.run(command + ['-o', output_path, source_path], capture_output=True, text=True)
+            except OSError as exception:
+                raise NativeException(f'The C compiler {self.compiler} could not be started: {exception}')
+
+            if result.returncode != 0:
+                raise NativeException(f'The C compiler failed:\n{result.stderr}')
+
+            # Other processes only ever see complete files.
+            os.replace(output_path, path)
+
+        return path
+
+    def key(self, program: Program, shared=False) -> str:
+        """Returns the cache key of a compiled program.
+
+        Args:
+            program (Program): Tokenized program.
+            shared (bool, optional): Whether the key is for a shared library. Defaults to False.
+
+        Returns:
+            str: SHA-256 hex digest.
+        """
+
+        # Optimized programs start behind their prefix, so the prefix is part of the key.
+        prefix = program.prefix.pointer if program.prefix is not None else -1
+        flags = ' '.join(self.flags)
+
+        return hashlib.sha256(
+            f'{self.VERSION}\0{program.hash}\0{prefix}\0{self.compiler}\0{flags}\0{shared}'.encode('utf-8')).hexdigest()
+
+    def load(self, program: Program) -> 'NativeProgram':
+        """Compiles a program as shared library and loads it.
+
+        Args:
+            program (Program): Tokenized program, optionally optimized.
+
+        Returns:
+            NativeProgram: The loaded program.
+        """
+
+        return NativeProgram(self.build(program, shared=True))
+
+    def __block(self, tokens: bytes) -> list:
+        """Generates the code of a token sequence without loop brackets.
+
+        Args:
+            tokens (bytes): Token sequence.
+
+        Returns:
+            list: Lines of code.
+        """
+
+        operations = []
+        offset = 0
+        for position, token in enumerate(tokens):
+            if token == Token.INCPTR:
+                offset += 1
+            elif token == Token.DECPTR:
+                offset -= 1
+            elif token in (Token.INCVAL, Token.DECVAL):
+                change = 1 if token == Token.INCVAL else -1
+                if operations and operations[-1][0] == 'add' and operations[-1][1] == offset:
+                    operations[-1] = ('add', offset, operations[-1][2] + change)
+                else:
+                    operations.append(('add', offset, change))
+            elif token in self.IO_TOKENS:
+                operations.append((Token(token).name, offset, position))
+
+        lines = []
+        counted = 0
+        for kind, cell_offset, argument in operations:
+            cell = self.__cell(cell_offset)
+            if kind == 'add':
+                if argument:
+                    lines.append(f'    {cell} += {argument};')
+                continue
+
+            # Steps are counted before I/O, so they are exact if the instruction fails.
+            if argument > counted:
+                lines.append(f'    steps += {argument - counted};')
+                counted = argument
+
+            if kind == 'RND':
+                lines.append(f'    {cell} = goethe_rnd(s);')
+            elif kind == 'OUT':
+                lines.append(f'    if ((status = goethe_out(s, {cell}))) goto fail;')
+            else:
+                lines.append(f'    if ((status = goethe_in(s, &{cell}))) goto fail;')
+
+        if len(tokens) > counted:
+            lines.append(f'    steps += {len(tokens) - counted};')
+        if offset % self.memory_size:
+            lines.append(f'    p = (p + {offset % self.memory_size}) % MEMORY_SIZE;')
+
+        return lines
+
+    def __linear_loop(self, body: bytes, end: int) -> list:
+        """Generates the single pass of a loop whose counter cell reaches zero after a known
+        number of iterations. The loop is executed normally if the counter moves away from zero.
+
+        Args:
+            body (bytes): Tokens between LOOP and POOL.
+            end (int): Index of the POOL token.
+
+        Returns:
+            list: Lines of code. Empty, if the loop is not such a loop.
+        """
+
+        if any(token in self.IO_TOKENS or token in (Token.LOOP, Token.POOL) for token in body):
+            return []
+
+        changes = dict()
+        offset = 0
+        for token in body:
+            if token == Token.INCPTR:
+                offset += 1
+            elif token == Token.DECPTR:
+                offset -= 1
+            elif token in (Token.INCVAL, Token.DECVAL):
+                cell = offset % self.memory_size
+                changes[cell] = changes.get(cell, 0) + (1 if token == Token.INCVAL else -1)
+
+        counter = changes.pop(0, 0)
+        if offset % self.memory_size or counter not in (1, -1):
+            return []
+
+        return [
+            f'    n = {"-" if counter > 0 else ""}tape[p];',
+            '    if (n > 0) {',
+            *(f'        {self.__cell(cell)} += n * {change};' for cell, change in changes.items() if change),
+            '        tape[p] = 0;',
+            f'        steps += 1 + n * {len(body) + 1};',
+            f'        goto T{end + 1};',
+            '    }',
+        ]
+
+    def __cell(self, offset: int) -> str:
+        """Returns the expression of the memory cell at an offset from the memory pointer.
+
+        Args:
+            offset (int): Offset from the memory pointer.
+
+        Returns:
+            str: C expression.
+        """
+
+        offset %= self.memory_size
+        return f'tape[(p + {offset}) % MEMORY_SIZE]' if offset else 'tape[p]'
+
+
+class NativeProgram:
+    """A program compiled as shared library, see NativeCompiler.
+
+    Every run has its own memory, input, output and random number generator, and the
+    library is called without holding the GIL, so runs in several threads execute in
+    parallel.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of the shared library.
+        """
+
+        self.path = path
+        self.__library = ctypes.CDLL(path)
+        self.__library.goethe_run.restype = ctypes.c_int
+        self.__library.goethe_run.argtypes = [
+            ctypes.c_char_p, ctypes.c_size_t, ctypes.c_char_p, ctypes.c_size_t,
+            ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_size_t), ctypes.POINTER(ctypes.c_int64),
+        ]
+        self.__library.goethe_free.restype = None
+        self.__library.goethe_free.argtypes = [ctypes.c_void_p]
+
+    def run(self, input: Union[bytes, str] = b'', seed=None) -> Result:
+        """Executes the program like goethe.run().
+
+        Args:
+            input (Union[bytes, str], optional): Input that is read by IN instructions. Defaults to b''.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+
+        Raises:
+            MemoryError: If the output does not fit into memory.
+
+        Returns:
+            Result: Output and executed steps. The output up to the error, if the run failed.
+        """
+
+        text = input.decode('utf-8', 'replace') if isinstance(input, bytes) else input
+        codes = text.encode('utf-32-le', 'surrogatepass')
+
+        key = None
+        if seed is not None:
+            # The same key as Python's random.seed() for integers.
+            seed = abs(seed)
+            key = seed.to_bytes(4 * max(1, (seed.bit_length() + 31) // 32), 'little')
+
+        output = ctypes.c_void_p()
+        length = ctypes.c_size_t()
+        steps = ctypes.c_int64()
+        status = self.__library.goethe_run(codes, len(codes) // 4, key, len(key) // 4 if key else 0,
+                                           ctypes.byref(output), ctypes.byref(length), ctypes.byref(steps))
+
+        try:
+            text = ctypes.string_at(output, 4 * length.value).decode('utf-32-le') if length.value else ''
+        finally:
+            self.__library.goethe_free(output)
+
+        if status == 5:
+            raise MemoryError('The program output does not fit into memory.')
+
+        error = ValueError('The program wrote a value that is not a valid character.') if status else None
+        return Result(text.encode('utf-8'), steps.value, error)
+
+
+def main(argv=None):
+    from goethe.Syllables import BACKENDS
+
+    parser = argparse.ArgumentParser(prog="goethe build",
+                                     description="Compiles a Goethe program to a native executable with a C compiler.")
+    parser.add_argument("input", help="Input file (.goethe)")
+    parser.add_argument("-o", "--output", action="store",
+                        help="Output file (default: input file without extension, .so for --shared)")
+    parser.add_argument("--shared", action="store_true",
+                        help="Build a shared library for goethe.Native.NativeProgram instead of an executable")
+    parser.add_argument("--emit-c", action="store_true",
+                        help="Write the generated C code instead of compiling it ('-' for stdout)")
+    parser.add_argument("--syllables", action="store", choices=sorted(BACKENDS), default="pyphen",
+                        help="Syllable counter (default: pyphen)")
+    parser.add_argument("--cc", action="store", help="C compiler (default: $CC or cc)")
+    parser.add_argument("--cache", action="store", default=DEFAULT_NATIVE_DIR, metavar="DIR",
+                        help="Directory of compiled programs (default: ~/.cache/goethe/native)")
+    args = parser.parse_args(argv)
+
+    with open(args.input) as file:
+        program = Optimizer().optimize(Program.from_lines(file, syllables=args.syllables))
+
+    compiler = NativeCompiler(args.cache, args.cc)
+    output = args.output or os.path.splitext(args.input)[0] + ('.so' if args.shared else '')
+
+    try:
+        if args.emit_c:
+            source = compiler.generate(program)
+            if output == '-':
+                sys.stdout.write(source)
+            else:
+                with open(output if args.output else output + '.c', 'w') as file:
+                    file.write(source)
+            return
+
+        shutil.copy2(compiler.build(program, args.shared), output)
+    except NativeException as exception:
+        sys.stderr.write(f'error: {exception}\n')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+from typing import NamedTuple
+
+from goethe.Token import Token
+from goethe.Metrics import Metrics
+from goethe.Program import Program
+
+
+class Prefix(NamedTuple):
+    """Precomputed result of the input-independent start of a program.
+
+    Attributes:
+        pointer (int): Index of the first token that was not evaluated.
+        memory (tuple): Memory tape after the prefix.
+        memory_pointer (int): Memory pointer after the prefix.
+        output (str): Output of the prefix.
+        steps (int): Number of evaluated instructions.
+    """
+
+    pointer: int
+    memory: tuple
+    memory_pointer: int
+    output: str
+    steps: int
+
+
+class Optimizer:
+    """Optimizes tokenized programs before they are executed.
+
+    Loops that can never be entered are removed, and the start of the program up to the
+    first IN or RND instruction is evaluated in advance. The evaluated prefix is stored
+    with the program, so an interpreter can start right behind it.
+    """
+
+    def __init__(self, memory_size=256, max_steps=100000, metrics=None):
+        """
+        Args:
+            memory_size (int, optional): Memory size of the interpreter. Defaults to 256.
+            max_steps (int, optional): Maximum number of instructions to evaluate in advance. Defaults to 100000.
+            metrics (Metrics, optional): Receives the optimization time. Defaults to a new instance.
+        """
+
+        self.memory_size = memory_size
+        self.max_steps = max_steps
+        self.metrics = metrics if metrics is not None else Metrics()
+
+    def optimize(self, program: Program) -> Program:
+        """Removes dead loops from the program and evaluates its prefix.
+
+        Args:
+            program (Program): Tokenized program.
+
+        Returns:
+            Program: The optimized program.
+        """
+
+        with self.metrics.measure('optimization'):
+            program = self.remove_dead_loops(program)
+            prefix = self.evaluate_prefix(program)
+
+        if prefix.steps == 0:
+            return program
+
+        return Program(program.tokens, program.verses, prefix)
+
+    def remove_dead_loops(self, program: Program) -> Program:
+        """Removes all loops whose LOOP token is always reached with a zero memory value.
+
+        The pass follows the program from start to end and keeps track of memory cells with
+        a known value, relative to the memory pointer. All cells are zero at the start of the
+        program, and the current cell is zero behind every POOL. Every other control flow
+        edge makes all cells unknown.
+
+        Args:
+            program (Program): Tokenized program.
+
+        Returns:
+            Program: Program without dead loops.
+        """
+
+        tokens = program.tokens
+        jump_table = program.jump_table
+        size = self.memory_size
+
+        # A POOL without matching LOOP jumps back to the start with arbitrary memory.
+        known = dict()
+        zero = -1 not in jump_table
+        offset = 0
+        removed = bytearray(len(tokens))
+
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+
+            if token == Token.LOOP:
+                value = known.get(offset, 0 if zero else None)
+                end = jump_table[index]
+
+                if value == 0 and end > index and tokens[end] == Token.POOL:
+                    removed[index:end + 1] = b'\x01' * (end + 1 - index)
+                    index = end + 1
+                    continue
+
+                known, zero, offset = dict(), False, 0
+
+            elif token == Token.POOL:
+                known, zero, offset = {0: 0}, False, 0
+
+            elif token in (Token.INCVAL, Token.DECVAL):
+                value = known.get(offset, 0 if zero else None)
+                if value is not None:
+                    value += 1 if token == Token.INCVAL else -1
+                known[offset] = value
+
+            elif token in (Token.IN, Token.RND):
+                known[offset] = None
+
+            elif token == Token.INCPTR:
+                offset = (offset + 1) % size
+
+            elif token == Token.DECPTR:
+                offset = (offset - 1) % size
+
+            index += 1
+
+        if not any(removed):
+            return program
+
+        return Program(
+            (token for token, dead in zip(tokens, removed) if not dead),
+            (line for line, dead in zip(program.verses, removed) if not dead),
+            program.prefix)
+
+    def evaluate_prefix(self, program: Program) -> Prefix:
+        """Executes the program from the start until it reaches an IN or RND instruction,
+        the end of the program or the step limit.
+
+        Args:
+            program (Program): Tokenized program.
+
+        Returns:
+            Prefix: Program status after the evaluated instructions.
+        """
+
+        tokens = program.tokens
+        jump_table = program.jump_table
+        size = self.memory_size
+
+        memory = [0] * size
+        memory_pointer = 0
+        pointer = 0
+        output = []
+        steps = 0
+
+        while pointer < len(tokens) and steps < self.max_steps:
+            token = tokens[pointer]
+
+            if token in (Token.IN, Token.RND) or token > Token.RND:
+                break
+            elif token == Token.LOOP:
+                if memory[memory_pointer] == 0:
+                    pointer = jump_table[pointer]
+            elif token == Token.POOL:
+                if memory[memory_pointer] != 0:
+                    pointer = jump_table[pointer]
+            elif token == Token.INCVAL:
+                memory[memory_pointer] += 1
+            elif token == Token.DECVAL:
+                memory[memory_pointer] -= 1
+            elif token == Token.INCPTR:
+                memory_pointer = (memory_pointer + 1) % size
+            elif token == Token.DECPTR:
+                memory_pointer = (memory_pointer - 1) % size
+            elif token == Token.OUT:
+                if not 0 <= memory[memory_pointer] < 0x110000:
+                    # The interpreter raises the error when it executes the instruction.
+                    break
+                output.append(chr(memory[memory_pointer]))
+
+            pointer += 1
+            steps += 1
+
+        return Prefix(pointer, tuple(memory), memory_pointer, ''.join(output), steps)
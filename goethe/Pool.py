@@ -0,0 +1,324 @@
+import time
+import threading
+from collections import OrderedDict, deque
+
+from goethe.Cache import ResultCache, CachedResult
+from goethe.Metrics import Metrics
+from goethe.Program import Program
+from goethe.Interpreter import Interpreter
+
+
+class PoolMetrics:
+    """Collects reuse and latency statistics of an InterpreterPool.
+
+    Attributes:
+        runs (int): Number of executed requests, including failed ones.
+        failed_runs (int): Requests that raised an exception, e.g. because they exceeded a limit.
+        program_hits (int): Requests whose program was already tokenized.
+        program_misses (int): Requests whose program had to be tokenized.
+        interpreter_reuses (int): Requests that were executed by an idle interpreter.
+        interpreters_created (int): Number of interpreters created by the pool.
+        latencies (deque): Latencies of the most recent runs in seconds.
+    """
+
+    # Metrics that only increase. They are exported as counters, all others as gauges.
+    COUNTERS = {'runs', 'failed_runs', 'program_hits', 'program_misses', 'interpreter_reuses', 'interpreters_created'}
+
+    # Descriptions for the Prometheus HELP lines.
+    DESCRIPTIONS = {
+        'runs': 'Executed requests, including failed ones.',
+        'failed_runs': 'Requests that raised an exception.',
+        'program_hits': 'Requests whose program was already tokenized.',
+        'program_misses': 'Requests whose program had to be tokenized.',
+        'reuse_rate': 'Share of requests that did not have to tokenize their program.',
+        'interpreter_reuses': 'Requests that were executed by an idle interpreter.',
+        'interpreters_created': 'Interpreters created by the pool.',
+        'mean_latency': 'Mean latency of all runs in seconds.',
+        'p50_latency': 'Median latency of the recent runs in seconds.',
+        'p99_latency': '99th percentile latency of the recent runs in seconds.',
+    }
+
+    def __init__(self, window=1000):
+        """
+        Args:
+            window (int, optional): Number of recent latencies to keep. Defaults to 1000.
+        """
+
+        self.runs = 0
+        self.failed_runs = 0
+        self.program_hits = 0
+        self.program_misses = 0
+        self.interpreter_reuses = 0
+        self.interpreters_created = 0
+        self.total_latency = 0.0
+        self.latencies = deque(maxlen=window)
+
+    def record_run(self, latency: float, failed=False) -> None:
+        """Records the latency of a finished run.
+
+        Args:
+            latency (float): Run latency in seconds.
+            failed (bool, optional): True, if the run raised an exception. Defaults to False.
+        """
+
+        self.runs += 1
+        self.failed_runs += failed
+        self.total_latency += latency
+        self.latencies.append(latency)
+
+    @property
+    def reuse_rate(self) -> float:
+        """Share of requests that did not have to tokenize their program.
+        """
+
+        requests = self.program_hits + self.program_misses
+        return self.program_hits / requests if requests else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Returns the given percentile of the recent run latencies.
+
+        Args:
+            percentile (float): Percentile between 0 and 100.
+
+        Returns:
+            float: Latency in seconds. Zero, if nothing was recorded yet.
+        """
+
+        if not self.latencies:
+            return 0.0
+
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100))]
+
+    def as_dict(self) -> dict:
+        """Returns all metrics as dictionary.
+
+        Returns:
+            dict: Metric names and values.
+        """
+
+        return {
+            'runs': self.runs,
+            'failed_runs': self.failed_runs,
+            'program_hits': self.program_hits,
+            'program_misses': self.program_misses,
+            'reuse_rate': self.reuse_rate,
+            'interpreter_reuses': self.interpreter_reuses,
+            'interpreters_created': self.interpreters_created,
+            'mean_latency': self.total_latency / self.runs if self.runs else 0.0,
+            'p50_latency': self.latency_percentile(50),
+            'p99_latency': self.latency_percentile(99),
+        }
+
+
+class InterpreterPool:
+    """Keeps tokenized programs and idle interpreters, so that known programs can be
+    executed repeatedly without tokenizing them again.
+
+    The pool is safe to use from multiple threads.
+    """
+
+    def __init__(self, lang='de_DE', max_programs=128, max_steps=None, timeout=None, syllables='pyphen',
+                 detect_loops=False, cache=None):
+        """
+        Args:
+            lang (str, optional): Language code. Defaults to 'de_DE'.
+            max_programs (int, optional): Number of tokenized programs to keep. Defaults to 128.
+            max_steps (int, optional): Default step limit per request. Defaults to None.
+            timeout (float, optional): Default time limit per request in seconds. Defaults to None.
+            syllables (str, optional): Syllable counter backend. Defaults to 'pyphen'.
+            detect_loops (bool, optional): Aborts programs stuck in a loop, see LoopDetector. Defaults to False.
+            cache (ResultCache, optional): Stores the results of deterministic runs. Defaults to None.
+        """
+
+        self.lang = lang
+        self.detect_loops = detect_loops
+        self.syllables = syllables
+        self.max_programs = max_programs
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.cache = cache
+        self.metrics = PoolMetrics()
+        # Tokenization and execution metrics of all requests.
+        self.execution_metrics = Metrics()
+
+        self.__programs = OrderedDict()
+        self.__idle = dict()
+        self.__lock = threading.Lock()
+
+    def get_program(self, text: str) -> Program:
+        """Returns the tokenized program for the given text from the cache or tokenizes it.
+
+        Args:
+            text (str): Goethe code.
+
+        Returns:
+            Program: The tokenized program.
+        """
+
+        key = Program.source_hash(text, self.lang, self.syllables)
+
+        with self.__lock:
+            program = self.__programs.get(key)
+            if program is not None:
+                self.__programs.move_to_end(key)
+                self.metrics.program_hits += 1
+                return program
+
+        metrics = Metrics()
+        program = Program.from_text(text, self.lang, self.syllables, metrics)
+
+        with self.__lock:
+            self.execution_metrics.merge(metrics)
+            self.metrics.program_misses += 1
+            self.__programs[key] = program
+            while len(self.__programs) > self.max_programs:
+                evicted, _ = self.__programs.popitem(last=False)
+                self.__idle.pop(evicted, None)
+
+        return program
+
+    def run(self, text: str, user_input='', max_steps=None, timeout=None, seed=None, write=None) -> str:
+        """Executes the given program with a fresh execution context and returns its output.
+
+        If the pool has a result cache, deterministic runs are answered from the cache.
+
+        Args:
+            text (str): Goethe code.
+            user_input (str, optional): Input that is read by IN instructions. Defaults to ''.
+            max_steps (int, optional): Step limit for this request. Defaults to the pool limit.
+            timeout (float, optional): Time limit for this request in seconds. Defaults to the pool limit.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+            write (Callable[[str], None], optional): Receives every output character while the
+                program runs. The output is then not collected. Defaults to None.
+
+        Raises:
+            LimitExceededException: If the program exceeds one of the limits.
+            InfiniteLoopException: If loop detection is enabled and the program is stuck in a loop.
+
+        Returns:
+            str: Program output. Empty, if write is given.
+        """
+
+        start = time.perf_counter()
+        key = Program.source_hash(text, self.lang, self.syllables)
+        program = self.get_program(text)
+        max_steps = max_steps if max_steps is not None else self.max_steps
+
+        cache_key = None
+        if self.cache is not None and ResultCache.cacheable(program, seed):
+            cache_key = ResultCache.key(program, user_input, seed)
+            result = self.cache.get(cache_key)
+
+            # Results that took more steps than allowed are executed again to raise the error.
+            if result is not None and (max_steps is None or result.steps <= max_steps):
+                with self.__lock:
+                    self.execution_metrics.increment('cache_hits')
+                    self.metrics.record_run(time.perf_counter() - start)
+
+                if write is None:
+                    return result.output
+
+                for char in result.output:
+                    write(char)
+                return ''
+
+        interpreter = self.__acquire(key, program)
+
+        output = []
+        listener = output.append
+        if write is not None:
+            listener = write if cache_key is None else lambda char: (output.append(char), write(char))
+
+        interpreter.set_seed(seed)
+        interpreter.set_user_input(user_input)
+        interpreter.add_event_listener('<out>', listener)
+
+        failed = True
+        try:
+            interpreter.run(
+                max_steps=max_steps,
+                timeout=timeout if timeout is not None else self.timeout)
+
+            if cache_key is not None:
+                self.cache.put(cache_key, CachedResult(''.join(output), interpreter.metrics.counters.get('steps', 0)))
+                interpreter.metrics.increment('cache_misses')
+            failed = False
+        finally:
+            interpreter.remove_event_listener('<out>', listener)
+            self.__release(key, interpreter)
+
+            # Runs that exceed a limit or are aborted count as well, they often take the longest.
+            with self.__lock:
+                self.metrics.record_run(time.perf_counter() - start, failed)
+
+        return ''.join(output) if write is None else ''
+
+    def prometheus(self, prefix='goethe') -> str:
+        """Returns the pool, tokenization and execution metrics in the Prometheus text format.
+
+        Args:
+            prefix (str, optional): Prefix of all metric names. Defaults to 'goethe'.
+
+        Returns:
+            str: Metrics in the Prometheus text format.
+        """
+
+        with self.__lock:
+            lines = []
+            for name, value in self.metrics.as_dict().items():
+                if name in PoolMetrics.COUNTERS:
+                    metric, kind = f'{prefix}_pool_{name}_total', 'counter'
+                else:
+                    metric, kind = f'{prefix}_pool_{name}', 'gauge'
+
+                lines.append(f'# HELP {metric} {PoolMetrics.DESCRIPTIONS[name]}')
+                lines.append(f'# TYPE {metric} {kind}')
+                lines.append(f'{metric} {value}')
+
+            return '\n'.join(lines) + '\n' + self.execution_metrics.to_prometheus(prefix)
+
+    def __acquire(self, key: str, program: Program) -> Interpreter:
+        """Returns an idle interpreter for the program or creates a new one.
+
+        Args:
+            key (str): Source hash of the program.
+            program (Program): The program to execute.
+
+        Returns:
+            Interpreter: Interpreter with the program loaded.
+        """
+
+        with self.__lock:
+            idle = self.__idle.get(key)
+            if idle:
+                self.metrics.interpreter_reuses += 1
+                return idle.pop()
+
+            self.metrics.interpreters_created += 1
+
+        interpreter = Interpreter(lang=self.lang, console_mode=False, syllables=self.syllables, program=program)
+
+        if self.detect_loops:
+            interpreter.enable_loop_detection()
+
+        return interpreter
+
+    def __release(self, key: str, interpreter: Interpreter) -> None:
+        """Resets the interpreter and makes it available for further requests.
+
+        Args:
+            key (str): Source hash of the program loaded in the interpreter.
+            interpreter (Interpreter): The interpreter to release.
+        """
+
+        interpreter.reset()
+        interpreter.set_user_input('')
+
+        with self.__lock:
+            self.execution_metrics.merge(interpreter.metrics)
+            interpreter.metrics.clear()
+
+            if key in self.__programs:
+                # Interpreters of evicted programs are discarded.
+                self.__idle.setdefault(key, []).append(interpreter)
@@ -0,0 +1,181 @@
+import hashlib
+from array import array
+from typing import Iterable
+
+from goethe.Token import Token
+from goethe.Metrics import Metrics
+from goethe.Tokenizer import Tokenizer
+from goethe.Syllables import create_counter
+from goethe.LanguageTools import LanguageTools
+
+
+class Program:
+    """A tokenized Goethe program together with its precomputed jump table.
+
+    Programs cannot be modified after they have been created, so a single instance can be
+    shared by any number of interpreters and threads or sent to other processes.
+
+    Attributes:
+        tokens (bytes): The program bytecode, one token value per instruction.
+        jump_table (tuple): Index of the matching POOL for every LOOP and vice versa.
+        hash (str): SHA-256 hex digest of the program tokens.
+        verses (memoryview): Source line number at which the verse of every token starts.
+            Empty, if the program was not created from source text.
+        prefix (Prefix): Precomputed status after the input-independent start of the
+            program, see Optimizer. None, if the program was not optimized.
+    """
+
+    __slots__ = ('tokens', 'verses', 'prefix', 'jump_table', 'hash')
+
+    def __init__(self, tokens: Iterable[int], verses: Iterable[int] = (), prefix=None):
+        """
+        Args:
+            tokens (Iterable[int]): Program tokens or bytecode.
+            verses (Iterable[int], optional): Source line number of every token. Defaults to ().
+            prefix (Prefix, optional): Precomputed program start. Defaults to None.
+        """
+
+        tokens = bytes(tokens)
+
+        # Attributes can only be set here, see __setattr__().
+        object.__setattr__(self, 'tokens', tokens)
+        object.__setattr__(self, 'verses', memoryview(array('L', verses)).toreadonly())
+        object.__setattr__(self, 'prefix', prefix)
+        object.__setattr__(self, 'jump_table', self.__build_jump_table(tokens))
+        object.__setattr__(self, 'hash', hashlib.sha256(tokens).hexdigest())
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Programs cannot be modified, create a new Program instead.')
+
+    def __delattr__(self, name):
+        raise AttributeError('Programs cannot be modified, create a new Program instead.')
+
+    def __reduce__(self):
+        # Memory views cannot be pickled, the program is created again from its parts.
+        return Program, (self.tokens, self.verses.tolist(), self.prefix)
+
+    @classmethod
+    def from_text(cls, text: str, lang='de_DE', syllables='pyphen', metrics=None) -> 'Program':
+        """Runs the given text through the tokenizer and creates a program from the tokens.
+
+        Args:
+            text (str): Goethe code.
+            lang (str, optional): Language code. Defaults to 'de_DE'.
+            syllables (str, optional): Syllable counter backend. Defaults to 'pyphen'.
+            metrics (Metrics, optional): Receives the timings of the tokenization. Defaults to None.
+
+        Returns:
+            Program: The tokenized program.
+        """
+
+        metrics = metrics if metrics is not None else Metrics()
+
+        with metrics.measure('syllable_counter_load'):
+            counter = create_counter(syllables, lang)
+
+        with metrics.measure('tokenization'):
+            tokenizer = Tokenizer(LanguageTools(text, lang, counter, metrics))
+            return cls(tokenizer.tokenize(), tokenizer.verses)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], lang='de_DE', syllables='pyphen', metrics=None) -> 'Program':
+        """Tokenizes the given lines one at a time and creates a program from the tokens.
+
+        Only the tokens are kept in memory, so this is suited for very large source files.
+
+        Args:
+            lines (Iterable[str]): Text lines, e.g. an open file.
+            lang (str, optional): Language code. Defaults to 'de_DE'.
+            syllables (str, optional): Syllable counter backend. Defaults to 'pyphen'.
+            metrics (Metrics, optional): Receives the timings of the tokenization. Defaults to None.
+
+        Returns:
+            Program: The tokenized program.
+        """
+
+        metrics = metrics if metrics is not None else Metrics()
+        tokens = bytearray()
+        verses = array('L')
+
+        with metrics.measure('syllable_counter_load'):
+            counter = create_counter(syllables, lang)
+
+        with metrics.measure('tokenization'):
+            for token, line in Tokenizer.stream(lines, LanguageTools('', lang, counter, metrics)):
+                tokens.append(token)
+                verses.append(line)
+
+        metrics.increment('tokens', len(tokens))
+        return cls(tokens, verses)
+
+    @staticmethod
+    def source_hash(text: str, lang='de_DE', syllables='pyphen') -> str:
+        """Returns a key that identifies the given source text before it is tokenized.
+
+        Args:
+            text (str): Goethe code.
+            lang (str, optional): Language code. Defaults to 'de_DE'.
+            syllables (str, optional): Syllable counter backend. Defaults to 'pyphen'.
+
+        Returns:
+            str: SHA-256 hex digest of language code, syllable counter and text.
+        """
+
+        return hashlib.sha256(f'{lang}\0{syllables}\0{text}'.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def __build_jump_table(tokens: bytes) -> tuple:
+        """Finds the matching POOL for every LOOP and the matching LOOP for every POOL.
+
+        A LOOP without matching POOL jumps to the last instruction, so that the program ends.
+        A POOL without matching LOOP jumps in front of the first instruction.
+
+        Args:
+            tokens (bytes): Program bytecode.
+
+        Returns:
+            tuple: Jump target for every position in the program. Zero for all other tokens.
+        """
+
+        jump_table = [0] * len(tokens)
+        stack = []
+
+        for index, token in enumerate(tokens):
+            if token == Token.LOOP:
+                stack.append(index)
+            elif token == Token.POOL:
+                if stack:
+                    start = stack.pop()
+                    jump_table[start] = index
+                    jump_table[index] = start
+                else:
+                    jump_table[index] = -1
+
+        for index in stack:
+            jump_table[index] = len(tokens) - 1
+
+        return tuple(jump_table)
+
+    def verse(self, index: int) -> int:
+        """Returns the source line number at which the verse of the given token starts.
+
+        Args:
+            index (int): Token index.
+
+        Returns:
+            int: Line number. Zero, if it is not known.
+        """
+
+        return self.verses[index] if 0 <= index < len(self.verses) else 0
+
+    def view(self) -> list:
+        """Returns the program as list of tokens, e.g. to display it.
+
+        Returns:
+            list: List of tokens.
+        """
+
+        return [Token(value) for value in self.tokens]
+
+    def __len__(self) -> int:
+        return len(self.tokens)
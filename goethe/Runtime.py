@@ -0,0 +1,81 @@
+from typing import NamedTuple, Optional, Union
+
+from goethe.Program import Program
+from goethe.Interpreter import Interpreter, LimitExceededException
+
+
+class Limits(NamedTuple):
+    """Resource limits of a single run.
+
+    Attributes:
+        max_steps (int): Maximum number of instructions to execute. None for no limit.
+        timeout (float): Maximum execution time in seconds. None for no limit.
+    """
+
+    max_steps: Optional[int] = None
+    timeout: Optional[float] = None
+
+
+class Result(NamedTuple):
+    """Result of a run.
+
+    Attributes:
+        output (bytes): UTF-8 encoded program output.
+        steps (int): Number of executed instructions.
+        error (Exception): LimitExceededException if a limit was exceeded, ValueError if
+            the program wrote a value that is not a valid character. None, if the program finished.
+    """
+
+    output: bytes
+    steps: int
+    error: Optional[Exception] = None
+
+
+def run(source: Union[str, Program], input: Union[bytes, str] = b'', *, seed=None, limits=None, lang='de_DE',
+        syllables='pyphen', tiered=False) -> Result:
+    """Executes a program and returns its output.
+
+    Every call has its own interpreter with its own memory, input, output and random
+    number generator. Nothing is read from or written to the console, and no global
+    state is changed, so calls can run concurrently in any number of threads, e.g. with
+    a ThreadPoolExecutor. A Program can be shared by all of them.
+
+    Tokenizing source text takes much longer than most runs, so a program that is
+    executed repeatedly should be tokenized once with Program.from_text().
+
+    The input is decoded as UTF-8 and read by IN one character at a time. Bytes that
+    are not valid UTF-8 are read as U+FFFD.
+
+    Args:
+        source (Union[str, Program]): Goethe code or tokenized program.
+        input (Union[bytes, str], optional): Input that is read by IN instructions. Defaults to b''.
+        seed (int, optional): Seed of the random number generator. Defaults to None.
+        limits (Limits, optional): Step and time limit. Defaults to no limits.
+        lang (str, optional): Language code of the source text. Defaults to 'de_DE'.
+        syllables (str, optional): Syllable counter backend for the source text. Defaults to 'pyphen'.
+        tiered (bool, optional): Compiles frequently executed loops, see Interpreter.enable_tiering().
+            Defaults to False.
+
+    Returns:
+        Result: Output and executed steps. The output up to the error, if the run failed.
+    """
+
+    program = source if isinstance(source, Program) else Program.from_text(source, lang, syllables)
+    limits = limits if limits is not None else Limits()
+
+    interpreter = Interpreter(console_mode=False, seed=seed, syllables=syllables, program=program)
+    if tiered:
+        interpreter.enable_tiering()
+
+    output = []
+    interpreter.add_event_listener('<out>', output.append)
+    interpreter.set_user_input(input.decode('utf-8', 'replace') if isinstance(input, bytes) else input)
+
+    error = None
+    try:
+        interpreter.run(max_steps=limits.max_steps, timeout=limits.timeout)
+    except (LimitExceededException, ValueError) as exception:
+        error = exception
+
+    return Result(''.join(output).encode('utf-8'), interpreter.metrics.counters.get('steps', 0), error)
+
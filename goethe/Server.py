@@ -0,0 +1,311 @@
+import os
+import sys
+import json
+import stat
+import signal
+import socket
+import logging
+import argparse
+
+from goethe.Pool import InterpreterPool
+from goethe.Interpreter import AbortException
+from goethe.Cache import ResultCache, DEFAULT_CACHE_DIR
+from goethe.Syllables import BACKENDS
+from goethe.Client import Client, ClientException, DEFAULT_SOCKET
+
+
+class ServerException(Exception):
+    pass
+
+
+class OutputStream:
+    """Buffers program output and sends it to the client in output frames.
+    """
+
+    def __init__(self, connection: socket.socket, size=4096):
+        """
+        Args:
+            connection (socket.socket): Client connection.
+            size (int, optional): Number of buffered characters. Defaults to 4096.
+        """
+
+        self.connection = connection
+        self.size = size
+        self.__buffer = []
+
+    def write(self, char: str) -> None:
+        """Appends output. Complete lines are sent immediately.
+
+        Args:
+            char (str): Output character.
+
+        Raises:
+            AbortException: If the client has disconnected.
+        """
+
+        self.__buffer.append(char)
+        if char == '\n' or len(self.__buffer) >= self.size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Sends the buffered output.
+
+        Raises:
+            AbortException: If the client has disconnected.
+        """
+
+        if self.__buffer:
+            data = ''.join(self.__buffer).encode('utf-8')
+            self.__buffer.clear()
+
+            try:
+                Client.send_frame(self.connection, Client.OUTPUT, data)
+            except OSError as error:
+                raise AbortException(f'Output could not be sent: {error}') from error
+
+
+class Server:
+    """Daemon that executes Goethe programs for `goethe client` over a Unix domain socket.
+
+    The hyphenation dictionary is loaded once before the worker processes are forked,
+    so workers start warm. Every worker keeps an InterpreterPool with its own cache of
+    tokenized programs and accepts connections from the shared socket. Workers that
+    exit are replaced.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET, workers=None, lang='de_DE', syllables='pyphen',
+                 max_programs=128, max_steps=None, timeout=None, cache=None):
+        """
+        Args:
+            path (str, optional): Path of the socket. Defaults to DEFAULT_SOCKET.
+            workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            lang (str, optional): Language code. Defaults to 'de_DE'.
+            syllables (str, optional): Syllable counter backend. Defaults to 'pyphen'.
+            max_programs (int, optional): Number of tokenized programs per worker. Defaults to 128.
+            max_steps (int, optional): Default step limit per request. Defaults to None.
+            timeout (float, optional): Default time limit per request in seconds. Defaults to None.
+            cache (ResultCache, optional): Result cache shared by all workers. Defaults to None.
+        """
+
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = InterpreterPool(lang, max_programs, max_steps, timeout, syllables, cache=cache)
+
+        self.__socket = None
+        self.__socket_id = None
+        self.__children = set()
+        self.__stopping = False
+
+    def serve_forever(self) -> None:
+        """Starts the workers and replaces workers that exit until the daemon receives
+        SIGINT or SIGTERM. The socket is bound first, if bind() was not called.
+
+        Raises:
+            ServerException: If the path is not a socket or another daemon is listening on it.
+        """
+
+        if self.__socket is None:
+            self.bind()
+
+        # Loads the hyphenation dictionary before forking.
+        self.pool.run('')
+
+        signal.signal(signal.SIGTERM, self.__stop)
+        signal.signal(signal.SIGINT, self.__stop)
+
+        try:
+            for _ in range(self.workers):
+                self.__fork()
+
+            while not self.__stopping:
+                try:
+                    pid, _ = os.wait()
+                except ChildProcessError:
+                    break
+                except InterruptedError:
+                    continue
+
+                self.__children.discard(pid)
+                if not self.__stopping:
+                    self.__fork()
+        finally:
+            for pid in self.__children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+            self.__socket.close()
+            self.__remove_own_socket()
+
+    def bind(self) -> None:
+        """Binds the socket. The socket of a daemon that was not shut down cleanly is replaced.
+
+        Raises:
+            ServerException: If the path is not a socket or another daemon is listening on it.
+        """
+
+        self.__remove_stale_socket()
+
+        self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__socket.bind(self.path)
+        self.__socket.listen(128)
+
+        info = os.stat(self.path)
+        self.__socket_id = (info.st_dev, info.st_ino)
+
+    def handle(self, connection: socket.socket) -> None:
+        """Answers a single request.
+
+        Args:
+            connection (socket.socket): Client connection.
+        """
+
+        try:
+            kind, payload = Client.receive_frame(connection)
+        except ClientException:
+            # The connection was closed without a request, e.g. to check if a daemon is listening.
+            return
+
+        if kind == Client.METRICS:
+            Client.send_frame(connection, Client.DONE, self.pool.prometheus().encode('utf-8'))
+            return
+
+        if kind != Client.RUN:
+            Client.send_frame(connection, Client.ERROR, b'Unknown request.')
+            return
+
+        request = json.loads(payload)
+        stream = OutputStream(connection)
+
+        try:
+            self.pool.run(request['source'],
+                          request.get('input') or '',
+                          max_steps=request.get('max_steps'),
+                          timeout=request.get('timeout'),
+                          seed=request.get('seed'),
+                          write=stream.write)
+        except AbortException:
+            logging.warning('Client disconnected, the run was aborted.')
+            return
+        except Exception as exception:
+            stream.flush()
+            Client.send_frame(connection, Client.ERROR,
+                              f'{type(exception).__name__}: {exception}'.encode('utf-8'))
+            return
+
+        stream.flush()
+        Client.send_frame(connection, Client.DONE, b'')
+
+    def __remove_stale_socket(self) -> None:
+        """Removes the socket of a daemon that was not shut down cleanly.
+
+        Raises:
+            ServerException: If the path is not a socket or another daemon is listening on it.
+        """
+
+        try:
+            mode = os.lstat(self.path).st_mode
+        except FileNotFoundError:
+            return
+
+        if not stat.S_ISSOCK(mode):
+            raise ServerException(f'{self.path} exists and is not a socket.')
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.path)
+            except ConnectionRefusedError:
+                os.unlink(self.path)
+                return
+            except FileNotFoundError:
+                return
+
+        raise ServerException(f'Another daemon is listening on {self.path}.')
+
+    def __remove_own_socket(self) -> None:
+        """Removes the socket unless it was replaced by the socket of another daemon.
+        """
+
+        try:
+            info = os.lstat(self.path)
+        except FileNotFoundError:
+            return
+
+        if (info.st_dev, info.st_ino) == self.__socket_id:
+            os.unlink(self.path)
+
+    def __fork(self) -> None:
+        """Starts a worker process.
+        """
+
+        pid = os.fork()
+        if pid:
+            self.__children.add(pid)
+            return
+
+        # Worker process
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        try:
+            while True:
+                connection, _ = self.__socket.accept()
+                with connection:
+                    try:
+                        self.handle(connection)
+                    except Exception:
+                        logging.exception('Request could not be handled.')
+        finally:
+            os._exit(0)
+
+    def __stop(self, signum, frame) -> None:
+        """Signal handler that shuts the daemon down.
+        """
+
+        self.__stopping = True
+        for pid in self.__children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="goethe serve",
+                                     description="Keeps warm Goethe interpreters behind a Unix domain socket.")
+    parser.add_argument("--socket", action="store", default=DEFAULT_SOCKET,
+                        help=f"Path of the socket (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--workers", action="store", type=int, help="Number of worker processes (default: CPUs)")
+    parser.add_argument("--syllables", action="store", choices=sorted(BACKENDS), default="pyphen",
+                        help="Syllable counter (default: pyphen)")
+    parser.add_argument("--max-programs", action="store", type=int, default=128,
+                        help="Number of cached programs per worker (default: 128)")
+    parser.add_argument("--max-steps", action="store", type=int, help="Default step limit per request")
+    parser.add_argument("--timeout", action="store", type=float, help="Default time limit per request in seconds")
+    parser.add_argument("--cache", action="store", nargs="?", const=DEFAULT_CACHE_DIR, metavar="DIR",
+                        help="Reuse the output of earlier runs with the same program and input "
+                             "(default directory: ~/.cache/goethe/results)")
+    parser.add_argument("--cache-size", action="store", type=int, default=64, metavar="MB",
+                        help="Size limit of the result cache in megabytes (default: 64)")
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, 'fork') or not hasattr(socket, 'AF_UNIX'):
+        sys.stderr.write('error: goethe serve requires fork() and Unix domain sockets\n')
+        sys.exit(1)
+
+    server = Server(args.socket, args.workers, syllables=args.syllables, max_programs=args.max_programs,
+                    max_steps=args.max_steps, timeout=args.timeout,
+                    cache=ResultCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None)
+    try:
+        server.bind()
+    except ServerException as exception:
+        sys.stderr.write(f'error: {exception}\n')
+        sys.exit(1)
+
+    sys.stderr.write(f'goethe daemon listening on {args.socket} with {server.workers} workers\n')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
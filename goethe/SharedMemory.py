@@ -0,0 +1,209 @@
+import struct
+from multiprocessing import shared_memory
+
+from goethe.Memory import Memory
+
+
+class SharedMemoryException(Exception):
+    pass
+
+
+class SharedMemory(Memory):
+    """Memory whose tape lives in a shared memory block, so that other processes can
+    watch a running program.
+
+    The block starts with a small header that holds the program pointer, the memory
+    pointer and the number of executed steps, followed by the tape. Every cell is a
+    signed 64 bit integer in native byte order, so values outside of that range raise
+    a ValueError, while the cells of the private memory can grow without limit.
+
+    The interpreter writes the cells directly into the block, but only publishes the
+    header every few thousand steps, see Interpreter.run(). A monitor process only has
+    to read the block and does not slow down the execution.
+
+    Attributes:
+        name (str): Name of the shared memory block.
+    """
+
+    MAGIC = b'GSHM'
+    VERSION = 1
+
+    # Magic, version, tape length, program length, program pointer,
+    # memory pointer, executed steps, finished flag.
+    HEADER = struct.Struct('=4sB3xQQqqQQ')
+
+    # Indices of the header fields in the integer view of the header.
+    SIZE, PROGRAM_LENGTH, POINTER, MEMORY_POINTER, STEPS, FINISHED = range(6)
+
+    def __init__(self, size=1024, name=None, create=True):
+        """
+        Args:
+            size (int, optional): Size of the memory. Ignored when attaching. Defaults to 1024.
+            name (str, optional): Name of the shared memory block. Defaults to a random name.
+            create (bool, optional): Creates a new block if True, otherwise attaches to an
+                existing one. Defaults to True.
+
+        Raises:
+            SharedMemoryException: If a block with the name already exists when creating, or an
+                existing block is not a Goethe memory tape when attaching.
+        """
+
+        if create:
+            try:
+                self.__block = shared_memory.SharedMemory(name, create=True, size=self.HEADER.size + 8 * size)
+            except FileExistsError:
+                raise SharedMemoryException(f'A shared memory block named {name} already exists. Choose another '
+                                            f'name or remove the block of the program that created it.')
+            self.HEADER.pack_into(self.__block.buf, 0, self.MAGIC, self.VERSION, size, 0, 0, 0, 0, 0)
+        else:
+            self.__block = shared_memory.SharedMemory(name)
+            self.__untrack()
+
+            magic, version, size, *_ = self.HEADER.unpack_from(self.__block.buf)
+            if magic != self.MAGIC or version != self.VERSION:
+                self.__block.close()
+                raise SharedMemoryException(f'{name} is not a Goethe memory tape.')
+
+        self.name = self.__block.name
+        self.__owner = create
+        self.__header = self.__block.buf[8:self.HEADER.size].cast('q')
+
+        self._memory = self.__block.buf[self.HEADER.size:self.HEADER.size + 8 * size].cast('q')
+        self._size = size
+        self._pointer = self.__header[self.MEMORY_POINTER]
+        self.high_water_mark = self._pointer
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedMemory':
+        """Attaches to the memory tape of a running interpreter.
+
+        Args:
+            name (str): Name of the shared memory block.
+
+        Returns:
+            SharedMemory: The attached memory.
+        """
+
+        return cls(name=name, create=False)
+
+    def reset(self) -> None:
+        """Sets pointer to 0 and sets all memory cells to 0.
+        """
+
+        self.__block.buf[self.HEADER.size:self.HEADER.size + 8 * self._size] = bytes(8 * self._size)
+        self.set_pointer_value(0)
+
+    def load(self, values, pointer=0) -> None:
+        """Replaces the memory contents with the given values and sets the pointer.
+
+        Args:
+            values (Iterable[int]): New memory contents. Must have the size of the memory.
+            pointer (int, optional): New pointer value. Defaults to 0.
+        """
+
+        memory = list(values)
+        if len(memory) != self._size:
+            raise ValueError(f'Expected {self._size} memory cells, got {len(memory)}.')
+
+        for index, value in enumerate(memory):
+            self._memory[index] = value
+
+        self.set_pointer_value(pointer)
+
+    def set_pointer_value(self, value: int) -> None:
+        super().set_pointer_value(value)
+        self.__header[self.MEMORY_POINTER] = self._pointer
+
+    def get_pointer_value(self) -> int:
+        """Returns the current memory pointer value. Reads the header when attached to
+        the memory of another process.
+
+        Returns:
+            int: Current pointer value.
+        """
+
+        if not self.__owner:
+            return self.__header[self.MEMORY_POINTER]
+
+        return self._pointer
+
+    def publish(self, pointer: int, steps: int) -> None:
+        """Publishes the program pointer, the memory pointer and the steps executed since
+        the last call.
+
+        Args:
+            pointer (int): Program pointer.
+            steps (int): Number of steps executed since the last call.
+        """
+
+        header = self.__header
+        header[self.POINTER] = pointer
+        header[self.MEMORY_POINTER] = self._pointer
+        header[self.STEPS] += steps
+
+    def set_program_length(self, length: int) -> None:
+        """Publishes the length of the executed program.
+
+        Args:
+            length (int): Number of tokens.
+        """
+
+        self.__header[self.PROGRAM_LENGTH] = length
+
+    def status(self) -> dict:
+        """Returns the published execution status.
+
+        Returns:
+            dict: Program pointer, program length, memory pointer, executed steps and
+                whether the program has finished.
+        """
+
+        header = self.__header
+        return {
+            'pointer': header[self.POINTER],
+            'program_length': header[self.PROGRAM_LENGTH],
+            'memory_pointer': header[self.MEMORY_POINTER],
+            'steps': header[self.STEPS],
+            'finished': bool(header[self.FINISHED]),
+        }
+
+    def finish(self) -> None:
+        """Marks the program as finished. The memory contents are kept for monitors.
+        """
+
+        self.__header[self.FINISHED] = 1
+
+    def to_list(self) -> list:
+        """Returns a copy of the memory contents as integer list.
+
+        Returns:
+            list: The memory list.
+        """
+
+        return self._memory.tolist()
+
+    def close(self) -> None:
+        """Detaches from the shared memory block. The process that created the block marks
+        the program as finished and removes the block.
+        """
+
+        if self.__owner:
+            self.finish()
+
+        self.__header.release()
+        self._memory.release()
+        self.__block.close()
+
+        if self.__owner:
+            self.__block.unlink()
+
+    def __untrack(self) -> None:
+        """Prevents the resource tracker from removing a block that was created by
+        another process when this process exits.
+        """
+
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self.__block._name, 'shared_memory')
+        except (ImportError, AttributeError, KeyError):
+            pass
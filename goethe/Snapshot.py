@@ -0,0 +1,159 @@
+import struct
+from array import array
+
+
+class SnapshotException(Exception):
+    pass
+
+
+class Snapshot:
+    """Serializable execution state of an interpreter.
+
+    The binary format consists of a fixed size header followed by the memory tape as
+    little-endian 64 bit integers, the pending user input as UTF-8, the state of the
+    random number generator, its unused buffered random bytes and the output of an
+    optimized program prefix that has not been written yet as UTF-8.
+
+    Attributes:
+        program_hash (str): Hash of the program the state belongs to.
+        pointer (int): Program pointer.
+        memory (Sequence[int]): Memory tape.
+        memory_pointer (int): Memory pointer.
+        user_input (str): User input that has not been read yet.
+        random_state (bytes): Encoded state of the random number generator.
+        random_buffer (bytes): Random bytes that were generated but not used yet.
+        pending_output (str): Output of the precomputed program prefix that has not been written yet.
+    """
+
+    MAGIC = b'GSNP'
+    VERSION = 3
+
+    # Magic, version, program hash, program pointer, memory pointer, tape length,
+    # input length, random state length, random buffer length, pending output length.
+    HEADER = struct.Struct('<4sB32sqqQQQQQ')
+
+    def __init__(self, program_hash: str, pointer: int, memory, memory_pointer: int,
+                 user_input='', random_state=b'', random_buffer=b'', pending_output=''):
+        self.program_hash = program_hash
+        self.pointer = pointer
+        self.memory = memory
+        self.memory_pointer = memory_pointer
+        self.user_input = user_input
+        self.random_state = random_state
+        self.random_buffer = random_buffer
+        self.pending_output = pending_output
+
+    def to_bytes(self) -> bytes:
+        """Encodes the snapshot in the binary snapshot format.
+
+        Returns:
+            bytes: Encoded snapshot.
+        """
+
+        tape = array('q', self.memory)
+        if tape.itemsize != 8:
+            raise SnapshotException('Platform does not support 64 bit memory cells.')
+
+        if struct.pack('=H', 1) != struct.pack('<H', 1):
+            tape.byteswap()
+
+        user_input = self.user_input.encode('utf-8')
+        pending_output = self.pending_output.encode('utf-8')
+        header = self.HEADER.pack(
+            self.MAGIC,
+            self.VERSION,
+            bytes.fromhex(self.program_hash),
+            self.pointer,
+            self.memory_pointer,
+            len(tape),
+            len(user_input),
+            len(self.random_state),
+            len(self.random_buffer),
+            len(pending_output))
+
+        return b''.join((header, tape.tobytes(), user_input, self.random_state, self.random_buffer, pending_output))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Snapshot':
+        """Decodes a snapshot from the binary snapshot format.
+
+        The memory tape is not copied, but returned as view on the given data.
+
+        Args:
+            data (bytes): Encoded snapshot.
+
+        Raises:
+            SnapshotException: If the data is not a valid snapshot.
+
+        Returns:
+            Snapshot: The decoded snapshot.
+        """
+
+        view = memoryview(data)
+        if len(view) < cls.HEADER.size:
+            raise SnapshotException('Snapshot is truncated.')
+
+        magic, version, program_hash, pointer, memory_pointer, tape_length, input_length, \
+            random_length, buffer_length, output_length = cls.HEADER.unpack_from(view)
+
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise SnapshotException('Data is not a supported snapshot.')
+
+        offset = cls.HEADER.size
+        end = offset + tape_length * 8 + input_length + random_length + buffer_length + output_length
+        if len(view) < end:
+            raise SnapshotException('Snapshot is truncated.')
+
+        tape = view[offset:offset + tape_length * 8]
+        if struct.pack('=H', 1) == struct.pack('<H', 1):
+            memory = tape.cast('q')
+        else:
+            memory = array('q', tape)
+            memory.byteswap()
+
+        offset += tape_length * 8
+        user_input = str(view[offset:offset + input_length], 'utf-8')
+        offset += input_length
+        random_state = bytes(view[offset:offset + random_length])
+        offset += random_length
+        random_buffer = bytes(view[offset:offset + buffer_length])
+        offset += buffer_length
+        pending_output = str(view[offset:offset + output_length], 'utf-8')
+
+        return cls(program_hash.hex(), pointer, memory, memory_pointer, user_input,
+                   random_state, random_buffer, pending_output)
+
+
+def encode_random_state(state: tuple) -> bytes:
+    """Encodes a state returned by random.getstate().
+
+    Args:
+        state (tuple): Mersenne Twister state.
+
+    Returns:
+        bytes: Encoded state.
+    """
+
+    version, internal_state, gauss_next = state
+    return struct.pack(f'<BB{len(internal_state)}Id',
+                       version,
+                       gauss_next is not None,
+                       *internal_state,
+                       gauss_next or 0.0)
+
+
+def decode_random_state(data: bytes) -> tuple:
+    """Decodes a state that was encoded with encode_random_state().
+
+    Args:
+        data (bytes): Encoded state.
+
+    Returns:
+        tuple: Mersenne Twister state for random.setstate().
+    """
+
+    count = (len(data) - 10) // 4
+    version, has_gauss, *values = struct.unpack(f'<BB{count}Id', data)
+    gauss_next = values.pop()
+
+    return version, tuple(values), gauss_next if has_gauss else None
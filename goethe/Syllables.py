@@ -0,0 +1,335 @@
+import os
+import re
+import marshal
+import hashlib
+from collections import deque
+from typing import Iterable
+
+import pyphen
+
+
+class PyphenCounter:
+    """Counts syllables by hyphenating every word with pyphen.
+    """
+
+    def __init__(self, lang='de_DE'):
+        """
+        Args:
+            lang (str, optional): Language code. Defaults to 'de_DE'.
+        """
+
+        self.hyphen = pyphen.Pyphen(lang=lang)
+
+    def count_syllables(self, words: Iterable[str]) -> list:
+        """Counts the syllables of every given word.
+
+        Args:
+            words (Iterable[str]): Words of which the syllables are to be counted.
+
+        Returns:
+            list: Number of syllables per word. Zero, if a word is not valid.
+        """
+
+        return [len(self.hyphen.positions(word.strip())) + 1 if word.strip().isalnum() else 0
+                for word in words]
+
+
+class HeuristicCounter:
+    """Estimates syllables of German words by counting vowel groups.
+
+    Much faster than hyphenation, but not exact. Like pyphen, syllable boundaries that
+    would leave fewer than two characters at the start or end of a word are ignored.
+    Use measure_accuracy() to compare it with the pyphen counter on a word list.
+    """
+
+    # Vowels and diphthongs that form the nucleus of a syllable.
+    VOWEL_GROUPS = re.compile(r'(?:ei|ai|au|äu|eu|ie|aa|ee|oo|[aeiouyäöü])')
+
+    def __init__(self, lang='de_DE', left=2, right=2):
+        """
+        Args:
+            lang (str, optional): Language code. Only German is supported. Defaults to 'de_DE'.
+            left (int, optional): Minimum number of characters of the first syllable. Defaults to 2.
+            right (int, optional): Minimum number of characters of the last syllable. Defaults to 2.
+        """
+
+        self.left = left
+        self.right = right
+
+    def count_syllables(self, words: Iterable[str]) -> list:
+        """Estimates the syllables of every given word.
+
+        Args:
+            words (Iterable[str]): Words of which the syllables are to be counted.
+
+        Returns:
+            list: Number of syllables per word. Zero, if a word is not valid.
+        """
+
+        counts = []
+
+        for word in words:
+            word = word.strip()
+            if not word.isalnum():
+                counts.append(0)
+                continue
+
+            word = word.lower()
+            right = len(word) - self.right
+            syllables = 1
+            last_end = None
+
+            for vowels in self.VOWEL_GROUPS.finditer(word):
+                if last_end is not None:
+                    # The boundary lies before the last consonant between two vowel groups.
+                    boundary = max(last_end, vowels.start() - 1)
+                    if self.left <= boundary <= right:
+                        syllables += 1
+
+                last_end = vowels.end()
+
+            counts.append(syllables)
+
+        return counts
+
+
+class HyphenationAutomaton:
+    """Counts syllables with an Aho-Corasick automaton compiled from the hyphenation patterns
+    that pyphen uses.
+
+    Pyphen looks up every substring of a word in its pattern dictionary. The automaton
+    instead finds all matching patterns in a single pass over the word. The values of all
+    patterns that end in the same state are merged when the automaton is compiled, so only
+    one merge per character is needed. The results are identical to pyphen.
+
+    Compiling the automaton takes a few seconds, so it is done once per dictionary and
+    process. If a cache directory is given, the compiled automaton is also stored on disk.
+    """
+
+    # Compiled automata per dictionary file
+    _automata = {}
+
+    def __init__(self, lang='de_DE', left=2, right=2, cache_dir=None):
+        """
+        Args:
+            lang (str, optional): Language code. Defaults to 'de_DE'.
+            left (int, optional): Minimum number of characters of the first syllable. Defaults to 2.
+            right (int, optional): Minimum number of characters of the last syllable. Defaults to 2.
+            cache_dir (str, optional): Directory to store compiled automata in. Defaults to None.
+        """
+
+        self.left = left
+        self.right = right
+
+        filename = pyphen.LANGUAGES[pyphen.language_fallback(lang)]
+        if filename not in self._automata:
+            self._automata[filename] = self.__load(filename, cache_dir)
+
+        self.__states, self.__fail, self.__output = self._automata[filename]
+
+    def positions(self, word: str) -> list:
+        """Returns the positions where the word can be hyphenated, like pyphen.Pyphen.positions().
+
+        Args:
+            word (str): Word to hyphenate.
+
+        Returns:
+            list: Hyphenation positions.
+        """
+
+        states = self.__states
+        fail = self.__fail
+        output = self.__output
+
+        pointed_word = '.%s.' % word.lower()
+        references = [0] * (len(pointed_word) + 1)
+        state = ''
+
+        for end, char in enumerate(pointed_word):
+            # Follows the failure links until the character can be appended.
+            following = state + char
+            while following not in states:
+                if not state:
+                    following = ''
+                    break
+                state = fail[state]
+                following = state + char
+            state = following
+
+            match = output.get(state)
+            if match:
+                shift, values = match
+                start = end - len(state) + 1 + shift
+                for index, value in enumerate(values, start):
+                    if value > references[index]:
+                        references[index] = value
+
+        right = len(word) - self.right
+        return [i - 1 for i, reference in enumerate(references)
+                if reference % 2 and self.left <= i - 1 <= right]
+
+    def count_syllables(self, words: Iterable[str]) -> list:
+        """Counts the syllables of every given word.
+
+        Args:
+            words (Iterable[str]): Words of which the syllables are to be counted.
+
+        Returns:
+            list: Number of syllables per word. Zero, if a word is not valid.
+        """
+
+        return [len(self.positions(word.strip())) + 1 if word.strip().isalnum() else 0
+                for word in words]
+
+    @classmethod
+    def __load(cls, filename: str, cache_dir=None) -> tuple:
+        """Loads the compiled automaton for the dictionary from the cache or compiles it.
+
+        Args:
+            filename (str): Path of the hyphenation dictionary.
+            cache_dir (str, optional): Directory with compiled automata. Defaults to None.
+
+        Returns:
+            tuple: States, failure links and outputs of the automaton.
+        """
+
+        if cache_dir is None:
+            return cls.__compile(pyphen.HyphDict(filename).patterns)
+
+        with open(filename, 'rb') as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+
+        path = os.path.join(cache_dir, f'hyph-{digest[:16]}.automaton')
+
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                states, fail, output = marshal.load(file)
+                return set(states), fail, output
+
+        states, fail, output = cls.__compile(pyphen.HyphDict(filename).patterns)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path + '.tmp', 'wb') as file:
+            marshal.dump((list(states), fail, output), file)
+        os.replace(path + '.tmp', path)
+
+        return states, fail, output
+
+    @staticmethod
+    def __compile(patterns: dict) -> tuple:
+        """Compiles hyphenation patterns into an Aho-Corasick automaton.
+
+        Every state is identified by the pattern prefix that leads to it.
+
+        Args:
+            patterns (dict): Patterns of a pyphen.HyphDict.
+
+        Returns:
+            tuple: States, failure links and outputs of the automaton.
+        """
+
+        children = {'': []}
+        for key in patterns:
+            for length in range(1, len(key) + 1):
+                prefix = key[:length]
+                if prefix not in children:
+                    children[prefix] = []
+                    children[key[:length - 1]].append(prefix)
+
+        fail = {'': ''}
+        output = {}
+        queue = deque([''])
+
+        # States are visited in order of their length, so the failure
+        # link of a state is always processed before the state itself.
+        while queue:
+            state = queue.popleft()
+
+            values = {}
+            if state in patterns:
+                offset, pattern_values = patterns[state]
+                for index, value in enumerate(pattern_values, offset):
+                    if value:
+                        values[index] = int(value)
+
+            if state:
+                # Adds the output of the failure link, which is a suffix of the state.
+                suffix = fail[state]
+                if suffix in output:
+                    shift, suffix_values = output[suffix]
+                    for index, value in enumerate(suffix_values, shift + len(state) - len(suffix)):
+                        if value > values.get(index, 0):
+                            values[index] = value
+
+            if values:
+                low, high = min(values), max(values)
+                output[state] = (low, tuple(values.get(i, 0) for i in range(low, high + 1)))
+
+            for child in children[state]:
+                suffix = fail[state]
+                while state and suffix and suffix + child[-1] not in children:
+                    suffix = fail[suffix]
+
+                following = suffix + child[-1]
+                fail[child] = following if state and following in children else ''
+                queue.append(child)
+
+        return set(children), fail, output
+
+
+# Available syllable counters by name
+BACKENDS = {
+    'pyphen': PyphenCounter,
+    'automaton': HyphenationAutomaton,
+    'heuristic': HeuristicCounter,
+}
+
+
+def create_counter(backend='pyphen', lang='de_DE'):
+    """Creates the syllable counter with the given name.
+
+    Args:
+        backend (str, optional): One of the names in BACKENDS. Defaults to 'pyphen'.
+        lang (str, optional): Language code. Defaults to 'de_DE'.
+
+    Raises:
+        ValueError: If the backend does not exist.
+
+    Returns:
+        Syllable counter with a count_syllables(words) method.
+    """
+
+    if backend not in BACKENDS:
+        raise ValueError(f'Unknown syllable counter: {backend}')
+
+    return BACKENDS[backend](lang=lang)
+
+
+def measure_accuracy(words: Iterable[str], counter, reference=None) -> dict:
+    """Compares the syllable counts of a counter with a reference counter.
+
+    Args:
+        words (Iterable[str]): Word list to compare the counters on.
+        counter: Syllable counter to measure.
+        reference (optional): Reference counter. Defaults to a PyphenCounter.
+
+    Returns:
+        dict: Number of words, share of identical counts, share of identical
+            counts modulo 10 and the mean absolute error.
+    """
+
+    words = list(words)
+    if reference is None:
+        reference = PyphenCounter()
+
+    expected = reference.count_syllables(words)
+    actual = counter.count_syllables(words)
+    pairs = list(zip(expected, actual))
+    total = len(pairs) or 1
+
+    return {
+        'words': len(pairs),
+        'accuracy': sum(e == a for e, a in pairs) / total,
+        'token_accuracy': sum(e % 10 == a % 10 for e, a in pairs) / total,
+        'mean_absolute_error': sum(abs(e - a) for e, a in pairs) / total,
+    }
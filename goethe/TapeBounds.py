@@ -0,0 +1,253 @@
+from typing import NamedTuple, Optional
+
+from goethe.Token import Token
+from goethe.Program import Program
+
+
+class Region(NamedTuple):
+    """Memory pointer range of a loop or of a sequence of tokens without loop brackets.
+
+    Attributes:
+        start (int): Index of the first token. The LOOP token for loops.
+        end (int): Index of the last token. The POOL token for loops.
+        loop (bool): Whether the region is a loop.
+        offsets (tuple): Lowest and highest pointer offset from the pointer at the start of
+            the region. For loops, per iteration. None, if it depends on inner loops.
+        net (int): Pointer movement of the region. For loops, per iteration. None, if it
+            depends on inner loops.
+        cells (tuple): Lowest and highest memory cell the pointer can reach in the region.
+            None, if the pointer can wrap around the memory.
+    """
+
+    start: int
+    end: int
+    loop: bool
+    offsets: Optional[tuple]
+    net: Optional[int]
+    cells: Optional[tuple]
+
+
+class TapeBounds:
+    """Static analysis of the memory cells a program can reach.
+
+    Starting with the pointer at cell 0, the range of possible pointer values is
+    tracked through the program. A loop whose body always leaves the pointer where it
+    was keeps the range. After any other loop, the range is unbounded in the direction
+    the loop moves. A token is proven in bounds if the pointer cannot wrap around the
+    memory before or after it is executed. If every token is proven, the program never
+    uses more than `cells` memory cells.
+
+    Unmatched loop brackets restart the program with an unknown pointer, so nothing is
+    proven for such programs.
+
+    Attributes:
+        regions (list): Loops and token sequences without loop brackets, see Region.
+        proven (bytearray): 1 for every token that is proven in bounds.
+        cells (int): Number of memory cells the program needs. None, if the pointer can wrap.
+        matched (bool): Whether all loop brackets are matched.
+    """
+
+    def __init__(self, program: Program, memory_size=256):
+        """
+        Args:
+            program (Program): Tokenized program.
+            memory_size (int, optional): Number of memory cells. Defaults to 256.
+        """
+
+        self.program = program
+        self.memory_size = memory_size
+        self.regions = []
+        self.proven = bytearray(len(program))
+        self.cells = None
+
+        tokens, jump_table = program.tokens, program.jump_table
+        # Unmatched LOOPs jump to the last token, which need not be a POOL.
+        brackets = {Token.LOOP: Token.POOL, Token.POOL: Token.LOOP}
+        self.matched = all(0 <= jump_table[index] < len(tokens) and tokens[jump_table[index]] == brackets[token]
+                           and jump_table[jump_table[index]] == index
+                           for index, token in enumerate(tokens) if token in brackets)
+
+        if not self.matched:
+            return
+
+        self.__loops = dict()
+        ranges = self.__analyze()
+
+        for index in range(len(tokens)):
+            self.proven[index] = all(low is not None and high is not None and low >= 0 and high < memory_size
+                                     for low, high in ranges[index:index + 2])
+
+        if all(self.proven):
+            self.cells = max(high for _, high in ranges) + 1
+
+        self.__find_regions(ranges)
+
+    def loop_in_bounds(self, start: int) -> bool:
+        """Checks whether the pointer stays within the memory in a loop.
+
+        Args:
+            start (int): Index of the LOOP token.
+
+        Returns:
+            bool: True, if all tokens of the loop are proven in bounds.
+        """
+
+        end = self.program.jump_table[start]
+        return self.matched and all(self.proven[start:end + 1])
+
+    def report(self) -> str:
+        """Describes the analysis results.
+
+        Returns:
+            str: One line per region and a summary.
+        """
+
+        verses = self.program.verses
+        lines = []
+
+        if not self.matched:
+            lines.append('the program has unmatched loop brackets')
+
+        for region in self.regions:
+            location = f'tokens {region.start}-{region.end}'
+            if len(verses) > region.end:
+                location += f', lines {verses[region.start]}-{verses[region.end]}'
+
+            offsets = f'{region.offsets[0]:+d}..{region.offsets[1]:+d}' if region.offsets else 'unknown'
+            net = f'{region.net:+d}' if region.net is not None else 'unknown'
+            cells = f'cells {region.cells[0]}-{region.cells[1]}' if region.cells else 'may wrap'
+
+            lines.append(f'{"loop" if region.loop else "block":<5}  {location:<28} '
+                         f'offsets {offsets:<10} net {net:<8} {cells}')
+
+        lines.append(f'{sum(self.proven)} of {len(self.proven)} tokens proven in bounds')
+        if self.cells is not None:
+            lines.append(f'the program uses at most {self.cells} of {self.memory_size} memory cells')
+        else:
+            lines.append(f'the memory pointer may wrap around the {self.memory_size} memory cells')
+
+        return '\n'.join(lines)
+
+    def __loop_offsets(self, start: int) -> Optional[tuple]:
+        """Computes the pointer movement of one iteration of a loop.
+
+        Args:
+            start (int): Index of the LOOP token.
+
+        Returns:
+            tuple: Lowest offset, highest offset and net movement. None, if an inner loop
+                moves the pointer.
+        """
+
+        if start not in self.__loops:
+            self.__loops[start] = self.__offsets(start + 1, self.program.jump_table[start])
+
+        return self.__loops[start]
+
+    def __offsets(self, start: int, end: int) -> Optional[tuple]:
+        """Computes the pointer movement of a token sequence.
+
+        Args:
+            start (int): Index of the first token.
+            end (int): Index behind the last token.
+
+        Returns:
+            tuple: Lowest offset, highest offset and net movement. None, if an inner loop
+                moves the pointer.
+        """
+
+        tokens, jump_table = self.program.tokens, self.program.jump_table
+        offset = low = high = 0
+        index = start
+
+        while index < end:
+            token = tokens[index]
+            if token == Token.INCPTR:
+                offset += 1
+            elif token == Token.DECPTR:
+                offset -= 1
+            elif token == Token.LOOP:
+                inner = self.__loop_offsets(index)
+                if inner is None or inner[2]:
+                    return None
+
+                low = min(low, offset + inner[0])
+                high = max(high, offset + inner[1])
+                index = jump_table[index]
+
+            low = min(low, offset)
+            high = max(high, offset)
+            index += 1
+
+        return low, high, offset
+
+    def __analyze(self) -> list:
+        """Tracks the range of possible pointer values through the program.
+
+        Returns:
+            list: Lowest and highest pointer value before every token and at the end of the
+                program. None stands for an unbounded side.
+        """
+
+        ranges = []
+        stack = []
+        low = high = 0
+
+        for index, token in enumerate(self.program.tokens):
+            ranges.append((low, high))
+
+            if token == Token.LOOP:
+                # The LOOP token is only executed once per loop, before the first iteration.
+                offsets = self.__loop_offsets(index)
+                if offsets is None or offsets[2] < 0:
+                    low = None
+                if offsets is None or offsets[2] > 0:
+                    high = None
+                stack.append((low, high))
+            elif token == Token.INCPTR or token == Token.DECPTR:
+                step = 1 if token == Token.INCPTR else -1
+                low = low + step if low is not None else None
+                high = high + step if high is not None else None
+            elif token == Token.POOL:
+                # Loops end with the range they were entered with, widened if they move.
+                low, high = stack.pop()
+
+        ranges.append((low, high))
+        return ranges
+
+    def __find_regions(self, ranges: list) -> None:
+        """Splits the program into loops and token sequences without loop brackets.
+
+        Args:
+            ranges (list): Pointer range before every token and at the end of the program.
+        """
+
+        tokens, jump_table = self.program.tokens, self.program.jump_table
+
+        def cells(start: int, end: int) -> Optional[tuple]:
+            if not all(self.proven[start:end + 1]):
+                return None
+            return (min(low for low, _ in ranges[start:end + 2]),
+                    max(high for _, high in ranges[start:end + 2]))
+
+        start = None
+        for index, token in enumerate(tokens):
+            if token not in (Token.LOOP, Token.POOL):
+                if start is None:
+                    start = index
+                continue
+
+            if start is not None:
+                low, high, net = self.__offsets(start, index)
+                self.regions.append(Region(start, index - 1, False, (low, high), net, cells(start, index - 1)))
+                start = None
+
+            if token == Token.LOOP:
+                end = jump_table[index]
+                offsets = self.__loop_offsets(index)
+                self.regions.append(Region(index, end, True, offsets and offsets[:2], offsets and offsets[2],
+                                           cells(index, end)))
+
+        if start is not None:
+            low, high, net = self.__offsets(start, len(tokens))
+            self.regions.append(Region(start, len(tokens) - 1, False, (low, high), net, cells(start, len(tokens) - 1)))
@@ -1,8 +1,11 @@
-from enum import Enum
+from enum import IntEnum
 
 
-class Token(Enum):
+class Token(IntEnum):
     """A token represents a command that the interpreter can execute.
+
+    Programs are stored as bytes of token values. Token members compare equal to
+    these values and can be created from them to display an instruction.
     """
 
     PASS = 0
@@ -1,3 +1,5 @@
+from typing import Iterable, Iterator
+
 from goethe.Token import Token
 from goethe.LanguageTools import LanguageTools
 
@@ -12,36 +14,21 @@ class Tokenizer:
             language_tools (LanguageTools): A LanguageTools instance.
         """
 
-        self.__program = []
+        self.__program = bytearray()
         self.__lt = language_tools
+        self.metrics = language_tools.metrics
 
-        self.syllables = self.__lt.count_syllables_in_lines()
-        alliterations = self.__lt.find_alliteration()
-        epistrophe = self.__lt.find_epistrophe()
-        assonance = self.__lt.find_assonance()
-        anaphora = self.__lt.find_anaphora()
-
-        # Removes epistrophe that overlap with anaphora.
-        epistrophe = [e for e in epistrophe if e not in
-                      list(set(anaphora).intersection(epistrophe))]
-
-        for verse in alliterations:
-            self.syllables[verse] = 7
+        lt = self.__lt
+        verses = [(lt.verse_syllables(record), record.first_word, record.last_word, record.line)
+                  for record in lt.analyze()]
 
-        for verse in assonance:
-            self.syllables[verse] = 9
+        # Anaphora and epistrophe are detected while the verses are merged.
+        with self.metrics.measure('anaphora_epistrophe'):
+            merged = list(self.merge_verses(verses))
 
-        # Adds the syllable numbers of consecutive verses with anaphors.
-        for verse in anaphora[::-1]:
-            self.syllables[verse[0]] += self.syllables[verse[1]]
-            del self.syllables[verse[1]]
-
-        # Subtracts the syllable numbers of consecutive verses with anaphors.
-        for verse in epistrophe[::-1]:
-            self.syllables[verse[0] - len(anaphora)] -= self.syllables[verse[1] - len(anaphora)]
-            del self.syllables[verse[1] - len(anaphora)]
-
-        self.syllables = map(abs, self.syllables)
+        self.syllables = [syllables for syllables, _ in merged]
+        # Source line number at which every verse starts
+        self.verses = [line for _, line in merged]
 
     def __append_token(self, token: Token) -> None:
         """Appends the given token to the program.
@@ -52,15 +39,94 @@ class Tokenizer:
 
         self.__program.append(token)
 
-    def tokenize(self) -> list:
-        """Converts syllables into a list of program tokens.
+    def tokenize(self) -> bytes:
+        """Converts syllables into program bytecode.
 
         Returns:
-            list: List of tokens.
+            bytes: One token value per instruction, see Token.
         """
 
         if not self.__program:
             for i, element in enumerate(self.syllables):
                 self.__append_token(Token(element % 10))
 
-        return self.__program
+            self.metrics.increment('tokens', len(self.__program))
+
+        return bytes(self.__program)
+
+    @staticmethod
+    def stream(lines: Iterable[str], language_tools: LanguageTools) -> Iterator[tuple]:
+        """Lazily converts text lines into program tokens.
+
+        The lines are read one at a time. A token is emitted as soon as the next line shows
+        that it does not continue an anaphora or epistrophe of the current verse, so the
+        source text never has to be held in memory as a whole.
+
+        Args:
+            lines (Iterable[str]): Text lines, e.g. an open file.
+            language_tools (LanguageTools): A LanguageTools instance used for the analysis.
+
+        Yields:
+            tuple: The next program token and the source line number at which its verse starts.
+        """
+
+        lt = language_tools
+
+        def verses():
+            for record in lt.iter_records(lines):
+                yield lt.verse_syllables(record), record.first_word, record.last_word, record.line
+
+        for syllables, line in Tokenizer.merge_verses(verses()):
+            yield Token(syllables % 10), line
+
+    @staticmethod
+    def merge_verses(verses: Iterable[tuple]) -> Iterator[tuple]:
+        """Combines the syllables of consecutive verses that are linked by anaphora or epistrophe.
+
+        The verses are processed in a single pass with the following precedence:
+
+        1. Verses starting with the same word as the previous verse (anaphora) are added
+           up. A pair of verses that shares both first and last word counts as anaphora.
+        2. Verses ending with the same word as the previous verse (epistrophe) link these
+           sums, which are then subtracted from each other: a chain a, b, c results in
+           a - (b - c), so the sums alternate in sign.
+        3. The absolute value of every resulting verse is taken.
+
+        Args:
+            verses (Iterable[tuple]): Tuples of syllables, first word, last word and line
+                number of every verse.
+
+        Yields:
+            tuple: Absolute syllable count and first line number of every merged verse.
+        """
+
+        chain = 0
+        sign = 1
+        current = None
+        start = None
+        last_first_word = last_last_word = None
+
+        for syllables, first_word, last_word, line in verses:
+            if current is None:
+                current = syllables
+                start = line
+            elif first_word == last_first_word:
+                # Anaphora: the syllables are added to the current verse.
+                current += syllables
+            elif last_word == last_last_word:
+                # Epistrophe: the current verse is subtracted from the chain.
+                chain += sign * current
+                sign = -sign
+                current = syllables
+            else:
+                yield abs(chain + sign * current), start
+                chain = 0
+                sign = 1
+                current = syllables
+                start = line
+
+            last_first_word = first_word
+            last_last_word = last_word
+
+        if current is not None:
+            yield abs(chain + sign * current), start
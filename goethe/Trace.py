@@ -0,0 +1,202 @@
+import sys
+import struct
+import argparse
+from array import array
+
+from goethe.Token import Token
+
+
+class TraceException(Exception):
+    pass
+
+
+class TraceRecorder:
+    """Records the most recently executed instructions in a fixed-size ring buffer.
+
+    Every entry consists of token index, memory pointer and memory value before the
+    instruction was executed. The entries are stored in a preallocated integer array,
+    so recording does not create any Python objects.
+
+    Attributes:
+        size (int): Maximum number of entries that are kept.
+        count (int): Total number of recorded entries.
+    """
+
+    MAGIC = b'GTRC'
+    VERSION = 1
+
+    # Magic, version, program hash, ring size, recorded entries, program length.
+    HEADER = struct.Struct('<4sB32sQQQ')
+
+    # Range of the stored memory values. Values outside are clamped.
+    VALUE_MIN = -2 ** 63
+    VALUE_MAX = 2 ** 63 - 1
+
+    def __init__(self, size=65536):
+        """
+        Args:
+            size (int, optional): Maximum number of entries that are kept. Defaults to 65536.
+
+        Raises:
+            ValueError: If the size is smaller than 1.
+        """
+
+        if size < 1:
+            raise ValueError(f'The trace size must be at least 1, got {size}.')
+
+        self.size = size
+        self.count = 0
+        self.__index = 0
+        self.__buffer = array('q', bytes(24 * size))
+
+    def record(self, pointer: int, memory_pointer: int, value: int) -> None:
+        """Appends an entry and overwrites the oldest one if the buffer is full.
+
+        Args:
+            pointer (int): Program pointer.
+            memory_pointer (int): Memory pointer.
+            value (int): Memory value. Clamped to the range of 64 bit integers.
+        """
+
+        if not self.VALUE_MIN <= value <= self.VALUE_MAX:
+            value = self.VALUE_MIN if value < 0 else self.VALUE_MAX
+
+        index = self.__index
+        buffer = self.__buffer
+        buffer[index] = pointer
+        buffer[index + 1] = memory_pointer
+        buffer[index + 2] = value
+
+        index += 3
+        self.__index = index if index < len(buffer) else 0
+        self.count += 1
+
+    def entries(self) -> list:
+        """Returns the recorded entries from oldest to newest.
+
+        Returns:
+            list: Tuples of token index, memory pointer and memory value.
+        """
+
+        ordered = self.__ordered()
+        return list(zip(ordered[0::3], ordered[1::3], ordered[2::3]))
+
+    def dump(self, path: str, tokens=b'', verses=(), program_hash='0' * 64) -> None:
+        """Writes the entries together with the program to a binary trace file.
+
+        Args:
+            path (str): Path of the trace file.
+            tokens (bytes, optional): Program bytecode. Defaults to b''.
+            verses (Iterable[int], optional): Source line number of every token. Defaults to ().
+            program_hash (str, optional): Hash of the program. Defaults to zeros.
+        """
+
+        verses = array('q', verses)
+        if len(verses) != len(tokens):
+            verses = array('q', bytes(8 * len(tokens)))
+
+        ordered = self.__ordered()
+        if sys.byteorder != 'little':
+            verses.byteswap()
+            ordered.byteswap()
+
+        with open(path, 'wb') as file:
+            file.write(self.HEADER.pack(self.MAGIC, self.VERSION, bytes.fromhex(program_hash),
+                                        self.size, self.count, len(tokens)))
+            file.write(bytes(tokens))
+            file.write(verses.tobytes())
+            file.write(ordered.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> dict:
+        """Reads a trace file written by dump().
+
+        Args:
+            path (str): Path of the trace file.
+
+        Raises:
+            TraceException: If the file is not a valid trace file.
+
+        Returns:
+            dict: Program hash, ring size, number of recorded entries, program
+                bytecode, verse line numbers and the entries from oldest to newest.
+        """
+
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        if len(data) < cls.HEADER.size:
+            raise TraceException('Trace file is truncated.')
+
+        magic, version, program_hash, size, count, length = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise TraceException('File is not a supported trace file.')
+
+        offset = cls.HEADER.size
+        tokens = data[offset:offset + length]
+        offset += length
+
+        verses = array('q')
+        verses.frombytes(data[offset:offset + 8 * length])
+        offset += 8 * length
+
+        values = array('q')
+        values.frombytes(data[offset:offset + 24 * min(size, count)])
+
+        if sys.byteorder != 'little':
+            verses.byteswap()
+            values.byteswap()
+
+        return {
+            'program_hash': program_hash.hex(),
+            'size': size,
+            'count': count,
+            'tokens': tokens,
+            'verses': verses,
+            'entries': list(zip(values[0::3], values[1::3], values[2::3])),
+        }
+
+    def __ordered(self) -> array:
+        """Returns the buffer contents in chronological order.
+
+        Returns:
+            array: Flat array of entries from oldest to newest.
+        """
+
+        buffer = self.__buffer
+        if self.count < self.size:
+            return buffer[:3 * self.count]
+
+        return buffer[self.__index:] + buffer[:self.__index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decodes a Goethe execution trace.")
+    parser.add_argument("trace", help="Trace file written by goethe --trace")
+    parser.add_argument("source", nargs='?', help="Source file (.goethe) of the traced program")
+    args = parser.parse_args()
+
+    trace = TraceRecorder.load(args.trace)
+    lines = []
+    if args.source:
+        with open(args.source) as file:
+            lines = file.read().splitlines()
+
+    first = trace['count'] - len(trace['entries'])
+    print(f"program {trace['program_hash'][:16]}, {trace['count']} steps recorded, "
+          f"showing the last {len(trace['entries'])}")
+
+    for number, (pointer, memory_pointer, value) in enumerate(trace['entries'], first):
+        if 0 <= pointer < len(trace['tokens']):
+            token = Token(trace['tokens'][pointer]).name
+            line = trace['verses'][pointer]
+        else:
+            token = 'END'
+            line = 0
+
+        verse = f'{line:>5}  {lines[line - 1].strip()}' if 0 < line <= len(lines) else f'{line or "":>5}'
+        print(f'{number:>10}  {pointer:>6}  {token:<6}  mp={memory_pointer:<5} value={value:<5} {verse}')
+
+
+if __name__ == '__main__':
+    main()
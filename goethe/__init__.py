@@ -0,0 +1,18 @@
+import importlib
+
+__all__ = ['run', 'Result', 'Limits']
+
+# Names of the library API and their modules. They are only imported when they are used,
+# so that commands like the client do not load the interpreter.
+EXPORTS = {
+    'run': 'goethe.Runtime',
+    'Result': 'goethe.Runtime',
+    'Limits': 'goethe.Runtime',
+}
+
+
+def __getattr__(name):
+    if name not in EXPORTS:
+        raise AttributeError(f"module 'goethe' has no attribute '{name}'")
+
+    return getattr(importlib.import_module(EXPORTS[name]), name)
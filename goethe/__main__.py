@@ -1,8 +1,7 @@
+import io
 import sys
 import argparse
-
-from goethe.Editor import Editor
-from goethe.Interpreter import Interpreter
+import importlib
 
 
 class Parser(argparse.ArgumentParser):
@@ -17,23 +16,188 @@ class Parser(argparse.ArgumentParser):
         sys.exit(2)
 
 
-parser = Parser(description="Python interpreter for the Goethe programming language.")
+# Commands that are implemented by the main() function of their own module.
+COMMANDS = {
+    'monitor': 'goethe.Monitor',
+    'serve': 'goethe.Server',
+    'client': 'goethe.Client',
+    'compose': 'goethe.Composer',
+    'build': 'goethe.Native',
+}
+
+
+def positive_int(text: str) -> int:
+    """Converts a command line argument to an integer greater than zero.
+
+    Args:
+        text (str): Argument value.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a positive integer.
+
+    Returns:
+        int: The value.
+    """
+
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid int value: {text!r}')
+
+    if value < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1: {value}')
+
+    return value
+
+
+def create_parser() -> Parser:
+    """Creates the parser of the interpreter command line.
+
+    Returns:
+        Parser: The argument parser.
+    """
+
+    from goethe.Syllables import BACKENDS
+
+    parser = Parser(description="Python interpreter for the Goethe programming language.")
+
+    output_group = parser.add_mutually_exclusive_group(required=True)
+    output_group.add_argument("-i", "--input", action="store", help="Input file (.goethe)")
+    output_group.add_argument("-e", "--editor", action="store_true", help="Open the editor")
+    parser.add_argument("--seed", action="store", type=int, help="Seed for reproducible random numbers")
+    parser.add_argument("--syllables", action="store", choices=sorted(BACKENDS), default="pyphen",
+                        help="Syllable counter (default: pyphen)")
+    parser.add_argument("-O", "--optimize", action="store_true",
+                        help="Remove dead loops and precompute the output before the first input")
+    parser.add_argument("--tiered", action="store_true",
+                        help="Compile frequently executed loops while the program runs")
+    parser.add_argument("--bounds", action="store_true",
+                        help="Print the memory cells the program provably stays within and exit")
+    parser.add_argument("--detect-loops", action="store_true",
+                        help="Abort loops that repeat the same state without input or output")
+    parser.add_argument("--trace", action="store", metavar="FILE",
+                        help="Record the last executed instructions and write them to FILE on exit")
+    parser.add_argument("--trace-size", action="store", type=positive_int, default=65536, metavar="N",
+                        help="Number of instructions kept in the trace (default: 65536)")
+    parser.add_argument("--stats", action="store", metavar="FILE",
+                        help="Write timings and counters as JSON to FILE on exit ('-' for stderr)")
+    parser.add_argument("--shared-memory", action="store", metavar="NAME",
+                        help="Keep the memory in shared memory NAME, to be watched with goethe monitor NAME")
+    parser.add_argument("--cache", action="store", nargs="?", const="", metavar="DIR",
+                        help="Reuse the output of earlier runs with the same program and input "
+                             "(default directory: ~/.cache/goethe/results)")
+    parser.add_argument("--cache-size", action="store", type=int, default=64, metavar="MB",
+                        help="Size limit of the result cache in megabytes (default: 64)")
+
+    return parser
 
-output_group = parser.add_mutually_exclusive_group(required=True)
-output_group.add_argument("-i", "--input", action="store", help="Input file (.goethe)")
-output_group.add_argument("-e", "--editor", action="store_true", help="Open the editor")
 
 def main():
-    args = parser.parse_args()
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        # Commands are only imported when they are used, so that e.g. the client starts fast.
+        return importlib.import_module(COMMANDS[sys.argv[1]]).main(sys.argv[2:])
+
+    args = create_parser().parse_args()
     if args.editor:
         # Opens Goethe editor.
-        editor = Editor()
+        from goethe.Editor import Editor
+        editor = Editor(args.syllables)
         editor.main()
     elif args.input:
         # Runs Goethe interpreter in console mode.
+        from goethe.Token import Token
+        from goethe.Metrics import Metrics
+        from goethe.Program import Program
+        from goethe.Optimizer import Optimizer
+        from goethe.Interpreter import Interpreter
+        from goethe.LoopDetector import InfiniteLoopException
+        from goethe.SharedMemory import SharedMemoryException
+        from goethe.Cache import ResultCache, CachedResult, DEFAULT_CACHE_DIR
+
+        # The program is tokenized before the interpreter is created, so that the
+        # syllable counter is only loaded once.
+        metrics = Metrics()
         with open(args.input) as file:
-            interpreter = Interpreter(file.read())
+            program = Program.from_lines(file, syllables=args.syllables, metrics=metrics)
+
+        if args.optimize:
+            program = Optimizer(metrics=metrics).optimize(program)
+
+        interpreter = Interpreter(seed=args.seed, syllables=args.syllables, metrics=metrics, program=program)
+
+        if args.bounds:
+            print(interpreter.bounds.report())
+            return
+
+        if args.tiered:
+            interpreter.enable_tiering()
+
+        if args.detect_loops:
+            interpreter.enable_loop_detection()
+
+        if args.trace:
+            interpreter.enable_trace(args.trace_size)
+
+        try:
+            shared_memory = interpreter.share_memory(args.shared_memory) if args.shared_memory else None
+        except SharedMemoryException as exception:
+            sys.stderr.write(f'error: {exception}\n')
+            sys.exit(1)
+
+        cache, cache_key, output = None, None, []
+        # Runs that are traced or watched are always executed.
+        if (args.cache is not None and not args.trace and shared_memory is None
+                and ResultCache.cacheable(program, args.seed)):
+            # The whole input is read in advance, because it is part of the cache key.
+            user_input = sys.stdin.read() if Token.IN in program.tokens else ''
+            sys.stdin = io.StringIO(user_input)
+
+            cache = ResultCache(args.cache or DEFAULT_CACHE_DIR, args.cache_size * 1024 * 1024)
+            cache_key = ResultCache.key(program, user_input, args.seed, console_mode=True)
+            result = cache.get(cache_key)
+
+            if result is not None:
+                print(result.output)
+                interpreter.metrics.increment('cache_hits')
+                if args.stats:
+                    write_stats(interpreter.metrics, args.stats)
+                return
+
+            interpreter.add_event_listener('<out>', output.append)
+
+        try:
             interpreter.run()
 
+            if cache is not None:
+                cache.put(cache_key, CachedResult(''.join(output), interpreter.metrics.counters.get('steps', 0)))
+                interpreter.metrics.increment('cache_misses')
+        except InfiniteLoopException as exception:
+            sys.stderr.write(f'\nerror: {exception}\n')
+            sys.exit(1)
+        finally:
+            # The trace is also written if the program fails or is interrupted.
+            interpreter.dump_trace(args.trace)
+
+            if shared_memory is not None:
+                shared_memory.close()
+
+            if args.stats:
+                write_stats(interpreter.metrics, args.stats)
+
+
+def write_stats(metrics, path: str) -> None:
+    """Writes the metrics as JSON document.
+
+    Args:
+        metrics (Metrics): Collected metrics.
+        path (str): Output file. '-' writes to stderr.
+    """
+
+    if path == '-':
+        sys.stderr.write(metrics.to_json() + '\n')
+    else:
+        with open(path, 'w') as file:
+            file.write(metrics.to_json() + '\n')
+
 if __name__ == "__main__":
     main()
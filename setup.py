@@ -17,6 +17,9 @@ setup(
     install_requires=[
         'Pyphen',
     ],
+    extras_require={
+        'batch': ['numpy'],
+    },
     classifiers=[
         "Development Status :: 4 - Beta",
         "Environment :: Console",
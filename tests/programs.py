@@ -0,0 +1,71 @@
+import random
+
+from goethe.Token import Token
+from goethe.Program import Program
+from goethe.Composer import Composer
+
+
+# Tokens that are chosen for the body of random programs. Value changes are more likely,
+# so that loops terminate and OUT writes valid characters more often.
+BODY = [Token.PASS, Token.INCVAL, Token.INCVAL, Token.DECVAL, Token.DECVAL,
+        Token.INCPTR, Token.DECPTR, Token.OUT, Token.IN, Token.RND]
+
+
+def parse(text: str) -> Program:
+    """Creates a program from token values or Brainfuck-like symbols, see Composer.parse_tokens().
+
+    Args:
+        text (str): Program text, e.g. '++[->+<].'.
+
+    Returns:
+        Program: Tokenized program.
+    """
+
+    return Program(Composer.parse_tokens(text))
+
+
+def random_program(rng: random.Random, length: int) -> Program:
+    """Generates a program with balanced loops.
+
+    Args:
+        rng (random.Random): Random number generator.
+        length (int): Number of tokens before the loops are closed.
+
+    Returns:
+        Program: Tokenized program.
+    """
+
+    tokens, depth = [], 0
+    for _ in range(length):
+        choice = rng.random()
+        if choice < 0.12:
+            tokens.append(Token.LOOP)
+            depth += 1
+        elif choice < 0.24 and depth:
+            tokens.append(Token.POOL)
+            depth -= 1
+        else:
+            tokens.append(rng.choice(BODY))
+
+    return Program(tokens + [Token.POOL] * depth)
+
+
+def random_input(rng: random.Random, length=5) -> str:
+    """Generates user input of up to the given number of characters.
+
+    Args:
+        rng (random.Random): Random number generator.
+        length (int, optional): Maximum number of characters. Defaults to 5.
+
+    Returns:
+        str: The input.
+    """
+
+    return ''.join(chr(rng.randint(1, 200)) for _ in range(rng.randint(0, length)))
+
+
+def error_name(error) -> str:
+    """Returns the class name of an error, or None if there is no error.
+    """
+
+    return type(error).__name__ if error is not None else None
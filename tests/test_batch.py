@@ -0,0 +1,89 @@
+import random
+import unittest
+
+import goethe
+from goethe.Optimizer import Optimizer
+from goethe.Batch import BatchInterpreter, np
+
+from programs import parse, random_program, random_input, error_name
+
+
+def expected(program, inputs, seed, max_steps) -> list:
+    """Runs the program with goethe.run() for every input.
+
+    Returns:
+        list: Output, executed steps and class name of the error per input.
+    """
+
+    results = [goethe.run(program, text, seed=seed, limits=goethe.Limits(max_steps=max_steps)) for text in inputs]
+    return [(result.output.decode('utf-8'), result.steps, error_name(result.error)) for result in results]
+
+
+def batch(program, inputs, seed, max_steps) -> list:
+    """Runs the program with the batch interpreter.
+
+    Returns:
+        list: Output, executed steps and class name of the error per input.
+    """
+
+    results = BatchInterpreter(program).run(inputs, max_steps=max_steps, seed=seed)
+    return [(result.output, result.steps, error_name(result.error)) for result in results]
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class BatchInterpreterTest(unittest.TestCase):
+
+    def assertSameResults(self, program, inputs, seed=1, max_steps=None):
+        self.assertEqual(batch(program, inputs, seed, max_steps), expected(program, inputs, seed, max_steps))
+
+    def test_lanes_leave_loops_at_different_times(self):
+        # Reads a count and prints as many characters.
+        program = parse(',>++++++++[>++++++++<-]>+<<[>>.+<<-]')
+
+        self.assertSameResults(program, ['\x00', '\x01', '\x05', '\x0c', ''])
+
+    def test_echo_until_end_of_input(self):
+        self.assertSameResults(parse(',[.[-],]'), ['', 'a', 'abc', 'ümlaut'])
+
+    def test_random_values(self):
+        program = parse('++++[>?.<-]')
+
+        for seed in (0, 7, -3, 2 ** 40):
+            self.assertSameResults(program, ['', 'x'], seed=seed)
+
+    def test_step_limit(self):
+        # The lanes need 4 + 5 * count steps, so the last two exceed the limit.
+        program = parse(',[>+<-]>.')
+        inputs = ['\x01', '\x05', '\x14', '\x64']
+
+        self.assertSameResults(program, inputs, max_steps=50)
+        self.assertEqual([error for _, _, error in batch(program, inputs, 1, 50)],
+                         [None, None, 'LimitExceededException', 'LimitExceededException'])
+
+    def test_infinite_loop_is_stopped_by_the_step_limit(self):
+        self.assertSameResults(parse('+[>+<]'), ['', 'a'], max_steps=1000)
+
+    def test_invalid_output(self):
+        self.assertSameResults(parse(',-.'), ['\x00', 'a'])
+
+    def test_unmatched_brackets(self):
+        self.assertSameResults(parse('+++].'), ['a', ''], max_steps=100)
+        self.assertSameResults(parse('[+.'), ['a'], max_steps=100)
+
+    def test_optimized_program(self):
+        program = Optimizer().optimize(parse('++++++++[>++++++++<-]>+.,.'))
+
+        self.assertSameResults(program, ['a', 'b', ''])
+
+    def test_random_programs(self):
+        rng = random.Random(5)
+
+        for _ in range(200):
+            program = random_program(rng, rng.randint(1, 40))
+            inputs = [random_input(rng) for _ in range(6)]
+
+            self.assertSameResults(program, inputs, rng.randint(-10, 10), rng.choice([100, 1000, 5000]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import random
+import unittest
+
+from goethe.Token import Token
+from goethe.Program import Program
+from goethe.TapeBounds import TapeBounds
+from goethe.Interpreter import Interpreter, LimitExceededException
+
+from programs import parse, random_program, random_input
+
+SIZE = Interpreter.MEMORY_SIZE
+
+
+def simulate(program: Program, user_input: str, max_steps: int) -> tuple:
+    """Executes a program without RND instructions and records the memory pointer before
+    and after every instruction, without wrapping it around. Stops at invalid output.
+
+    Returns:
+        tuple: Output, memory, memory pointer and the unwrapped pointer values per token index.
+            Memory and memory pointer are None, if the program finished.
+    """
+
+    tokens, jump_table = program.tokens, program.jump_table
+    memory, memory_pointer, pointer = [0] * SIZE, 0, 0
+    output, pointers = [], {}
+
+    for _ in range(max_steps):
+        if pointer >= len(tokens):
+            return output, None, None, pointers
+
+        token, moved = tokens[pointer], memory_pointer
+        if token == Token.LOOP and memory[memory_pointer] == 0:
+            pointer = jump_table[pointer]
+        elif token == Token.POOL and memory[memory_pointer] != 0:
+            pointer = jump_table[pointer]
+        elif token == Token.INCVAL:
+            memory[memory_pointer] += 1
+        elif token == Token.DECVAL:
+            memory[memory_pointer] -= 1
+        elif token == Token.INCPTR:
+            moved = memory_pointer + 1
+        elif token == Token.DECPTR:
+            moved = memory_pointer - 1
+        elif token == Token.OUT:
+            if not 0 <= memory[memory_pointer] < 0x110000:
+                output.append(None)
+                break
+            output.append(chr(memory[memory_pointer]))
+        elif token == Token.IN and user_input:
+            memory[memory_pointer], user_input = ord(user_input[0]), user_input[1:]
+
+        pointers.setdefault(pointer if token not in (Token.LOOP, Token.POOL) else None, set()).update(
+            (memory_pointer, moved))
+        memory_pointer = moved % SIZE
+        pointer += 1
+
+    return output, memory, memory_pointer, pointers
+
+
+def interpret(program: Program, user_input: str, max_steps: int) -> tuple:
+    """Executes a program with the interpreter, which drops the wrap-around check at proven tokens.
+
+    Returns:
+        tuple: Output, memory and memory pointer. Memory and memory pointer are None, if the
+            program finished, because the interpreter is then reset.
+    """
+
+    interpreter = Interpreter(console_mode=False, program=program)
+    output = []
+    interpreter.add_event_listener('<out>', output.append)
+    interpreter.set_user_input(user_input)
+
+    try:
+        interpreter.run(max_steps=max_steps)
+        return output, None, None
+    except LimitExceededException:
+        pass
+    except ValueError:
+        output.append(None)
+
+    return output, interpreter.memory.to_list(), interpreter.memory.get_pointer_value()
+
+
+class TapeBoundsTest(unittest.TestCase):
+
+    def test_straight_program(self):
+        bounds = TapeBounds(parse('>>+<<.'))
+
+        self.assertTrue(all(bounds.proven))
+        self.assertEqual(bounds.cells, 3)
+
+    def test_balanced_loop(self):
+        bounds = TapeBounds(parse('+[->+<]'))
+
+        self.assertTrue(bounds.loop_in_bounds(1))
+        self.assertEqual(bounds.cells, 2)
+
+    def test_moving_loops(self):
+        # The loop moves the pointer, so it can reach the end of the memory.
+        bounds = TapeBounds(parse('+[>+]'))
+
+        self.assertEqual(list(bounds.proven), [1, 0, 0, 0, 0])
+        self.assertFalse(bounds.loop_in_bounds(1))
+        self.assertIs(bounds.cells, None)
+
+    def test_wrap_around(self):
+        self.assertEqual(list(TapeBounds(parse('<+')).proven), [0, 0])
+        self.assertEqual(list(TapeBounds(parse('>[-]<<')).proven), [1, 1, 1, 1, 1, 0])
+
+    def test_unmatched_brackets(self):
+        for text in ('+]', '[+', '+]>[', '[[]'):
+            bounds = TapeBounds(parse(text))
+
+            self.assertFalse(bounds.matched, text)
+            self.assertFalse(any(bounds.proven), text)
+
+    def test_proven_tokens_never_wrap(self):
+        rng = random.Random(17)
+
+        for _ in range(500):
+            tokens = random_program(rng, rng.randint(1, 40)).tokens.replace(bytes([Token.RND]), bytes([Token.PASS]))
+            # Long pointer movements make wrapping around the memory more likely.
+            program = Program(tokens.replace(bytes([Token.PASS]), bytes([Token.INCPTR] * 40)))
+            user_input = random_input(rng)
+            bounds = TapeBounds(program)
+
+            output, memory, memory_pointer, pointers = simulate(program, user_input, 5000)
+
+            pointers.pop(None, None)
+            for index, values in pointers.items():
+                if bounds.proven[index]:
+                    self.assertTrue(all(0 <= value < SIZE for value in values), f'{list(program.tokens)} {index}')
+                if bounds.cells is not None:
+                    self.assertTrue(all(0 <= value < bounds.cells for value in values), list(program.tokens))
+
+            self.assertEqual(interpret(program, user_input, 5000), (output, memory, memory_pointer),
+                             list(program.tokens))
+
+
+if __name__ == '__main__':
+    unittest.main()
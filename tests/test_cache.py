@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+from goethe.Pool import InterpreterPool
+from goethe.Cache import ResultCache, CachedResult
+
+from programs import parse
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples')
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def entry(self, key: str) -> str:
+        """Returns the path of the file of a result.
+        """
+
+        return os.path.join(self.directory.name, key[:2], key + '.json')
+
+    def test_key(self):
+        program = parse(',.')
+        key = ResultCache.key(program, 'a\nb')
+
+        self.assertEqual(ResultCache.key(program, 'a\nb'), key)
+        self.assertNotEqual(ResultCache.key(program, 'a\nb', console_mode=True), key)
+        self.assertNotEqual(ResultCache.key(program, 'a\nc'), key)
+        self.assertNotEqual(ResultCache.key(parse(',..'), 'a\nb'), key)
+
+    def test_seed_is_only_part_of_the_key_with_rnd(self):
+        self.assertEqual(ResultCache.key(parse(',.'), 'a', seed=1), ResultCache.key(parse(',.'), 'a', seed=2))
+        self.assertNotEqual(ResultCache.key(parse('?.'), '', seed=1), ResultCache.key(parse('?.'), '', seed=2))
+
+    def test_cacheable(self):
+        self.assertTrue(ResultCache.cacheable(parse(',.')))
+        self.assertTrue(ResultCache.cacheable(parse('?.'), seed=1))
+        self.assertFalse(ResultCache.cacheable(parse('?.')))
+
+    def test_put_and_get(self):
+        cache = ResultCache(self.directory.name)
+        key = ResultCache.key(parse(',.'), 'ä')
+
+        self.assertIsNone(cache.get(key))
+        cache.put(key, CachedResult('ä', 3))
+        self.assertEqual(cache.get(key), CachedResult('ä', 3))
+
+        cache.clear()
+        self.assertIsNone(cache.get(key))
+
+    def test_least_recently_used_results_are_evicted(self):
+        program = parse(',.')
+        keys = [ResultCache.key(program, str(index)) for index in range(4)]
+        size = len(b'{"output": "x", "steps": 1}')
+
+        cache = ResultCache(self.directory.name, max_size=3 * size)
+        for time, key in enumerate(keys[:3]):
+            cache.put(key, CachedResult('x', 1))
+            os.utime(self.entry(key), (1000 + time, 1000 + time))
+
+        # The oldest result is used again, so the second one is the least recently used.
+        self.assertIsNotNone(cache.get(keys[0]))
+        cache.put(keys[3], CachedResult('x', 1))
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[3]))
+
+    def test_results_larger_than_the_cache_are_not_stored(self):
+        cache = ResultCache(self.directory.name, max_size=10)
+        key = ResultCache.key(parse(',.'), '')
+        cache.put(key, CachedResult('x' * 100, 1))
+
+        self.assertIsNone(cache.get(key))
+
+    def test_pool_results(self):
+        with open(os.path.join(EXAMPLES, 'reverse.goethe')) as file:
+            text = file.read()
+
+        pool = InterpreterPool(syllables='heuristic', cache=ResultCache(self.directory.name))
+        expected = InterpreterPool(syllables='heuristic').run(text, 'ab\ncd')
+
+        self.assertEqual(pool.run(text, 'ab\ncd'), expected)
+        self.assertEqual(pool.run(text, 'ab\ncd'), expected)
+        self.assertEqual(pool.execution_metrics.counters.get('cache_hits'), 1)
+
+        # Console runs of the same program and input are not answered from the pool results.
+        program = pool.get_program(text)
+        self.assertIsNone(pool.cache.get(ResultCache.key(program, 'ab\ncd', console_mode=True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import random
+import unittest
+
+from goethe.Interpreter import Interpreter
+from goethe.LoopDetector import InfiniteLoopException
+
+from programs import parse, random_program, random_input, error_name
+
+
+def run(program, detect_loops: bool, user_input='', max_steps=20000) -> tuple:
+    """Runs the program with or without loop detection.
+
+    Returns:
+        tuple: Output and the class name of the error.
+    """
+
+    interpreter = Interpreter(console_mode=False, seed=1, program=program)
+    if detect_loops:
+        interpreter.enable_loop_detection()
+
+    output = []
+    interpreter.add_event_listener('<out>', output.append)
+    interpreter.set_user_input(user_input)
+
+    error = None
+    try:
+        interpreter.run(max_steps=max_steps)
+    except Exception as exception:
+        error = exception
+
+    return ''.join(output), error_name(error)
+
+
+class LoopDetectorTest(unittest.TestCase):
+
+    def assertDetected(self, text, user_input=''):
+        self.assertEqual(run(parse(text), True, user_input)[1], 'InfiniteLoopException', text)
+
+    def assertNotDetected(self, text, user_input=''):
+        program = parse(text)
+        self.assertEqual(run(program, True, user_input), run(program, False, user_input), text)
+
+    def test_loops_that_repeat_their_state(self):
+        self.assertDetected('+[]')
+        self.assertDetected('+[><]')
+        self.assertDetected('+[>-+<]')
+        self.assertDetected(',[]', 'a')
+
+    def test_nested_loops(self):
+        # The inner loop terminates, the outer loop restores the same memory.
+        self.assertDetected('+[>+[-]<]')
+        self.assertDetected('+[>>[-]+[<]>]')
+
+    def test_loops_that_change_memory(self):
+        self.assertNotDetected('+[>+<]')
+        self.assertNotDetected('+[+]')
+        self.assertNotDetected('+[>+]')
+
+    def test_loops_with_input_or_output(self):
+        self.assertNotDetected('+[.]')
+        self.assertNotDetected('+[,]')
+        self.assertNotDetected('+[,]', 'abc')
+        self.assertNotDetected('+[?-+]')
+        self.assertNotDetected('+[>+[.-]<]')
+        self.assertNotDetected('+[>[-]+.<]')
+
+    def test_terminating_loops(self):
+        self.assertNotDetected('++++++++[>++++++++<-]>+.')
+        self.assertNotDetected('++++[>++++[>++++<-]<-]>>.')
+        self.assertNotDetected(',[.[-],]', 'abc')
+        self.assertNotDetected('+[>+++<-]>[<+>-]<[-]+[-]')
+
+    def test_exception_names_the_loop(self):
+        program = parse('++[]')
+
+        with self.assertRaisesRegex(InfiniteLoopException, 'tokens 2-3'):
+            interpreter = Interpreter(console_mode=False, program=program)
+            interpreter.enable_loop_detection()
+            interpreter.run()
+
+    def test_random_programs(self):
+        rng = random.Random(23)
+
+        for _ in range(200):
+            program = random_program(rng, rng.randint(1, 30))
+            user_input = random_input(rng)
+
+            output, error = run(program, True, user_input)
+            if error != 'InfiniteLoopException':
+                self.assertEqual((output, error), run(program, False, user_input), list(program.tokens))
+                continue
+
+            # A detected loop never terminates.
+            expected = run(program, False, user_input, max_steps=50000)
+            self.assertEqual(expected[1], 'LimitExceededException', list(program.tokens))
+            self.assertTrue(expected[0].startswith(output), list(program.tokens))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import goethe
+from goethe.Program import Program
+from goethe.Optimizer import Optimizer
+from goethe.Native import NativeCompiler
+from goethe.Interpreter import LimitExceededException
+
+from programs import parse, random_program, random_input
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples')
+
+SEEDS = [0, 1, 42, -1, -42, 2 ** 32, -(2 ** 40), 2 ** 100 + 7]
+
+
+@unittest.skipIf(shutil.which(os.environ.get('CC') or 'cc') is None, 'No C compiler available')
+class NativeTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.compiler = NativeCompiler(cls.directory.name)
+        cls.examples = {}
+
+        for name in ('hello', 'reverse', 'random'):
+            with open(os.path.join(EXAMPLES, f'{name}.goethe')) as file:
+                cls.examples[name] = Program.from_text(file.read())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def assertSameResult(self, program, user_input='', seed=None):
+        expected = goethe.run(program, user_input, seed=seed)
+        actual = self.compiler.load(program).run(user_input, seed=seed)
+
+        self.assertEqual(actual.output, expected.output)
+        self.assertEqual(actual.steps, expected.steps)
+        self.assertEqual(type(actual.error), type(expected.error))
+
+    def test_examples(self):
+        for name, program in self.examples.items():
+            for user_input in ('', 'abc', 'Grüße, Welt! ✓'):
+                with self.subTest(name=name, input=user_input):
+                    self.assertSameResult(program, user_input, seed=1)
+
+    def test_optimized_examples(self):
+        for name, program in self.examples.items():
+            with self.subTest(name=name):
+                self.assertSameResult(Optimizer().optimize(program), 'abc', seed=1)
+
+    def test_random_stream(self):
+        for seed in SEEDS:
+            with self.subTest(seed=seed):
+                self.assertSameResult(self.examples['random'], seed=seed)
+
+        # Writes 64 random values, so the whole generated stream is compared.
+        program = parse('++++++++[>++++++++[>?.<-]<-]')
+        for seed in SEEDS:
+            with self.subTest(seed=seed):
+                self.assertSameResult(program, seed=seed)
+
+    def test_invalid_output(self):
+        self.assertSameResult(parse('++.---.'))
+
+    def test_random_programs(self):
+        rng = random.Random(13)
+        count = 0
+
+        while count < 15:
+            program = random_program(rng, rng.randint(1, 40))
+            user_input = random_input(rng)
+
+            # The native program has no step limit.
+            expected = goethe.run(program, user_input, seed=7, limits=goethe.Limits(max_steps=100000))
+            if isinstance(expected.error, LimitExceededException):
+                continue
+
+            self.assertSameResult(program, user_input, seed=7)
+            count += 1
+
+
+if __name__ == '__main__':
+    unittest.main()
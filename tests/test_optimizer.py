@@ -0,0 +1,100 @@
+import random
+import unittest
+
+import goethe
+from goethe.Token import Token
+from goethe.Optimizer import Optimizer
+from goethe.Interpreter import Interpreter
+
+from programs import parse, random_program, random_input, error_name
+
+
+def run(program, user_input='', seed=1, max_steps=None) -> tuple:
+    """Runs the program with goethe.run().
+
+    Returns:
+        tuple: Output and the class name of the error.
+    """
+
+    result = goethe.run(program, user_input, seed=seed, limits=goethe.Limits(max_steps=max_steps))
+    return result.output, error_name(result.error)
+
+
+class OptimizerTest(unittest.TestCase):
+
+    def assertSameResult(self, program, user_input=''):
+        self.assertEqual(run(Optimizer().optimize(program), user_input), run(program, user_input))
+
+    def test_dead_loops_are_removed(self):
+        program = parse('[+.][-]++++++++[>++++++++<-]>+.[-][>.<]<[.]')
+        optimized = Optimizer().remove_dead_loops(program)
+
+        self.assertEqual(optimized.tokens, parse('++++++++[>++++++++<-]>+.[-]<[.]').tokens)
+        self.assertSameResult(program)
+
+    def test_prefix_output(self):
+        program = parse('++++++++[>++++++++<-]>+.+.+.')
+        optimized = Optimizer().optimize(program)
+
+        self.assertEqual(optimized.prefix.output, 'ABC')
+        self.assertEqual(optimized.prefix.pointer, len(program))
+        self.assertSameResult(program)
+
+    def test_input_before_output(self):
+        # IN leaves the cell unchanged at the end of the input, so the loop clears it first.
+        program = parse(',[.[-],]')
+        optimized = Optimizer().optimize(program)
+
+        # Nothing can be evaluated before the first IN instruction.
+        self.assertIs(optimized.prefix, None)
+        self.assertSameResult(program, 'abc')
+        self.assertSameResult(parse('+++,.>,.'), 'xy')
+
+    def test_prefix_stops_at_random_values(self):
+        program = parse('++++++++[>++++++++<-]>.?.')
+        optimized = Optimizer().optimize(program)
+
+        self.assertEqual(program.tokens[optimized.prefix.pointer], Token.RND)
+        self.assertSameResult(program)
+
+    def test_invalid_output_in_prefix(self):
+        program = parse('+++.--------.')
+
+        self.assertEqual(run(program)[1], 'ValueError')
+        self.assertSameResult(program)
+
+    def test_restore_snapshot_inside_prefix(self):
+        program = parse('++++++++[>++++++++<-]>+.+.,.')
+        optimized = Optimizer().optimize(program)
+
+        interpreter = Interpreter(console_mode=False, program=optimized)
+        interpreter.set_user_input('!')
+        snapshot = interpreter.snapshot()
+
+        restored = Interpreter(console_mode=False, program=optimized)
+        output = []
+        restored.add_event_listener('<out>', output.append)
+        restored.restore(snapshot)
+        restored.run()
+
+        self.assertEqual(''.join(output).encode('utf-8'), run(program, '!')[0])
+        self.assertEqual(''.join(output), 'AB!')
+
+    def test_random_programs(self):
+        rng = random.Random(7)
+
+        for _ in range(300):
+            program = random_program(rng, rng.randint(1, 40))
+            user_input = random_input(rng)
+
+            expected = run(program, user_input, max_steps=20000)
+            if expected[1] == 'LimitExceededException':
+                # The optimized program executes fewer instructions.
+                continue
+
+            self.assertEqual(run(Optimizer().optimize(program), user_input, max_steps=20000), expected,
+                             f'{list(program.tokens)} {user_input!r}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import unittest
+
+from goethe.Pool import InterpreterPool
+from goethe.Interpreter import AbortException, LimitExceededException
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples')
+
+
+def abort(char: str) -> None:
+    raise AbortException()
+
+
+class InterpreterPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        with open(os.path.join(EXAMPLES, 'hello.goethe')) as file:
+            self.text = file.read()
+
+        self.pool = InterpreterPool(syllables='heuristic')
+
+    def test_failed_runs_are_recorded(self):
+        expected = self.pool.run(self.text)
+
+        with self.assertRaises(LimitExceededException):
+            self.pool.run(self.text, max_steps=1)
+        with self.assertRaises(AbortException):
+            self.pool.run(self.text, write=abort)
+
+        metrics = self.pool.metrics.as_dict()
+        self.assertEqual((metrics['runs'], metrics['failed_runs']), (3, 2))
+        self.assertEqual(len(self.pool.metrics.latencies), 3)
+        self.assertIn('goethe_pool_failed_runs_total 2\n', self.pool.prometheus())
+
+        # The interpreters of failed runs are reset when they are used again.
+        self.assertEqual(self.pool.run(self.text), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from goethe.Interpreter import Interpreter, LimitExceededException
+
+from programs import parse
+
+# Three nested loops that execute about 26000 steps.
+PROGRAM = parse('++++++++++++++++[>++++++++++++++++[>++++++++++++++++[>+<-]<-]<-]>>>.')
+
+
+class SharedMemoryTest(unittest.TestCase):
+
+    def run_shared(self, tiered: bool) -> None:
+        interpreter = Interpreter(console_mode=False, program=PROGRAM)
+        if tiered:
+            interpreter.enable_tiering(2)
+
+        output = []
+        interpreter.add_event_listener('<out>', output.append)
+        memory = interpreter.share_memory()
+        self.addCleanup(memory.close)
+
+        # The status is complete whenever the run stops.
+        with self.assertRaises(LimitExceededException):
+            interpreter.run(max_steps=10000)
+
+        status = memory.status()
+        self.assertEqual(status['steps'], 10000)
+        self.assertEqual(status['pointer'], interpreter.pointer)
+        self.assertEqual(status['memory_pointer'], interpreter.memory.get_pointer_value())
+        self.assertFalse(status['finished'])
+
+        interpreter.run()
+
+        status = memory.status()
+        self.assertEqual(status['steps'], interpreter.metrics.counters['steps'])
+        self.assertEqual((status['pointer'], status['memory_pointer']), (len(PROGRAM), 3))
+        self.assertTrue(status['finished'])
+        self.assertEqual(memory.to_list()[3], 4096)
+        self.assertEqual(output, [chr(4096)])
+
+    def test_status(self):
+        self.run_shared(False)
+
+    def test_status_with_compiled_loops(self):
+        self.run_shared(True)
+
+    def test_cells_are_64_bit_integers(self):
+        memory = Interpreter(console_mode=False, program=parse('+')).share_memory()
+        self.addCleanup(memory.close)
+
+        memory.set_value(2 ** 63 - 1)
+        self.assertEqual(memory.get_value(), 2 ** 63 - 1)
+        with self.assertRaises(ValueError):
+            memory.increment_value()
+
+
+if __name__ == '__main__':
+    unittest.main()
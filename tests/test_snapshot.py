@@ -0,0 +1,82 @@
+import unittest
+
+from goethe.Interpreter import Interpreter
+from goethe.Snapshot import Snapshot, SnapshotException
+
+from programs import parse
+
+# Reads two characters, writes random values and echoes the input with an offset.
+PROGRAM = parse(',>,>++++[>?<-]<<+.>+.>>.')
+
+
+def run_steps(interpreter: Interpreter, steps: int) -> None:
+    """Executes the given number of instructions.
+    """
+
+    for _ in range(steps):
+        interpreter.step()
+
+
+def finish(interpreter: Interpreter) -> str:
+    """Runs the interpreter to the end and returns its output.
+    """
+
+    output = []
+    interpreter.add_event_listener('<out>', output.append)
+    interpreter.run()
+    interpreter.remove_event_listener('<out>', output.append)
+    return ''.join(output)
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        snapshot = Snapshot('ab' * 32, 7, [0, -1, 2 ** 63 - 1, -2 ** 63], 2, 'ümlaut', b'state', b'buffer', 'Hallo')
+        decoded = Snapshot.from_bytes(snapshot.to_bytes())
+
+        self.assertEqual(decoded.program_hash, snapshot.program_hash)
+        self.assertEqual((decoded.pointer, decoded.memory_pointer), (7, 2))
+        self.assertEqual(list(decoded.memory), snapshot.memory)
+        self.assertEqual((decoded.user_input, decoded.random_state, decoded.random_buffer, decoded.pending_output),
+                         ('ümlaut', b'state', b'buffer', 'Hallo'))
+
+    def test_restore_continues_the_run(self):
+        interpreter = Interpreter(console_mode=False, seed=3, program=PROGRAM)
+        interpreter.set_user_input('ab')
+        run_steps(interpreter, 12)
+        snapshot = interpreter.snapshot()
+        expected = finish(interpreter)
+
+        restored = Interpreter(console_mode=False, seed=99, program=PROGRAM)
+        restored.restore(snapshot)
+
+        # Memory, pointers, pending input and the random number generator are restored.
+        self.assertEqual(finish(restored), expected)
+
+    def test_restore_verifies_the_program(self):
+        snapshot = Interpreter(console_mode=False, program=PROGRAM).snapshot()
+        other = Interpreter(console_mode=False, program=parse('+.'))
+
+        with self.assertRaises(SnapshotException):
+            other.restore(snapshot)
+
+        other.restore(snapshot, verify=False)
+        self.assertEqual(other.pointer, 0)
+
+    def test_invalid_data(self):
+        data = Interpreter(console_mode=False, program=PROGRAM).snapshot()
+
+        for invalid in (b'', data[:20], data[:-1], b'XXXX' + data[4:]):
+            with self.assertRaises(SnapshotException):
+                Snapshot.from_bytes(invalid)
+
+    def test_older_versions_are_rejected(self):
+        data = bytearray(Interpreter(console_mode=False, program=PROGRAM).snapshot())
+        data[4] = 2
+
+        with self.assertRaises(SnapshotException):
+            Snapshot.from_bytes(bytes(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import random
+import unittest
+
+from goethe.Token import Token
+from goethe.Interpreter import Interpreter
+from goethe.LoopCompiler import LoopCompiler
+
+from programs import parse, random_program, random_input, error_name
+
+
+def run(program, tiered: bool, user_input='', seed=1, max_steps=None) -> tuple:
+    """Runs the program with or without compiled loops.
+
+    Returns:
+        tuple: Output, executed steps, class name of the error, memory, memory pointer
+            and program pointer.
+    """
+
+    interpreter = Interpreter(console_mode=False, seed=seed, program=program)
+    if tiered:
+        interpreter.enable_tiering(2)
+
+    output = []
+    interpreter.add_event_listener('<out>', output.append)
+    interpreter.set_user_input(user_input)
+
+    error = None
+    try:
+        interpreter.run(max_steps=max_steps)
+    except Exception as exception:
+        error = exception
+
+    return (''.join(output), interpreter.metrics.counters.get('steps', 0), error_name(error),
+            interpreter.memory.to_list(), interpreter.memory.get_pointer_value(), interpreter.pointer)
+
+
+class TieringTest(unittest.TestCase):
+
+    def assertSameRun(self, program, user_input='', seed=1, max_steps=None):
+        self.assertEqual(run(program, True, user_input, seed, max_steps),
+                         run(program, False, user_input, seed, max_steps))
+
+    def assertCompiled(self, program, start):
+        tokens = program.tokens
+        self.assertEqual(tokens[start], Token.LOOP)
+        self.assertIsNotNone(LoopCompiler().compile(tokens, start, program.jump_table[start]))
+
+    def test_transfer_loop(self):
+        program = parse('++++++++++[->+++<]>.')
+
+        self.assertCompiled(program, 10)
+        self.assertSameRun(program)
+
+    def test_nested_loops(self):
+        program = parse('++++++++[>++++++++[>+>++<<-]<-]>>.>.<<++++[>+++[>>+<<-]<-]>>>>.')
+
+        self.assertCompiled(program, 18)
+        self.assertSameRun(program)
+
+    def test_unbalanced_pointer_loops(self):
+        # The loops move the pointer by one cell per iteration and wrap around the tape.
+        self.assertSameRun(parse('+>+>+>+>+<<<<[>]<<[<]>>+++++++++++++++++++++++++++++++++.'))
+        self.assertSameRun(parse('-[>+]+++++++++++++++++++++++++++++++++.'), max_steps=10000)
+        self.assertSameRun(parse('+[<+++]<.'), max_steps=100000)
+
+    def test_random_values_in_loops(self):
+        program = parse('++++++++[>?>+<<-]>.>.')
+
+        for seed in (1, -5, 2 ** 40):
+            self.assertSameRun(program, seed=seed)
+
+    def test_input_and_output_in_loops(self):
+        self.assertSameRun(parse(',[.[-],]'), 'abcdef')
+        self.assertSameRun(parse('++++++++[>,.<-]'), 'abc')
+
+    def test_errors_in_loops(self):
+        # The second iteration writes -2.
+        self.assertSameRun(parse('++[-.--]'))
+        self.assertEqual(run(parse('++[-.--]'), True)[2], 'ValueError')
+
+    def test_step_limits(self):
+        program = parse('++++++++[>++++++++[>+<-]<-]>>.')
+
+        for max_steps in (1, 10, 25, 26, 100, 333, 1000):
+            self.assertSameRun(program, max_steps=max_steps)
+
+        self.assertEqual(run(program, True, max_steps=100)[2], 'LimitExceededException')
+
+    def test_random_programs(self):
+        rng = random.Random(11)
+
+        for _ in range(500):
+            program = random_program(rng, rng.randint(1, 40))
+            max_steps = rng.choice([50, 500, 5000])
+
+            self.assertSameRun(program, random_input(rng), rng.randint(-10, 10), max_steps)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+
+from goethe.Program import Program
+from goethe.Tokenizer import Tokenizer
+from goethe.LanguageTools import LanguageTools
+
+
+# Syllables of the words used in the test poems. Lines have at most two words, so they
+# are never detected as alliteration or assonance.
+SYLLABLES = {
+    'wind': 1,
+    'sonne': 2,
+    'abendrot': 3,
+    'mond': 1,
+    'nacht': 1,
+    'himmel': 2,
+    'wolke': 2,
+}
+
+FIRST_WORDS = ['wind', 'sonne', 'abendrot']
+LAST_WORDS = ['nacht', 'himmel']
+
+
+class FixedCounter:
+    """Syllable counter that looks the words up in SYLLABLES.
+    """
+
+    def count_syllables(self, words):
+        return [SYLLABLES[word] for word in words]
+
+
+def tokenize(text: str) -> tuple:
+    """Tokenizes the text with the batch tokenizer.
+
+    Returns:
+        tuple: Token values and the line number of every verse.
+    """
+
+    tokenizer = Tokenizer(LanguageTools(text, syllable_counter=FixedCounter()))
+    return list(tokenizer.tokenize()), tokenizer.verses
+
+
+def stream(text: str) -> tuple:
+    """Tokenizes the text line by line with the streaming tokenizer.
+
+    Returns:
+        tuple: Token values and the line number of every verse.
+    """
+
+    lines = [line + '\n' for line in text.splitlines()]
+    pairs = list(Tokenizer.stream(lines, LanguageTools('', syllable_counter=FixedCounter())))
+    return [int(token) for token, _ in pairs], [line for _, line in pairs]
+
+
+def interleaved_chains(chains: int) -> tuple:
+    """Generates chains of four anaphora pairs, each linked to the previous pair by an epistrophe.
+
+    In chain c, pair k starts with FIRST_WORDS[(c + k) % 3] on both lines. The first line
+    ends with the last word of the previous pair, the second line with the other last word.
+    Every pair therefore sums to 2 * syllables of the first word + 3, and the pairs of a
+    chain are subtracted from each other.
+
+    Returns:
+        tuple: Text, expected tokens and expected line numbers.
+    """
+
+    lines, tokens, verses = [], [], []
+    last = LAST_WORDS[0]
+
+    for chain in range(chains):
+        verses.append(len(lines) + 1)
+        sums = []
+
+        for pair in range(4):
+            first = FIRST_WORDS[(chain + pair) % 3]
+            other = LAST_WORDS[1 - LAST_WORDS.index(last)]
+
+            # The first pair of a chain must not continue the previous chain.
+            ending = other if pair == 0 else last
+            following = LAST_WORDS[1 - LAST_WORDS.index(ending)]
+
+            lines += [f'{first} {ending}', f'{first} {following}']
+            last = following
+            sums.append(2 * SYLLABLES[first] + 3)
+
+        tokens.append(abs(sums[0] - sums[1] + sums[2] - sums[3]) % 10)
+
+    return '\n'.join(lines), tokens, verses
+
+
+class TokenizerTest(unittest.TestCase):
+
+    def test_epistrophe_before_anaphora(self):
+        text = '\n'.join([
+            'sonne nacht',   # 3
+            'mond nacht',    # 2, epistrophe: 3 - 2
+            'wind himmel',   # 3
+            'wind wolke',    # 3, anaphora: 3 + 3
+        ])
+
+        self.assertEqual(tokenize(text), ([1, 6], [1, 3]))
+        self.assertEqual(stream(text), ([1, 6], [1, 3]))
+
+    def test_epistrophe_between_anaphora(self):
+        text = '\n'.join([
+            'wind himmel',   # 3
+            'wind nacht',    # 2, anaphora: 5
+            'sonne nacht',   # 3, epistrophe: 5 - (3 + 4)
+            'sonne wolke',   # 4, anaphora
+            'mond himmel',   # 3
+        ])
+
+        self.assertEqual(tokenize(text), ([2, 3], [1, 5]))
+        self.assertEqual(stream(text), ([2, 3], [1, 5]))
+
+    def test_long_interleaved_chains(self):
+        text, tokens, verses = interleaved_chains(1000)
+
+        self.assertEqual(len(text.splitlines()), 8000)
+        self.assertEqual(tokenize(text), (tokens, verses))
+        self.assertEqual(stream(text), (tokens, verses))
+
+    def test_long_anaphora_chain(self):
+        text = '\n'.join(['sonne himmel'] * 5000)
+
+        self.assertEqual(tokenize(text), ([(5000 * 4) % 10], [1]))
+
+    def test_long_epistrophe_chain(self):
+        # Alternating first words prevent anaphora, so every line is subtracted from the chain.
+        text = '\n'.join(f'{FIRST_WORDS[index % 2]} himmel' for index in range(5001))
+
+        # 2501 lines with 3 syllables are added and 2500 lines with 4 syllables subtracted.
+        self.assertEqual(tokenize(text), ([abs(2501 * 3 - 2500 * 4) % 10], [1]))
+
+    def test_program_from_lines_matches_from_text(self):
+        text, tokens, _ = interleaved_chains(50)
+
+        lines = [line + '\n' for line in text.splitlines()]
+        self.assertEqual(list(Program.from_lines(lines, syllables='heuristic').tokens),
+                         list(Program.from_text(text, syllables='heuristic').tokens))
+
+
+if __name__ == '__main__':
+    unittest.main()